@@ -13,3 +13,6 @@ DESCRIPTION = "A file categorization management program."
 COPYRIGHT = "Copyright © 2014-2023 "+AUTHOR
 
 MAXCATLVLS = 5
+LINKCHECKWORKERS = 16
+LINKCHECKHOSTLIMIT = 2
+LINKCHECKTTL = 604800
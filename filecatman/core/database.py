@@ -1,24 +1,68 @@
 import os
+import time
+import re
+import sqlite3
 import logging
+import threading
 from urllib.parse import quote, unquote
 
-from PySide6.QtSql import QSqlDatabase, QSqlQuery, QSql
+from PySide6.QtCore import Qt, QCoreApplication, QThread, QTimer
+from PySide6.QtSql import QSqlDatabase, QSqlQuery, QSqlDriver, QSql
 
 from filecatman.lib.slugify import slugify
-from filecatman.core.functions import getÆDirPath
+from filecatman.core.functions import getÆDirPath, convToBool, parseSearchQuery
 
 
 class ÆDatabase(QSqlDatabase):
     con, lastInsertId, error, appConfig = None, None, None, None
     defaultTables = (
-        'items', 'terms', 'term_relationships', 'options', 'item_types', 'taxonomies'
+        'items', 'terms', 'term_relationships', 'term_closure', 'options', 'item_types', 'taxonomies',
+        'dir_snapshots', 'link_checks', 'missing_files'
     )
+    schemaMigrations = (
+        (1, "Create the term_closure category hierarchy table", 'migrateTermClosure'),
+        (2, "Maintain term counts with triggers", 'migrateTermCountTriggers'),
+        (3, "Index item names and times for sorted paging", 'migrateItemSortIndexes'),
+        (4, "Index term parents for lazy category loading", 'migrateTermParentIndex'),
+        (5, "Create the dir_snapshots file presence table", 'migrateDirSnapshots'),
+        (6, "Create the link_checks link result table", 'migrateLinkChecks'),
+        (7, "Create the missing_files item check result table", 'migrateMissingFiles')
+    )
+    schemaVersion = schemaMigrations[-1][0]
     conSuccess = False
     debug = True
-
-    def __init__(self, config):
+    batchSize = 500
+    idleTimeout = 300
+    pingInterval = 60
+    sqliteProfiles = {
+        'safe': (
+            ('journal_mode', 'DELETE'), ('synchronous', 'FULL'), ('cache_size', -2000),
+            ('mmap_size', 0), ('temp_store', 'DEFAULT')
+        ),
+        'balanced': (
+            ('journal_mode', 'WAL'), ('synchronous', 'NORMAL'), ('cache_size', -65536),
+            ('mmap_size', 268435456), ('temp_store', 'MEMORY')
+        ),
+        'bulk-load': (
+            ('journal_mode', 'WAL'), ('synchronous', 'OFF'), ('cache_size', -262144),
+            ('mmap_size', 268435456), ('temp_store', 'MEMORY')
+        )
+    }
+    defaultProfile = 'balanced'
+    searchTables = {'sqlite': 'items_fts', 'mysql': 'items_search'}
+    searchColumns = ('item_name', 'item_source', 'item_description')
+    searchSeparators = ['%{:02X}'.format(ord(char)) for char in " \t\n\r!\"#$&'()*+,:;<=>?@[\\]^`{|}%"]
+
+    def __init__(self, config, source=None):
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.preparedQueries = dict()
+        self.refCount, self.lastUsed, self.idleTimer = 0, 0, None
+        self.persistent = convToBool(config.get('persistent', True), True)
+        self.profile = self.defaultProfile
+        self.searchIndex = False
+        self.migrationReport = list()
+        self.dryRun = convToBool(config.get('dryRun', False))
         if config['type'] == 'mysql':
             self.config = {
                 'host': config['host'],
@@ -37,13 +81,16 @@ class ÆDatabase(QSqlDatabase):
             }
         else:
             raise Exception('Unknown database driver in configuration file: '+config['type'])
-        if config.get('create') and config['create'] is True:
+        if source is not None:
+            self.cloneConnection(source)
+        elif config.get('create') and config['create'] is True:
             self.createDatabase()
         else:
             self.newConnection()
 
     def newConnection(self):
         self.error = None
+        self.clearPreparedQueries()
         if self.config['type'] == 'mysql':
             if self.database(self.config['db']).isValid():
                 db = self.database(self.config['db'])
@@ -58,12 +105,8 @@ class ÆDatabase(QSqlDatabase):
             self.con = db
             self.con.open()
             if self.con.isOpen():
-                for table in self.defaultTables:
-                    if table not in self.con.tables(QSql.AllTables):
-                        self.logger.warning("Table '{}' was missing from the database.".format(table))
-                        self.createTables()
-                        break
-                self.con.close()
+                self.migrate(self.dryRun)
+                self.closeConnection()
                 self.logger.info("Successfully opened database `{}`.".format(self.config['db']))
                 self.conSuccess = True
                 return True
@@ -78,16 +121,19 @@ class ÆDatabase(QSqlDatabase):
             else:
                 db = self.addDatabase("QSQLITE", os.path.basename(self.config['db']))
             db.setDatabaseName(self.config['db'])
+            db.setConnectOptions("QSQLITE_OPEN_READONLY" if self.dryRun else "")
             self.con = db
             self.con.open()
             if self.con.isOpen():
-                QSqlQuery("PRAGMA foreign_keys = ON;", self.con)
-                for table in self.defaultTables:
-                    if table not in self.con.tables(QSql.AllTables):
-                        self.logger.warning("Table '{}' was missing from the database.".format(table))
-                        self.createTables()
-                        break
-                self.con.close()
+                if not self.dryRun:
+                    QSqlQuery("PRAGMA foreign_keys = ON;", self.con)
+                self.migrate(self.dryRun)
+                profile = self.selectOption('sqliteProfile')
+                if profile in self.sqliteProfiles:
+                    self.profile = profile
+                if not self.dryRun:
+                    self.applyProfile(self.profile)
+                self.closeConnection()
                 self.logger.info("Successfully opened database `{}`.".format(self.config['db']))
                 self.conSuccess = True
                 return True
@@ -95,9 +141,127 @@ class ÆDatabase(QSqlDatabase):
                 self.conSuccess = False
                 raise Exception(self.con.lastError().databaseText())
 
+    def selectSchemaVersion(self):
+        try:
+            return int(self.selectOption('schema_version') or 0)
+        except ValueError:
+            return 0
+
+    def pendingMigrations(self):
+        schemaVersion = self.selectSchemaVersion()
+        return [(version, description, method) for version, description, method in self.schemaMigrations
+                if version > schemaVersion]
+
+    def migrate(self, dryRun=False):
+        self.migrationReport = list()
+        missingTables = [table for table in self.defaultTables if table not in self.con.tables(QSql.AllTables)]
+        for table in missingTables:
+            self.logger.warning("Table '{}' was missing from the database.".format(table))
+        if missingTables and not dryRun:
+            self.createTables()
+        if 'options' in missingTables:
+            schemaVersion = 0
+            pending = list(self.schemaMigrations)
+        else:
+            schemaVersion = self.selectSchemaVersion()
+            pending = self.pendingMigrations()
+        for version, description, method in pending:
+            self.migrationReport.append("Schema version {} → {}: {}".format(schemaVersion, version, description))
+            schemaVersion = version
+        if dryRun:
+            for line in self.migrationReport:
+                self.logger.info("Pending migration. "+line)
+        else:
+            for version, description, method in pending:
+                self.logger.info("Migrating schema to version {}: {}".format(version, description))
+                self.transaction()
+                try:
+                    getattr(self, method)()
+                    self.insertOption('schema_version', str(version))
+                except Exception as e:
+                    self.rollback()
+                    self.logger.error("Migration to schema version {} failed: {}".format(version, e))
+                    raise Exception("Migration to schema version {} failed: {}".format(version, e))
+                self.commit()
+        self.searchIndex = self.searchTables[self.config['type']] in self.con.tables(QSql.AllTables)
+        return self.migrationReport
+
+    def execSchema(self):
+        for SQL in self.schemaStatements():
+            self.logger.debug('\n'+SQL)
+            query = QSqlQuery(self.con)
+            if not query.exec_(SQL):
+                raise Exception(query.lastError().databaseText())
+
+    def migrateTermClosure(self):
+        self.execSchema()
+        if not self.rebuildTermClosure():
+            raise Exception(self.lastError())
+
+    def migrateTermCountTriggers(self):
+        self.execSchema()
+        self.updateTermCounts()
+
+    def migrateItemSortIndexes(self):
+        if self.config['type'] == 'sqlite':
+            self.execSchema()
+        elif self.config['type'] == 'mysql':
+            for index in ('item_name', 'item_time'):
+                query = QSqlQuery(self.con)
+                query.exec_("SHOW INDEX FROM items WHERE Key_name = '{}'".format(index))
+                if query.first():
+                    continue
+                if not query.exec_("ALTER TABLE items ADD INDEX `{0}` (`{0}`)".format(index)):
+                    raise Exception(query.lastError().databaseText())
+
+    def migrateTermParentIndex(self):
+        if self.config['type'] == 'sqlite':
+            self.execSchema()
+        elif self.config['type'] == 'mysql':
+            query = QSqlQuery(self.con)
+            query.exec_("SHOW INDEX FROM terms WHERE Column_name = 'term_parent'")
+            if not query.first():
+                if not query.exec_("ALTER TABLE terms ADD INDEX `term_parent` (`term_parent`)"):
+                    raise Exception(query.lastError().databaseText())
+
+    def migrateDirSnapshots(self):
+        self.execSchema()
+
+    def migrateLinkChecks(self):
+        self.execSchema()
+
+    def migrateMissingFiles(self):
+        self.execSchema()
+
     def removeConnection(self):
+        self.closeConnection()
         self.removeDatabase(self.config['db'])
 
+    def threadConnection(self):
+        if self.isMainThread():
+            return self
+        db = self.__class__(self.config, source=self)
+        QThread.currentThread().finished.connect(db.removeThreadConnection, Qt.DirectConnection)
+        return db
+
+    def cloneConnection(self, source):
+        connectionName = "{}-{}".format(source.con.connectionName(), threading.get_ident())
+        if self.contains(connectionName):
+            self.removeDatabase(connectionName)
+        self.con = self.cloneDatabase(source.con, connectionName)
+        self.profile, self.searchIndex, self.appConfig = source.profile, source.searchIndex, source.appConfig
+        self.persistent = False
+        self.conSuccess = True
+        self.logger.debug("Created thread connection `{}`.".format(connectionName))
+
+    def removeThreadConnection(self):
+        if self.con:
+            connectionName = self.con.connectionName()
+            self.closeConnection()
+            self.con = None
+            self.removeDatabase(connectionName)
+            self.logger.debug("Removed thread connection `{}`.".format(connectionName))
+
     def createDatabase(self):
         self.error = None
         if self.config['type'] == 'mysql':
@@ -121,6 +285,7 @@ class ÆDatabase(QSqlDatabase):
                 if queryCreate:
                     self.con.setDatabaseName(self.config['db'])
                     if self.createTables():
+                        self.insertOption('schema_version', str(self.schemaVersion))
                         self.logger.info("Database successfully created.")
                         self.con.close()
                         self.conSuccess = True
@@ -146,6 +311,7 @@ class ÆDatabase(QSqlDatabase):
             self.con.open()
             if self.con.isOpen():
                 if self.createTables():
+                    self.insertOption('schema_version', str(self.schemaVersion))
                     self.logger.info("Database successfully created.")
                     self.con.close()
                     self.conSuccess = True
@@ -156,11 +322,7 @@ class ÆDatabase(QSqlDatabase):
 
     def createTables(self):
         if self.config['type'] == 'sqlite':
-            file = open(os.path.join(getÆDirPath(),'core', 'queries','newsqlitedatabase.sql'), 'r')
-            with file:
-                SQL = file.read()
-
-            sqlStatements = SQL.split(";")
+            sqlStatements = self.schemaStatements()
             queryTablesCreate = QSqlQuery(self.con)
             self.transaction()
             for SQL in sqlStatements:
@@ -184,6 +346,24 @@ class ÆDatabase(QSqlDatabase):
         else:
             return False
 
+    def schemaStatements(self):
+        fileName = dict(sqlite='newsqlitedatabase.sql', mysql='newmysqldatabase.sql')[self.config['type']]
+        file = open(os.path.join(getÆDirPath(), 'core', 'queries', fileName), 'r')
+        with file:
+            return self.splitStatements(file.read())
+
+    @staticmethod
+    def splitStatements(SQL):
+        statements, statement = list(), ''
+        for line in SQL.splitlines(True):
+            statement += line
+            if sqlite3.complete_statement(statement):
+                statements.append(statement.strip())
+                statement = ''
+        if statement.strip():
+            statements.append(statement.strip())
+        return statements
+
     def lastError(self):
         if not self.con.lastError().type() == 0:
             return self.con.lastError().databaseText()
@@ -200,18 +380,96 @@ class ÆDatabase(QSqlDatabase):
 
     def open(self):
         if self.con:
-            self.con.open()
-            if self.config['type'] == 'sqlite':
-                QSqlQuery("PRAGMA foreign_keys = ON;", self.con)
+            if self.con.isOpen() and not self.pingConnection():
+                self.logger.warning("Connection to `{}` was lost, reconnecting.".format(self.config['db']))
+                self.closeConnection()
+            if not self.con.isOpen():
+                self.con.open()
+                if self.config['type'] == 'sqlite' and not self.dryRun:
+                    QSqlQuery("PRAGMA foreign_keys = ON;", self.con)
+                    self.applyProfile(self.profile)
+            self.refCount += 1
+            self.stopIdleTimer()
         else:
             self.logger.error("Error: No connection to open.")
 
     def close(self):
         if self.con:
-            self.con.close()
+            self.refCount = max(self.refCount-1, 0)
+            self.lastUsed = time.monotonic()
+            if self.refCount == 0:
+                if self.persistent:
+                    self.startIdleTimer()
+                else:
+                    self.closeConnection()
         else:
             self.logger.error("Error: No connection to close.")
 
+    def closeConnection(self):
+        self.refCount = 0
+        self.stopIdleTimer()
+        if self.con:
+            self.clearPreparedQueries()
+            if self.con.isOpen():
+                self.con.close()
+                self.logger.debug("Connection to `{}` closed.".format(self.config['db']))
+
+    def pingConnection(self):
+        if self.config['type'] == 'mysql' and time.monotonic()-self.lastUsed > self.pingInterval:
+            query = QSqlQuery(self.con)
+            if not query.exec_("SELECT 1"):
+                return False
+            query.finish()
+            self.lastUsed = time.monotonic()
+        return True
+
+    def applyProfile(self, profile, temporary=False):
+        if self.config['type'] != 'sqlite':
+            return False
+        if profile not in self.sqliteProfiles:
+            self.logger.error("Unknown database profile: "+str(profile))
+            return False
+        query = QSqlQuery(self.con)
+        for pragma, value in self.sqliteProfiles[profile]:
+            # Leaving WAL needs the only connection, so a temporary switch keeps the journal mode.
+            if temporary and pragma == 'journal_mode':
+                continue
+            sql = "PRAGMA {} = {}".format(pragma, value)
+            if not query.exec_(sql):
+                self.logger.warning("Unable to set `{}`: {}".format(sql, query.lastError().databaseText()))
+        query.finish()
+        self.logger.debug("Database profile `{}` applied.".format(profile))
+        return True
+
+    def setProfile(self, profile):
+        if self.applyProfile(profile):
+            self.profile = profile
+            self.insertOption('sqliteProfile', quote(profile))
+            return True
+        return False
+
+    def isMainThread(self):
+        app = QCoreApplication.instance()
+        return app is not None and QThread.currentThread() is app.thread()
+
+    def startIdleTimer(self):
+        if not self.isMainThread():
+            return
+        if self.idleTimer is None:
+            self.idleTimer = QTimer()
+            self.idleTimer.setSingleShot(True)
+            self.idleTimer.timeout.connect(self.closeIdleConnection)
+        self.idleTimer.start(self.idleTimeout*1000)
+
+    def stopIdleTimer(self):
+        if self.idleTimer is not None and self.isMainThread():
+            self.idleTimer.stop()
+
+    def closeIdleConnection(self):
+        if self.refCount == 0:
+            self.logger.debug("Closing idle connection.")
+            self.closeConnection()
+
     def transaction(self, debug=False):
         if self.debug is False:
             if debug is True:
@@ -243,6 +501,136 @@ class ÆDatabase(QSqlDatabase):
     def tables(self):
         return self.con.tables(QSql.AllTables)
 
+    def prepareQuery(self, sql):
+        key = (self.con.connectionName(), sql)
+        query = self.preparedQueries.get(key)
+        if query is None:
+            query = QSqlQuery(self.con)
+            query.setForwardOnly(True)
+            if not query.prepare(sql):
+                self.printQueryError(query.lastError().databaseText())
+                return query
+            self.preparedQueries[key] = query
+        return query
+
+    def execQuery(self, sql, values=()):
+        query = self.prepareQuery(sql)
+        for i, value in enumerate(values):
+            query.bindValue(i, value)
+        self.logger.debug('\n'+sql)
+        query.exec_()
+        return query
+
+    def selectQuery(self, sql, values=(), forwardOnly=False):
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(forwardOnly)
+        if not query.prepare(sql):
+            self.printQueryError(query.lastError().databaseText())
+            return query
+        for i, value in enumerate(values):
+            query.bindValue(i, value)
+        self.logger.debug('\n'+sql)
+        query.exec_()
+        return query
+
+    def clearPreparedQueries(self):
+        self.preparedQueries.clear()
+
+    def execBatchQuery(self, sql, rows):
+        query = self.prepareQuery(sql)
+        affected = 0
+        self.logger.debug('\n'+sql)
+        if self.con.driver().hasFeature(QSqlDriver.BatchOperations):
+            for start in range(0, len(rows), self.batchSize):
+                chunk = rows[start:start+self.batchSize]
+                for i, values in enumerate(zip(*chunk)):
+                    query.bindValue(i, list(values))
+                if not query.execBatch():
+                    self.printQueryError(query.lastError().databaseText())
+                affected += max(query.numRowsAffected(), 0)
+        else:
+            # Qt emulates execBatch by copying every bound list once per row,
+            # so drivers without native batches step the prepared statement directly.
+            for row in rows:
+                for i, value in enumerate(row):
+                    query.bindValue(i, value)
+                if not query.exec_():
+                    self.printQueryError(query.lastError().databaseText())
+                affected += max(query.numRowsAffected(), 0)
+        query.finish()
+        return affected
+
+    def insertRows(self, table, cols, rows):
+        rows = list(rows)
+        if not rows:
+            return 0
+        if self.config['type'] == 'mysql':
+            inserted = 0
+            for start in range(0, len(rows), self.batchSize):
+                chunk = rows[start:start+self.batchSize]
+                placeholders = "("+", ".join("?" * len(cols))+")"
+                sql = "INSERT IGNORE INTO {} ({}) VALUES ".format(table, ", ".join(cols)) \
+                      + ", ".join([placeholders] * len(chunk))
+                query = self.execQuery(sql, [value for row in chunk for value in row])
+                inserted += max(query.numRowsAffected(), 0)
+                query.finish()
+            return inserted
+        elif self.config['type'] == 'sqlite':
+            sql = "INSERT OR IGNORE INTO {} ({}) VALUES ({})"\
+                .format(table, ", ".join(cols), ", ".join("?" * len(cols)))
+            return self.execBatchQuery(sql, rows)
+
+    def updateTermCounts(self, termIdens=None):
+        if termIdens is None:
+            QSqlQuery("UPDATE terms SET term_count = "
+                      "(SELECT COUNT(*) FROM term_relationships AS tr WHERE tr.term_id = terms.term_id)", self.con)
+            return True
+        termIdens = list(set(termIdens))
+        for start in range(0, len(termIdens), self.batchSize):
+            chunk = termIdens[start:start+self.batchSize]
+            sql = "UPDATE terms SET term_count = " \
+                  "(SELECT COUNT(*) FROM term_relationships AS tr WHERE tr.term_id = terms.term_id) " \
+                  "WHERE term_id IN ({})".format(", ".join("?" * len(chunk)))
+            self.execQuery(sql, chunk).finish()
+        return True
+
+    def updateTermClosure(self, termIden, parent=None):
+        self.insertRows("term_closure", ("ancestor_id", "descendant_id", "depth"), [(termIden, termIden, 0)])
+        self.detachTermClosure(termIden)
+        if parent not in ("", None):
+            sql = "INSERT INTO term_closure (ancestor_id, descendant_id, depth) " \
+                  "SELECT supertree.ancestor_id, subtree.descendant_id, supertree.depth + subtree.depth + 1 " \
+                  "FROM term_closure AS supertree CROSS JOIN term_closure AS subtree " \
+                  "WHERE (supertree.descendant_id = ?) AND (subtree.ancestor_id = ?)"
+            self.execQuery(sql, (parent, termIden)).finish()
+        return True
+
+    def detachTermClosure(self, termIden):
+        subtreeSQL = "SELECT descendant_id FROM " \
+                     "(SELECT descendant_id FROM term_closure WHERE ancestor_id = ?) AS {}"
+        sql = "DELETE FROM term_closure WHERE descendant_id IN ({}) AND ancestor_id NOT IN ({})"\
+            .format(subtreeSQL.format("subtree"), subtreeSQL.format("subtree_inner"))
+        self.execQuery(sql, (termIden, termIden)).finish()
+
+    def rebuildTermClosure(self):
+        QSqlQuery("DELETE FROM term_closure", self.con)
+        sql = "INSERT INTO term_closure (ancestor_id, descendant_id, depth) \n" \
+              "WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS ( \n" \
+              "SELECT term_id, term_id, 0 FROM terms \n" \
+              "UNION ALL \n" \
+              "SELECT closure.ancestor_id, t.term_id, closure.depth + 1 FROM closure " \
+              "INNER JOIN terms AS t ON (t.term_parent = closure.descendant_id) " \
+              "WHERE closure.depth < ? \n" \
+              ") \n" \
+              "SELECT ancestor_id, descendant_id, MIN(depth) FROM closure GROUP BY ancestor_id, descendant_id"
+        query = self.execQuery(sql, (self.selectCount("terms"),))
+        if query.isActive():
+            query.finish()
+            self.logger.info("Category hierarchy successfully rebuilt.")
+            return True
+        else:
+            self.printQueryError(query.lastError().databaseText())
+
     def newItem(self, data):
         self.lastInsertId = None
 
@@ -272,12 +660,12 @@ class ÆDatabase(QSqlDatabase):
                         queryData[colnames[colabb]] = value
 
             sql = "INSERT INTO items (" + ", ".join(queryData.keys())\
-                  + ") VALUES('" + "', '".join(queryData.values()) + "')"
-            self.logger.debug('\n'+sql)
+                  + ") VALUES(" + ", ".join("?" * len(queryData)) + ")"
             for key, value in queryData.items():
                 self.logger.debug(key+": "+value)
-            query = QSqlQuery(sql, self.con)
+            query = self.execQuery(sql, list(queryData.values()))
             self.lastInsertId = query.lastInsertId()
+            query.finish()
             self.logger.debug("Last Id: "+str(self.lastInsertId))
             if self.lastInsertId:
                 self.logger.info("Item successfully inserted.")
@@ -321,50 +709,49 @@ class ÆDatabase(QSqlDatabase):
                         queryData[colnames[colabb]] = value
 
             if data.get('parent') in ("", None):
-                data['parent'] = "NULL"
+                data['parent'] = None
 
             for key, value in queryData.items():
                 self.logger.debug(key+": "+value)
 
-            queryTerm = QSqlQuery(self.con)
-            queryTerm.setForwardOnly(True)
+            termSQL = "INSERT INTO terms ("+", ".join(queryData.keys())\
+                      + ") VALUES("+", ".join("?" * len(queryData))+")"
             if args['replace'] is True:
                 if self.config['type'] == 'mysql':
-                    termSQL = "INSERT INTO terms ("+", ".join(queryData.keys())\
-                              + ") VALUES('"+"', '".join(queryData.values())+"')"\
-                              + " ON DUPLICATE KEY UPDATE term_id=LAST_INSERT_ID(term_id)"
-                    self.logger.debug('\n'+termSQL)
-                    queryTerm.exec_(termSQL)
+                    termSQL += " ON DUPLICATE KEY UPDATE term_id=LAST_INSERT_ID(term_id)"
+                    queryTerm = self.execQuery(termSQL, list(queryData.values()))
                     self.logger.info("Category successfully inserted.")
                     self.lastInsertId = str(queryTerm.lastInsertId())
+                    if queryTerm.numRowsAffected() == 1:
+                        self.updateTermClosure(self.lastInsertId, data['parent'])
+                    queryTerm.finish()
                 elif self.config['type'] == 'sqlite':
-                    termSQL = "INSERT INTO terms ("+", ".join(queryData.keys())\
-                              + ") VALUES('"+"', '".join(queryData.values())+"')"
-                    self.logger.debug('\n'+termSQL)
-                    queryTerm.exec_(termSQL)
-                    if queryTerm.lastInsertId() is None:
-                        termSelectSQL = "SELECT term_id from terms WHERE term_slug = '{}' AND term_taxonomy = '{}'"\
-                                        .format(data['slug'], data['taxonomy'])
-                        self.logger.debug('\n'+termSelectSQL)
-                        queryTerm.exec_(termSelectSQL)
-                        if queryTerm.first():
-                            termIden = queryTerm.value(0)
-                            termUpdateSQL = "UPDATE terms SET term_name='{}', term_slug='{}', term_parent={}, term_taxonomy='{}', " \
-                                            "term_description='{}' WHERE term_id = {}"\
-                                            .format(data['name'], data['slug'], data['parent'], data['taxonomy'],
-                                                    data['description'], termIden)
-                            self.logger.debug('\n'+termUpdateSQL)
-                            queryTerm.exec_(termUpdateSQL)
+                    queryTerm = self.execQuery(termSQL, list(queryData.values()))
+                    termIden = queryTerm.lastInsertId()
+                    queryTerm.finish()
+                    if termIden is None:
+                        termSelectSQL = "SELECT term_id from terms WHERE term_slug = ? AND term_taxonomy = ?"
+                        querySelect = self.execQuery(termSelectSQL, (data['slug'], data['taxonomy']))
+                        if querySelect.first():
+                            termIden = querySelect.value(0)
+                            querySelect.finish()
+                            termUpdateSQL = "UPDATE terms SET term_name=?, term_slug=?, term_parent=?, " \
+                                            "term_taxonomy=?, term_description=? WHERE term_id = ?"
+                            self.execQuery(termUpdateSQL, (data['name'], data['slug'], data['parent'],
+                                                           data['taxonomy'], data['description'], termIden))\
+                                .finish()
+                            self.updateTermClosure(termIden, data['parent'])
                             self.lastInsertId = str(termIden)
                             self.logger.warning("Category successfully replaced.")
                     else:
-                        self.lastInsertId = str(queryTerm.lastInsertId())
+                        self.updateTermClosure(termIden, data['parent'])
+                        self.lastInsertId = str(termIden)
             else:
-                termSQL = "INSERT INTO terms ("+", ".join(queryData.keys())\
-                          + ") VALUES('"+"', '".join(queryData.values())+"')"
-                self.logger.debug('\n'+termSQL)
-                queryTerm.exec_(termSQL)
+                queryTerm = self.execQuery(termSQL, list(queryData.values()))
                 self.lastInsertId = queryTerm.lastInsertId()
+                queryTerm.finish()
+                if self.lastInsertId is not None:
+                    self.updateTermClosure(self.lastInsertId, data['parent'])
                 self.logger.info("Category successfully inserted.")
             self.logger.debug("Last Term Id: "+str(self.lastInsertId))
             return True
@@ -377,23 +764,64 @@ class ÆDatabase(QSqlDatabase):
             return
         else:
             queryData = data
-            sql = "INSERT INTO term_relationships (item_id, term_id) VALUES('{}', '{}')"\
-                .format(queryData['item'], queryData['term'])
-            self.logger.debug('\n'+sql)
+            sql = "INSERT INTO term_relationships (item_id, term_id) VALUES(?, ?)"
             for key, value in queryData.items():
                 self.logger.debug(str(key)+": "+str(value))
-            query = QSqlQuery(self.con)
-            if query.exec_(sql):
+            query = self.execQuery(sql, (queryData['item'], queryData['term']))
+            self.lastInsertId = query.lastInsertId()
+            if query.isActive():
+                query.finish()
                 self.logger.info("Relation successfully inserted.")
-                self.incrementTermCount(queryData['term'])
             else:
                 self.logger.warning("Relation already exists.")
 
-            self.lastInsertId = query.lastInsertId()
             self.logger.debug("Last Id: "+str(self.lastInsertId))
 
             return True
 
+    def newItems(self, rows, existing=True):
+        cols = ("item_name", "type_id", "item_source", "item_time", "item_description")
+        queryRows = list()
+        for data in rows:
+            if data.get('name') is None or data.get('type') is None:
+                self.logger.error("Error creating new item: name or typeID field is missing.")
+                continue
+            if data.get('datetime') is None:
+                data['datetime'] = (data.get('date') or "0000-00-00")+" "+(data.get('time') or "00:00:00")
+            queryRows.append((
+                data['name'], data['type'],
+                quote(data['source']) if data.get('source') else "",
+                data['datetime'],
+                quote(data['description']) if data.get('description') else ""
+            ))
+        existingIdens = dict() if existing else self.selectItemIdens(queryRows)
+        insertedCount = self.insertRows("items", cols, queryRows)
+        self.logger.info("{} of {} items successfully inserted.".format(insertedCount, len(queryRows)))
+
+        itemIdens = self.selectItemIdens(queryRows)
+        for itemKey in existingIdens:
+            itemIdens.pop(itemKey, None)
+        return itemIdens
+
+    def selectItemIdens(self, queryRows):
+        itemIdens = dict()
+        for start in range(0, len(queryRows), self.batchSize):
+            chunk = queryRows[start:start+self.batchSize]
+            sql = "SELECT item_id, item_name, type_id FROM items " \
+                  "WHERE item_name IN ({})".format(", ".join("?" * len(chunk)))
+            query = self.execQuery(sql, [row[0] for row in chunk])
+            while query.next():
+                itemIdens[(query.value(1), query.value(2))] = query.value(0)
+            query.finish()
+        return itemIdens
+
+    def newRelations(self, pairs):
+        pairs = [(itemIden, termIden) for itemIden, termIden in pairs
+                 if itemIden is not None and termIden is not None]
+        insertedCount = self.insertRows("term_relationships", ("item_id", "term_id"), pairs)
+        self.logger.info("{} of {} relations successfully inserted.".format(insertedCount, len(pairs)))
+        return insertedCount
+
     def updateItem(self, data):
         colnames = dict(name="item_name",
                         type="type_id",
@@ -422,33 +850,24 @@ class ÆDatabase(QSqlDatabase):
                 if colabb in colnames:
                     queryData[colnames[colabb]] = value
 
-        SQL = "UPDATE items Set "
-        i = 0
-        for key, value in queryData.items():
-            line = key+"='"+value+"'"
-            if i < len(queryData)-1:
-                line += ", "
-            i += 1
-            SQL += line
-        SQL += " WHERE item_id='{}'".format(data.get('id'))
-        self.logger.debug('\n'+SQL)
-        query = QSqlQuery(SQL, self.con)
+        SQL = "UPDATE items Set "+", ".join(key+"=?" for key in queryData.keys())+" WHERE item_id = ?"
+        query = self.execQuery(SQL, list(queryData.values())+[data.get('id')])
         self.lastInsertId = query.lastInsertId()
+        query.finish()
         self.logger.info("Item successfully updated.")
 
     def updateItemType(self, oldItemType, newItemType):
-        SQL = "UPDATE items Set type_id='{}' WHERE type_id='{}'".format(newItemType, oldItemType)
-        self.logger.debug('\n'+SQL)
-        query = QSqlQuery(SQL, self.con)
+        SQL = "UPDATE items Set type_id = ? WHERE type_id = ?"
+        query = self.execQuery(SQL, (newItemType, oldItemType))
         self.lastInsertId = query.lastInsertId()
+        query.finish()
         self.logger.info("Item Type `{}` successfully updated to `{}`.".format(oldItemType, newItemType))
 
     def updateTaxonomy(self, oldTaxonomy, newTaxonomy):
-        SQL = "UPDATE terms Set term_taxonomy='{}' WHERE term_taxonomy='{}'"\
-              .format(newTaxonomy, oldTaxonomy)
-        self.logger.debug('\n'+SQL)
-        query = QSqlQuery(SQL, self.con)
+        SQL = "UPDATE terms Set term_taxonomy = ? WHERE term_taxonomy = ?"
+        query = self.execQuery(SQL, (newTaxonomy, oldTaxonomy))
         self.lastInsertId = query.lastInsertId()
+        query.finish()
         self.logger.info("Taxonomy `{}` successfully updated to `{}`.".format(oldTaxonomy, newTaxonomy))
 
     def updateCategory(self, data):
@@ -465,55 +884,58 @@ class ÆDatabase(QSqlDatabase):
             data['description'] = ""
 
         if data.get('parent') in ("", None):
-            data['parent'] = 'NULL'
+            data['parent'] = None
 
-        termSQL = "UPDATE terms SET term_name='{}', term_slug='{}', term_parent={}, term_taxonomy='{}', " \
-                  "term_description='{}' WHERE term_id = '{}'"\
-            .format(data['name'], data['slug'], data['parent'], data['taxonomy'], data['description'], data['termid'])
-        self.logger.debug('\n'+termSQL)
-        queryTerm = QSqlQuery(termSQL, self.con)
+        termSQL = "UPDATE terms SET term_name=?, term_slug=?, term_parent=?, term_taxonomy=?, " \
+                  "term_description=? WHERE term_id = ?"
+        queryTerm = self.execQuery(termSQL, (data['name'], data['slug'], data['parent'], data['taxonomy'],
+                                             data['description'], data['termid']))
         self.lastInsertId = queryTerm.lastInsertId()
+        queryTerm.finish()
+        self.updateTermClosure(data['termid'], data['parent'])
         self.logger.info("Category successfully updated.")
 
     def deleteItem(self, itemid):
-        sql = "SELECT term_id FROM term_relationships as tr " \
-              "WHERE (tr.item_id = {})".format(itemid)
-        self.logger.debug("\n"+sql)
-        query = QSqlQuery(sql, self.con)
-        while query.next():
-            self.decrementTermCount(query.value(0))
-        sql = "DELETE FROM items WHERE item_id = '{}'".format(itemid)
-        self.logger.debug("\n"+sql)
-        QSqlQuery(sql, self.con)
+        sql = "DELETE FROM items WHERE item_id = ?"
+        self.execQuery(sql, (itemid,)).finish()
         self.logger.info("Item successfully deleted.")
         return True
 
     def deleteCategory(self, termIden):
-        queryDelete = QSqlQuery(self.con)
-        sql = "DELETE FROM terms WHERE term_id = '{}'".format(termIden)
-        if queryDelete.exec_(sql):
+        self.detachTermClosure(termIden)
+        self.execQuery("DELETE FROM term_closure WHERE (ancestor_id = ?) OR (descendant_id = ?)",
+                       (termIden, termIden)).finish()
+        sql = "DELETE FROM terms WHERE term_id = ?"
+        queryDelete = self.execQuery(sql, (termIden,))
+        if queryDelete.isActive():
+            queryDelete.finish()
             self.logger.info("Category successfully deleted.")
             return True
 
     def deleteRelation(self, itemid, termid):
-        sql = "DELETE FROM term_relationships WHERE (item_id = '{}') AND (term_id = '{}')"\
-            .format(itemid, termid)
-        self.logger.debug('\n'+sql)
-        QSqlQuery(sql, self.con)
-        self.decrementTermCount(termid)
+        sql = "DELETE FROM term_relationships WHERE (item_id = ?) AND (term_id = ?)"
+        self.execQuery(sql, (itemid, termid)).finish()
         self.logger.info("Relation successfully deleted.")
         return True
 
     def deleteRelations(self, iden, col='item_id'):
-        sql = "SELECT item_id, term_id FROM term_relationships WHERE {} = {}".format(col, iden)
-        relations = QSqlQuery(self.con)
-        relations.setForwardOnly(True)
-        relations.exec_(sql)
-        while relations.next():
-            sql = "DELETE FROM term_relationships WHERE (item_id = '{}') AND (term_id = '{}')"\
-                  .format(relations.value(0), relations.value(1))
-            QSqlQuery(sql, self.con)
-            self.decrementTermCount(relations.value(1))
+        if not isinstance(iden, (list, tuple)):
+            sql = "DELETE FROM term_relationships WHERE {} = ?".format(col)
+            self.execQuery(sql, (iden,)).finish()
+            self.logger.info("Relations successfully deleted.")
+            return True
+        pairs = list(iden)
+        if not pairs:
+            return True
+        if self.config['type'] == 'mysql':
+            for start in range(0, len(pairs), self.batchSize):
+                chunk = pairs[start:start+self.batchSize]
+                sql = "DELETE FROM term_relationships WHERE (item_id, term_id) IN ({})"\
+                    .format(", ".join(["(?, ?)"] * len(chunk)))
+                self.execQuery(sql, [value for pair in chunk for value in pair]).finish()
+        elif self.config['type'] == 'sqlite':
+            sql = "DELETE FROM term_relationships WHERE (item_id = ?) AND (term_id = ?)"
+            self.execBatchQuery(sql, pairs)
         self.logger.info("Relations successfully deleted.")
         return True
 
@@ -538,186 +960,200 @@ class ÆDatabase(QSqlDatabase):
         return True
 
     def bulkDeleteItems(self, itemIdens):
+        itemIdens = list(itemIdens)
         self.transaction()
-        sql = "SELECT term_id FROM term_relationships as tr " \
-              "WHERE item_id IN ({})".format(", ".join(itemIdens))
-        self.logger.debug('\n'+sql)
-        relations = QSqlQuery(sql, self.con)
-        while relations.next():
-            self.decrementTermCount(relations.value(0))
-        sql = "DELETE FROM items WHERE (item_id) IN ({})".format(", ".join(itemIdens))
-        self.logger.debug('\n'+sql)
-        QSqlQuery(sql, self.con)
+        for start in range(0, len(itemIdens), self.batchSize):
+            chunk = itemIdens[start:start+self.batchSize]
+            sql = "DELETE FROM items WHERE (item_id) IN ({})".format(", ".join("?" * len(chunk)))
+            self.execQuery(sql, chunk).finish()
         self.commit()
         self.logger.info("Items successfully deleted.")
         return True
 
     def selectItem(self, itemID, col="*"):
-        query = QSqlQuery("SELECT {} FROM items AS i "
-                          "WHERE (item_id= '{}')".format(col, itemID), self.con)
+        query = self.selectQuery("SELECT {} FROM items AS i "
+                                 "WHERE (item_id= ?)".format(col), (itemID,))
         if query.first():
             return query
 
     def selectItems(self, args=None):
         where = ["( i.item_id is not null )", ]
+        values = list()
         startLimit = 0
         col = "*"
         limit = ""
 
         if args:
-            if args.get('item_id'):
-                where.append("( i.item_id = '{}' )".format(args['item_id']))
-            if args.get('type_id'):
-                where.append("( i.type_id = '{}' )".format(args['type_id']))
-            if args.get('item_name'):
-                where.append("( i.item_name = '{}' )".format(args['item_name']))
+            for key in ('item_id', 'type_id', 'item_name'):
+                if args.get(key):
+                    where.append("( i.{} = ? )".format(key))
+                    values.append(args[key])
             if args.get('col'):
                 col = args['col']
             if args.get('limit'):
                 if args.get('start'):
                     startLimit = args['start']
-                limit = "LIMIT {}, {}".format(startLimit, args['limit'])
+                limit = "LIMIT ?, ?"
+                values.extend((int(startLimit), int(args['limit'])))
         whereJoined = " AND ".join(where)
-        query = QSqlQuery(self.con)
         sql = "SELECT {} FROM items AS i " \
               "WHERE {} " \
               "{}".format(col, whereJoined, limit)
-        self.logger.debug('\n'+sql)
-        query.exec_(sql)
-        return query
+        return self.selectQuery(sql, values)
 
     def selectCategory(self, catID, col="*"):
         sql = "SELECT {} FROM terms AS t " \
-              "WHERE (t.term_id = '{}')".format(col, catID)
-        query = QSqlQuery(sql, self.con)
-        self.logger.debug('\n'+sql)
+              "WHERE (t.term_id = ?)".format(col)
+        query = self.selectQuery(sql, (catID,))
         if query.first():
             return query
 
     def selectCategories(self, args=None):
         where = ["( t.term_id is not null )", ]
+        values = list()
         col = "*"
         if args:
-            if args.get('term_id'):
-                where.append("( t.term_id = '{}' )".format(args['term_id']))
-            if args.get('term_taxonomy'):
-                where.append("( t.term_taxonomy = '{}' )".format(args['term_taxonomy']))
+            for key in ('term_id', 'term_taxonomy'):
+                if args.get(key):
+                    where.append("( t.{} = ? )".format(key))
+                    values.append(args[key])
             if args.get('col'):
                 col = args['col']
         whereJoined = " AND ".join(where)
-        query = QSqlQuery(self.con)
-        query.setForwardOnly(True)
         sql = "SELECT {} FROM terms AS t " \
               "WHERE {}".format(col, whereJoined)
-        self.logger.debug('\n'+sql)
-        query.exec_(sql)
-        return query
+        return self.selectQuery(sql, values, forwardOnly=True)
 
     def selectCategoriesAsTree(self, args=None):
-        queryArgs = dict()
         if args is None:
             args = dict()
-        if args.get('taxonomy') is not None:
-            queryArgs['tax'] = args['taxonomy']
-        if args.get('complete') is not None:
-            selectComplete = args['complete']
-        else:
-            selectComplete = False
+        sql, values = self.categoriesTreeSQL(args)
+        query = self.execQuery(sql, values)
+        rows = list()
+        while query.next():
+            rows.append(tuple(query.value(i) for i in range(7)))
+        query.finish()
+        return self.categoriesFromTreeRows(rows, bool(args.get('complete')))
+
+    def categoriesTreeSQL(self, args):
+        values = list()
         if args.get('extra') is not None:
-            queryArgs['extra'] = args['extra']
+            rootWhere = "(root.term_parent IS NULL) AND ({})".format(args['extra'])
         else:
-            queryArgs['extra'] = None
-        catLvls = self.appConfig['options']['catLvls']
-        if selectComplete:
-            sql = "SELECT root.term_id AS root_id, " \
-                  "root.term_taxonomy AS root_tax, root.term_name AS root_name, " \
-                  "root.term_slug AS root_slug, root.term_count AS root_count"
+            rootWhere = "(root.term_parent IS NULL) AND (root.term_taxonomy = ?)"
+            values.append(args.get('taxonomy'))
+        values.append(self.appConfig['options']['catLvls'])
+        cols = "term_id, term_name, term_parent, term_slug, term_count, term_taxonomy"
+        sql = "WITH RECURSIVE tree (term_id, term_name, term_parent, term_slug, term_count, term_taxonomy, " \
+              "depth) AS ( \n" \
+              "SELECT root.term_id, root.term_name, root.term_parent, root.term_slug, root.term_count, " \
+              "root.term_taxonomy, 0 FROM terms AS root WHERE {} \n" \
+              "UNION ALL \n" \
+              "SELECT t.term_id, t.term_name, t.term_parent, t.term_slug, t.term_count, t.term_taxonomy, " \
+              "tree.depth + 1 FROM terms AS t INNER JOIN tree ON (t.term_parent = tree.term_id) " \
+              "WHERE tree.depth < ? \n" \
+              ") \n" \
+              "SELECT {}, depth FROM tree ORDER BY term_name".format(rootWhere, cols)
+        return sql, values
+
+    def categoryScope(self, args, values):
+        if args.get('extra') is not None:
+            return "({})".format(args['extra'])
+        values.append(args.get('taxonomy'))
+        return "(root.term_taxonomy = ?)"
+
+    def categoryChildrenSQL(self, args):
+        values, where = list(), list()
+        if args.get('parent') is not None:
+            where.append("(root.term_parent = ?)")
+            values.append(args['parent'])
         else:
-            sql = """SELECT root.term_id AS root_id, root.term_name AS root_name"""
-        if catLvls > 0:
-            sql += ","
-        i = 1
-        while i <= catLvls:
-            curLevel = str(i)
+            where.append("(root.term_parent IS NULL)")
+            where.append(self.categoryScope(args, values))
+        where.append("(root.term_name <> '')")
+        orderBy = args.get('orderBy', "root.term_name")
+        direction, comparison, bound = ("DESC", "<", ">=") if args.get('descending') else ("ASC", ">", "<=")
+        if args.get('after') is not None:
+            where.append("(({}, root.term_id) {} (?, ?))".format(orderBy, comparison))
+            values.extend(args['after'])
+        if args.get('until') is not None:
+            where.append("(({}, root.term_id) {} (?, ?))".format(orderBy, bound))
+            values.extend(args['until'])
+        limit = ""
+        if args.get('limit') is not None:
+            limit = " LIMIT ?"
+            values.append(args['limit'])
+        sql = "SELECT page.term_id, page.term_name, page.term_parent, page.term_slug, page.term_count, " \
+              "page.term_taxonomy, \n" \
+              "(SELECT COUNT(*) FROM terms AS child WHERE child.term_parent = page.term_id) AS child_count, " \
+              "page.sort_key FROM ( \n" \
+              "SELECT root.term_id, root.term_name, root.term_parent, root.term_slug, root.term_count, " \
+              "root.term_taxonomy, {0} AS sort_key \n" \
+              "FROM terms AS root WHERE {1} \n" \
+              "ORDER BY {0} {2}, root.term_id {2}{3} \n" \
+              ") AS page ORDER BY page.sort_key {2}, page.term_id {2}"\
+            .format(orderBy, " AND ".join(where), direction, limit)
+        return sql, values
+
+    def categoryCountSQL(self, args):
+        values = list()
+        sql = "SELECT COUNT(*) FROM terms AS root WHERE {} AND (root.term_name <> '')"\
+            .format(self.categoryScope(args, values))
+        return sql, values
+
+    def categorySearchSQL(self, args):
+        phrase = args['phrase'].replace('!', '!!').replace('%', '!%').replace('_', '!_')
+        values = ['%'+phrase+'%']
+        scope = self.categoryScope(args, values)
+        values.append(args.get('maxDepth', self.appConfig['options']['catLvls']))
+        sortColumn = args.get('orderBy', "root.term_name").split('.')[-1]
+        sql = "WITH RECURSIVE path (match_id, term_id, term_parent, sort_key, depth) AS ( \n" \
+              "SELECT root.term_id, root.term_id, root.term_parent, root.{1}, 0 FROM terms AS root " \
+              "WHERE (root.term_name LIKE ? ESCAPE '!') AND {0} \n" \
+              "UNION ALL \n" \
+              "SELECT path.match_id, t.term_id, t.term_parent, t.{1}, path.depth + 1 FROM terms AS t " \
+              "INNER JOIN path ON (t.term_id = path.term_parent) WHERE path.depth < ? \n" \
+              ") \n" \
+              "SELECT match_id, term_id, term_parent, sort_key, depth FROM path ORDER BY match_id, depth DESC"\
+            .format(scope, sortColumn)
+        return sql, values
+
+    @staticmethod
+    def categoriesFromTreeRows(rows, selectComplete=False):
+        roots, children = list(), dict()
+        for termIden, termName, termParent, termSlug, termCount, termTaxonomy, depth in rows:
+            if termName in ('', None):
+                continue
+            c = {'id': termIden,
+                 'name': termName,
+                 'level': depth,
+                 'parent': termParent}
             if selectComplete:
-                sql += "\ndown{0}.term_id AS down{0}_id, " \
-                       "down{0}.term_taxonomy AS down{0}_tax, down{0}.term_name as down{0}_name, " \
-                       "down{0}.term_slug AS down{0}_slug, down{0}.term_count AS down{0}_count".format(curLevel)
+                c['slug'] = termSlug
+                c['count'] = termCount
+                c['tax'] = termTaxonomy
+            if c['level'] == 0:
+                roots.append(c)
             else:
-                sql += "\ndown{0}.term_id AS down{0}_id, down{0}.term_name as down{0}_name"\
-                    .format(curLevel)
-            if i < catLvls:
-                sql += ","
-            i += 1
-        sql += "\nFROM terms AS root"
-        i = 1
-        while i <= catLvls:
-            curLevel = str(i)
-            if i is 1:
-                lastLevel = "root"
-            else:
-                lastLevel = "down"+str(i-1)
-            sql += "\nLEFT JOIN terms AS down{0} ON down{0}.term_parent = {1}.term_id "\
-                .format(curLevel, lastLevel)
-            i += 1
-        if queryArgs['extra']:
-            sql += "\nWHERE (root.term_parent is NULL) AND ({})".format(queryArgs['extra'])
-        else:
-            sql += "\nWHERE (root.term_parent is NULL) AND (root.term_taxonomy = '{}')".format(queryArgs['tax'])
-        sql += "\nORDER BY root_name"
-        i = 1
-        while i <= catLvls:
-            curLevel = str(i)
-            sql += ", down{}_name".format(curLevel)
-
-            i += 1
-        query = QSqlQuery(self.con)
-        query.setForwardOnly(True)
-        query.exec_(sql)
-        self.logger.debug(sql)
-        pool = []
-        categories = []
-        while query.next():
-            rootIdIndex = query.record().indexOf("root_id")
-            rootNameIndex = query.record().indexOf("root_name")
-            if query.value(rootIdIndex) not in pool and query.value(rootNameIndex) is not '':
-                c = {'id': query.value(rootIdIndex),
-                     'name': query.value(rootNameIndex),
-                     'level': 0}
-                if selectComplete:
-                    c['slug'] = query.value(query.record().indexOf("root_slug"))
-                    c['count'] = query.value(query.record().indexOf("root_count"))
-                    c['tax'] = query.value(query.record().indexOf("root_tax"))
-                categories.append(c)
-            pool.append(query.value(rootIdIndex))
-            i = 1
-            while i <= catLvls:
-                curLevel = str(i)
-                downIdIndex = query.record().indexOf("down{}_id".format(curLevel))
-                downNameIndex = query.record().indexOf("down{}_name".format(curLevel))
-                if query.value(downIdIndex) not in pool and query.value(downNameIndex) is not '':
-                    c = {'id': query.value(downIdIndex),
-                         'name': query.value(downNameIndex),
-                         'level': i}
-                    if selectComplete:
-                        c['slug'] = query.value(query.record().indexOf("down{}_slug".format(curLevel)))
-                        c['count'] = query.value(query.record().indexOf("down{}_count".format(curLevel)))
-                        c['tax'] = query.value(query.record().indexOf("down{}_tax".format(curLevel)))
-                    categories.append(c)
-                pool.append(query.value(downIdIndex))
-                i += 1
+                children.setdefault(c['parent'], list()).append(c)
+
+        categories = list()
+        stack = list(reversed(roots))
+        while stack:
+            c = stack.pop()
+            categories.append(c)
+            stack.extend(reversed(children.get(c['id'], ())))
         return categories
 
     def selectRelations(self, itemID):
-        query = QSqlQuery("SELECT term_id FROM term_relationships AS tr "
-                          "WHERE (tr.item_id= '{}')".format(itemID), self.con)
+        query = self.selectQuery("SELECT term_id FROM term_relationships AS tr "
+                                 "WHERE (tr.item_id= ?)", (itemID,))
         return query
 
     def selectRelatedTags(self, itemID, taxonomy="tag"):
-        query = QSqlQuery("SELECT t.term_name from terms AS t "
-                          "INNER JOIN term_relationships AS tr ON (tr.term_id = t.term_id) "
-                          "WHERE (tr.item_id = {}) AND (t.term_taxonomy = '{}')".format(itemID, taxonomy),
-                          self.con)
+        query = self.selectQuery("SELECT t.term_name from terms AS t "
+                                 "INNER JOIN term_relationships AS tr ON (tr.term_id = t.term_id) "
+                                 "WHERE (tr.item_id = ?) AND (t.term_taxonomy = ?)", (itemID, taxonomy))
         return query
 
     def selectCount(self, table="items"):
@@ -727,24 +1163,250 @@ class ÆDatabase(QSqlDatabase):
             self.logger.debug(table+" count: "+str(count))
             return count
 
+    def searchIndexStatements(self):
+        def rowValues(row):
+            return "{0}.item_id, {0}.item_name, {1}, {2}".format(
+                row, self.decodeSearchSQL(row+".item_source"), self.decodeSearchSQL(row+".item_description"))
+        cols = ", ".join(self.searchColumns)
+        if self.config['type'] == 'sqlite':
+            return (
+                "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5({}, "
+                "content='items', content_rowid='item_id')".format(cols),
+                "CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN "
+                "INSERT INTO items_fts (rowid, {0}) VALUES ({1}); END".format(cols, rowValues("NEW")),
+                "CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN "
+                "INSERT INTO items_fts (items_fts, rowid, {0}) VALUES ('delete', {1}); END"
+                .format(cols, rowValues("OLD")),
+                "CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE ON items BEGIN "
+                "INSERT INTO items_fts (items_fts, rowid, {0}) VALUES ('delete', {1}); "
+                "INSERT INTO items_fts (rowid, {0}) VALUES ({2}); END"
+                .format(cols, rowValues("OLD"), rowValues("NEW")),
+                "INSERT INTO items_fts (rowid, {}) SELECT {} FROM items AS i".format(cols, rowValues("i"))
+            )
+        elif self.config['type'] == 'mysql':
+            return (
+                "CREATE TABLE IF NOT EXISTS items_search ("
+                "item_id bigint(20) unsigned NOT NULL, item_name text, item_source text, item_description text, "
+                "PRIMARY KEY (item_id), "
+                "FOREIGN KEY (item_id) REFERENCES items(item_id) ON DELETE CASCADE, "
+                "FULLTEXT INDEX search_name (item_name), "
+                "FULLTEXT INDEX search_source (item_source), "
+                "FULLTEXT INDEX search_description (item_description), "
+                "FULLTEXT INDEX search_all ({})) ENGINE=InnoDB DEFAULT CHARSET=utf8".format(cols),
+                "CREATE TRIGGER IF NOT EXISTS items_search_insert AFTER INSERT ON items FOR EACH ROW "
+                "INSERT INTO items_search (item_id, {}) VALUES ({})".format(cols, rowValues("NEW")),
+                "CREATE TRIGGER IF NOT EXISTS items_search_update AFTER UPDATE ON items FOR EACH ROW "
+                "REPLACE INTO items_search (item_id, {}) VALUES ({})".format(cols, rowValues("NEW")),
+                "INSERT IGNORE INTO items_search (item_id, {}) SELECT {} FROM items AS i".format(cols, rowValues("i"))
+            )
+        return ()
+
+    def decodeSearchSQL(self, col):
+        for code in self.searchSeparators:
+            col = "REPLACE({}, '{}', ' ')".format(col, code)
+        return col
+
+    def createSearchIndex(self):
+        self.transaction()
+        for sql in self.searchIndexStatements():
+            query = QSqlQuery(self.con)
+            if not query.exec_(sql):
+                self.printQueryError(query.lastError().databaseText())
+                self.rollback()
+                self.dropSearchIndex()
+                return False
+        self.commit()
+        self.searchIndex = True
+        self.logger.info("Search index successfully created.")
+        return True
+
+    def dropSearchIndex(self):
+        query = QSqlQuery(self.con)
+        if self.config['type'] == 'sqlite':
+            for trigger in ('items_fts_insert', 'items_fts_delete', 'items_fts_update'):
+                query.exec_("DROP TRIGGER IF EXISTS {}".format(trigger))
+            query.exec_("DROP TABLE IF EXISTS items_fts")
+        elif self.config['type'] == 'mysql':
+            for trigger in ('items_search_insert', 'items_search_update'):
+                query.exec_("DROP TRIGGER IF EXISTS {}".format(trigger))
+            query.exec_("DROP TABLE IF EXISTS items_search")
+        self.searchIndex = False
+        self.logger.info("Search index successfully dropped.")
+        return True
+
+    def searchItemsSQL(self, phrase, columns=None, exactPhrase=False):
+        if not self.searchIndex:
+            return None
+        if exactPhrase:
+            groups = [[(False, phrase.strip(), True)]] if phrase.strip() else []
+        else:
+            groups = parseSearchQuery(phrase)
+        groups = [group for group in groups if any(not negated for negated, text, quoted in group)]
+        if not groups:
+            return None
+        columns = tuple(columns or self.searchColumns)
+        if self.config['type'] == 'sqlite':
+            match = " OR ".join(self.ftsGroup(group) for group in groups)
+            if columns != self.searchColumns:
+                match = "{{{}}} : ({})".format(" ".join(columns), match)
+            return "SELECT rowid AS item_id, -bm25(items_fts) AS score FROM items_fts " \
+                   "WHERE items_fts MATCH '{}'".format(match.replace("'", "''"))
+        elif self.config['type'] == 'mysql':
+            against = " ".join(self.fullTextGroup(group, len(groups) > 1) for group in groups)
+            against = "MATCH({}) AGAINST('{}' IN BOOLEAN MODE)"\
+                .format(", ".join(columns), against.replace("\\", "\\\\").replace("'", "''"))
+            return "SELECT item_id, {0} AS score FROM items_search WHERE {0}".format(against)
+
+    @staticmethod
+    def ftsGroup(group):
+        def ftsTerm(text, quoted):
+            term = '"{}"'.format(text.replace('"', '""'))
+            if not quoted:
+                term += "*"
+            if not text.isascii():
+                term = '({} OR "{}")'.format(term, quote(text))
+            return term
+        positives = [ftsTerm(text, quoted) for negated, text, quoted in group if not negated]
+        negatives = [ftsTerm(text, quoted) for negated, text, quoted in group if negated]
+        return "("+" AND ".join(positives)+")" + "".join(" NOT "+term for term in negatives)
+
+    @staticmethod
+    def fullTextGroup(group, nested=False):
+        terms = list()
+        for negated, text, quoted in group:
+            text = re.sub(r'[+\-<>()~*@"]', ' ', text).strip()
+            if not text:
+                continue
+            if quoted or ' ' in text:
+                term = '"{}"'.format(text)
+            else:
+                term = text+"*"
+            terms.append(("-" if negated else "+")+term)
+        if nested:
+            return "("+" ".join(terms)+")"
+        return " ".join(terms)
+
+    def selectTermCountDiscrepancies(self):
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(True)
+        sql = "SELECT term_id, term_name, term_count, relations FROM " \
+              "(SELECT t.term_id, t.term_name, t.term_count, " \
+              "(SELECT COUNT(*) FROM term_relationships AS tr WHERE tr.term_id = t.term_id) AS relations " \
+              "FROM terms AS t) AS counts WHERE term_count <> relations"
+        self.logger.debug('\n'+sql)
+        query.exec_(sql)
+        discrepancies = list()
+        while query.next():
+            discrepancies.append((query.value(0), query.value(1), query.value(2), query.value(3)))
+        return discrepancies
+
+    def selectCountSubtreeItems(self, termIden):
+        query = self.execQuery("SELECT COUNT(DISTINCT tr.item_id) FROM term_closure AS tc "
+                               "INNER JOIN term_relationships AS tr ON (tr.term_id = tc.descendant_id) "
+                               "WHERE (tc.ancestor_id = ?)", (termIden,))
+        if query.first():
+            count = query.value(0)
+            query.finish()
+            return count
+
+    def selectCategoryAncestors(self, termIden):
+        return self.selectQuery("SELECT t.term_id, t.term_name FROM term_closure AS tc "
+                                "INNER JOIN terms AS t ON (t.term_id = tc.ancestor_id) "
+                                "WHERE (tc.descendant_id = ?) ORDER BY tc.depth DESC", (termIden,))
+
     def selectCountRelations(self, iden, col="item_id"):
-        query = QSqlQuery('SELECT COUNT(*) FROM term_relationships '
-                          'WHERE {} = "{}"'.format(col, iden), self.con)
+        query = self.execQuery('SELECT COUNT(*) FROM term_relationships '
+                               'WHERE {} = ?'.format(col), (iden,))
         if query.first():
             count = query.value(0)
+            query.finish()
             return count
 
     def selectOption(self, option):
-        query = QSqlQuery('SELECT option_value FROM options WHERE option_name = "{}"'.format(option),
-                          self.con)
+        query = self.execQuery('SELECT option_value FROM options WHERE option_name = ?', (option,))
         if query.first():
             optionValue = query.value(0)
+            query.finish()
             self.logger.debug("Option {}: {}".format(option, optionValue))
             return unquote(optionValue)
 
     def selectOptions(self):
         return QSqlQuery('SELECT option_name, option_value FROM options', self.con)
 
+    def selectDirSnapshots(self):
+        snapshots = dict()
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(True)
+        query.exec_("SELECT dir_path, dir_mtime, entry_count, name_digest, entry_names FROM dir_snapshots")
+        while query.next():
+            entryNames = query.value(4)
+            snapshots[query.value(0)] = (int(query.value(1)), int(query.value(2)), query.value(3),
+                                         set(entryNames.split('\n')) if entryNames else set())
+        return snapshots
+
+    def selectMissingFiles(self):
+        missingFiles = list()
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(True)
+        query.exec_("SELECT mf.item_id FROM missing_files AS mf "
+                    "INNER JOIN items AS i ON (i.item_id = mf.item_id) ORDER BY mf.item_id")
+        while query.next():
+            missingFiles.append(str(query.value(0)))
+        return missingFiles
+
+    def replaceMissingFiles(self, itemIdens):
+        QSqlQuery("DELETE FROM missing_files", self.con)
+        return self.insertRows("missing_files", ("item_id",), [(itemIden,) for itemIden in itemIdens])
+
+    def replaceDirSnapshots(self, snapshots):
+        if self.config['type'] == 'mysql':
+            SQL = "INSERT INTO dir_snapshots(dir_path, dir_mtime, entry_count, name_digest, entry_names) \n" \
+                  "VALUES(?, ?, ?, ?, ?) \n" \
+                  "ON DUPLICATE KEY UPDATE dir_mtime=VALUES(dir_mtime), entry_count=VALUES(entry_count), " \
+                  "name_digest=VALUES(name_digest), entry_names=VALUES(entry_names)"
+        else:
+            SQL = "INSERT OR REPLACE INTO dir_snapshots (dir_path, dir_mtime, entry_count, name_digest, entry_names) \n" \
+                  "VALUES (?, ?, ?, ?, ?)"
+        rows = [(dirPath, dirMtime, entryCount, nameDigest, '\n'.join(sorted(entryNames)))
+                for dirPath, (dirMtime, entryCount, nameDigest, entryNames) in snapshots.items()]
+        return self.execBatchQuery(SQL, rows)
+
+    def selectLinkChecks(self):
+        linkChecks = dict()
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(True)
+        query.exec_("SELECT link_source, link_status, checked_time, etag, last_modified, failure_streak "
+                    "FROM link_checks")
+        while query.next():
+            status = query.value(1)
+            linkChecks[query.value(0)] = (None if status in (None, '') else int(status), int(query.value(2)),
+                                          query.value(3), query.value(4), int(query.value(5)))
+        return linkChecks
+
+    def replaceLinkChecks(self, linkChecks):
+        if self.config['type'] == 'mysql':
+            SQL = "INSERT INTO link_checks(link_source, link_status, checked_time, etag, last_modified, " \
+                  "failure_streak) \nVALUES(?, ?, ?, ?, ?, ?) \n" \
+                  "ON DUPLICATE KEY UPDATE link_status=VALUES(link_status), checked_time=VALUES(checked_time), " \
+                  "etag=VALUES(etag), last_modified=VALUES(last_modified), failure_streak=VALUES(failure_streak)"
+        else:
+            SQL = "INSERT OR REPLACE INTO link_checks (link_source, link_status, checked_time, etag, " \
+                  "last_modified, failure_streak) \nVALUES (?, ?, ?, ?, ?, ?)"
+        rows = [(linkSource,)+tuple(linkCheck) for linkSource, linkCheck in linkChecks.items()]
+        return self.execBatchQuery(SQL, rows)
+
+    def selectBrokenLinks(self, okStatuses=(200, 206, 304)):
+        brokenLinks = list()
+        query = QSqlQuery(self.con)
+        query.setForwardOnly(True)
+        query.exec_("SELECT i.item_id FROM items AS i \n"
+                    "INNER JOIN link_checks AS lc ON (lc.link_source = i.item_source) \n"
+                    "WHERE (lc.link_status NOT IN ({})) ORDER BY i.item_id"
+                    .format(", ".join(str(status) for status in okStatuses)))
+        while query.next():
+            brokenLinks.append(str(query.value(0)))
+        return brokenLinks
+
     def selectItemTypes(self):
         return QSqlQuery('SELECT * FROM item_types', self.con)
 
@@ -758,57 +1420,40 @@ class ÆDatabase(QSqlDatabase):
         return QSqlQuery('SElECT DISTINCT term_taxonomy from terms', self.con)
 
     def selectCopypasta(self, itemIdens):
-        query = QSqlQuery(self.con)
-        query.setForwardOnly(True)
+        itemIdens = list(itemIdens)
         SQL = "Select item_name, item_source, item_description, type_id FROM items " \
-              "WHERE item_id IN ({})".format(", ".join(itemIdens))
-        self.logger.debug('\n'+SQL)
-        query.exec_(SQL)
-        return query
+              "WHERE item_id IN ({})".format(", ".join("?" * len(itemIdens)))
+        return self.selectQuery(SQL, itemIdens, forwardOnly=True)
 
     def selectCopypastaFromCategories(self, catIdens):
-        query = QSqlQuery(self.con)
-        query.setForwardOnly(True)
+        catIdens = list(catIdens)
         SQL = "Select DISTINCT i.item_name, i.item_source, i.item_description, i.type_id, i.item_id FROM items AS i " \
               "INNER JOIN term_relationships AS tr ON (tr.item_id = i.item_id) " \
-              "WHERE tr.term_id IN ({})".format(", ".join(catIdens))
-        self.logger.debug('\n'+SQL)
-        query.exec_(SQL)
-        return query
-
-    def incrementTermCount(self, catid):
-        QSqlQuery("UPDATE terms SET term_count = term_count + 1 "
-                  "WHERE term_id = '{}'".format(catid), self.con)
-        return True
-
-    def decrementTermCount(self, catid):
-        QSqlQuery("UPDATE terms SET term_count = term_count - 1 "
-                  "WHERE term_id = '{}'".format(catid), self.con)
-        return True
+              "WHERE tr.term_id IN ({})".format(", ".join("?" * len(catIdens)))
+        return self.selectQuery(SQL, catIdens, forwardOnly=True)
 
     def checkRelation(self, itemID, taxID):
-        query = QSqlQuery("SELECT * FROM term_relationships AS tr "
-                          "WHERE (tr.item_id = '{}') AND (tr.term_id = '{}')".format(itemID, taxID),
-                          self.con)
+        query = self.execQuery("SELECT * FROM term_relationships AS tr "
+                               "WHERE (tr.item_id = ?) AND (tr.term_id = ?)", (itemID, taxID))
         if query.first():
+            query.finish()
             return True
 
     def insertOption(self, option, value):
         SQL = str()
         if self.config['type'] == 'mysql':
             SQL = "INSERT INTO options(option_name, option_value) \n" \
-                  "VALUES('{0}', '{1}') \n" \
+                  "VALUES(?, ?) \n" \
                   "ON DUPLICATE KEY UPDATE option_id=LAST_INSERT_ID(option_id), " \
-                  "option_value='{1}'".format(option, value)
-            QSqlQuery(SQL, self.con)
+                  "option_value=VALUES(option_value)"
+            self.execQuery(SQL, (option, value)).finish()
         elif self.config['type'] == 'sqlite':
             SQL = "INSERT OR REPLACE INTO options (option_id, option_name, option_value) \n" \
                   "SELECT old.option_id, new.option_name, new.option_value \n" \
-                  "FROM ( SELECT '{}' AS option_name, '{}' AS option_value ) AS new \n" \
+                  "FROM ( SELECT ? AS option_name, ? AS option_value ) AS new \n" \
                   "LEFT JOIN ( SELECT option_id, option_name, option_value FROM options ) AS old \n" \
-                  "ON new.option_name = old.option_name;".format(option, value)
-            QSqlQuery(SQL, self.con)
-        self.logger.debug('\n'+SQL)
+                  "ON new.option_name = old.option_name;"
+            self.execQuery(SQL, (option, value)).finish()
         return True
 
     def insertItemType(self, data):
@@ -816,22 +1461,11 @@ class ÆDatabase(QSqlDatabase):
             self.logger.error("Error creating new item type: field is missing.")
             return False
         else:
-            SQL = str()
-            if self.config['type'] == 'mysql':
-                SQL = "INSERT INTO item_types(noun_name, plural_name, dir_name, " \
-                      "table_name, icon_name, enabled, extensions) \n" \
-                      "VALUES('{0}', '{1}', '{2}', '{3}', '{4}', '{5}', '{6}')" \
-                    .format(data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
-                            data['icon_name'], data['enabled'], data['extensions'])
-                QSqlQuery(SQL, self.con)
-            elif self.config['type'] == 'sqlite':
-                SQL = "INSERT INTO item_types (noun_name, plural_name, dir_name, " \
-                      "table_name, icon_name, enabled, extensions) \n" \
-                      "VALUES('{0}', '{1}', '{2}', '{3}', '{4}', '{5}', '{6}')" \
-                    .format(data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
-                            data['icon_name'], data['enabled'], data['extensions'])
-                QSqlQuery(SQL, self.con)
-            self.logger.debug('\n'+SQL)
+            SQL = "INSERT INTO item_types (noun_name, plural_name, dir_name, " \
+                  "table_name, icon_name, enabled, extensions) \n" \
+                  "VALUES(?, ?, ?, ?, ?, ?, ?)"
+            self.execQuery(SQL, (data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
+                                 data['icon_name'], data['enabled'], data['extensions'])).finish()
             return True
 
     def insertTaxonomy(self, data):
@@ -839,22 +1473,11 @@ class ÆDatabase(QSqlDatabase):
             self.logger.error("Error creating new taxonomy: field is missing.")
             return False
         else:
-            SQL = str()
-            if self.config['type'] == 'mysql':
-                SQL = "INSERT INTO taxonomies(noun_name, plural_name, dir_name, " \
-                      "table_name, icon_name, enabled, has_children, is_tags) \n" \
-                      "VALUES('{0}', '{1}', '{2}', '{3}', '{4}', '{5}', '{6}', '{7}')" \
-                    .format(data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
-                            data['icon_name'], data['enabled'], data['has_children'], data['is_tags'])
-                QSqlQuery(SQL, self.con)
-            elif self.config['type'] == 'sqlite':
-                SQL = "INSERT INTO taxonomies (noun_name, plural_name, dir_name, " \
-                      "table_name, icon_name, enabled, has_children, is_tags) \n" \
-                      "VALUES('{0}', '{1}', '{2}', '{3}', '{4}', '{5}', '{6}', '{7}')" \
-                    .format(data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
-                            data['icon_name'], data['enabled'], data['has_children'], data['is_tags'])
-                QSqlQuery(SQL, self.con)
-            self.logger.debug('\n'+SQL)
+            SQL = "INSERT INTO taxonomies (noun_name, plural_name, dir_name, " \
+                  "table_name, icon_name, enabled, has_children, is_tags) \n" \
+                  "VALUES(?, ?, ?, ?, ?, ?, ?, ?)"
+            self.execQuery(SQL, (data['noun_name'], data['plural_name'], data['dir_name'], data['table_name'],
+                                 data['icon_name'], data['enabled'], data['has_children'], data['is_tags'])).finish()
             return True
 
     def deleteAllData(self):
@@ -862,6 +1485,7 @@ class ÆDatabase(QSqlDatabase):
         query.exec_("DELETE FROM items;")
         query.exec_("DELETE FROM terms;")
         query.exec_("DELETE FROM term_relationships;")
+        query.exec_("DELETE FROM term_closure;")
         if self.config['type'] == 'mysql':
             query.exec_("ALTER TABLE terms AUTO_INCREMENT = 1;")
             query.exec_("ALTER TABLE items AUTO_INCREMENT = 1;")
@@ -876,6 +1500,7 @@ class ÆDatabase(QSqlDatabase):
             self.logger.debug('\n'+SQL)
             QSqlQuery(SQL, self.con)
         elif self.config['type'] == 'sqlite':
+            self.closeConnection()
             os.remove(self.config['db'])
         self.logger.info("Database successfully dropped.")
         return True
@@ -76,7 +76,7 @@ def uploadFile(parent, fileSource, fileDestination, fileType=None):
         baseFilename = os.path.basename(fileSource)
         fileName = os.path.splitext(baseFilename)[0]
 
-        if fileType in parent.config['itemTypes'].nounNames(Æ.IsWebpages):
+        if fileType in parent.config['itemTypes'].nounSet(Æ.IsWebpages):
                 destDir = os.path.dirname(fileDestination)
                 if not os.path.exists(destDir):
                     os.makedirs(destDir)
@@ -151,7 +151,7 @@ def escapeFile(parent, baseFileName, fileType):
         newFilePath = getDataFilePath(
             dataDir, parent.config['itemTypes'].dirFromNoun(fileType), æscape(baseFileName))
 
-        if fileType in parent.config['itemTypes'].nounNames(Æ.IsWebpages):
+        if fileType in parent.config['itemTypes'].nounSet(Æ.IsWebpages):
             fileName = os.path.splitext(baseFileName)[0]
             oldFolderName = fileName+'_files'
             newFolderName = æscape(fileName)+'_files'
@@ -186,6 +186,22 @@ def æscape(string, chars=("'", '"', '`', '$'), replacement=""):
     return string
 
 
+def parseSearchQuery(phrase):
+    groups, group = list(), list()
+    for negated, quoted, word in re.findall(r'(-?)(?:"([^"]*)"|(\S+))', phrase):
+        if word == "OR" and not negated:
+            if group:
+                groups.append(group)
+            group = list()
+            continue
+        text = quoted.strip() if quoted else word.strip('*"')
+        if text:
+            group.append((bool(negated), text, bool(quoted)))
+    if group:
+        groups.append(group)
+    return groups
+
+
 def renameFolder(parent, filePath):
     try:
         os.remove(filePath)
@@ -4,18 +4,29 @@ import shutil
 import logging
 import copy
 import operator
+import re
+import sys
+import hashlib
+import threading
+import unicodedata
+from bisect import bisect_right
+from array import array
+from collections import OrderedDict
 from urllib.parse import quote, unquote
 
 from PySide6.QtCore import Signal, Qt, QAbstractTableModel, QFile, QIODevice, QDateTime, QSize, QAbstractItemModel, \
-    QModelIndex, QItemSelection, QStringListModel, QSortFilterProxyModel, QItemSelectionModel
+    QModelIndex, QItemSelection, QStringListModel, QSortFilterProxyModel, QItemSelectionModel, QObject, QThread, \
+    QRunnable, QThreadPool, QTimer
 from PySide6.QtWidgets import QStyle, QToolButton, QLineEdit, QMessageBox, QVBoxLayout, \
     QSizePolicy, QAbstractItemView, QCheckBox, QTreeView, QListView, QCompleter
 from PySide6.QtSql import QSqlQuery
-from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtGui import QIcon, QPixmap, QImage, QImageReader
 
 from filecatman.core.printcolours import bcolours
+from filecatman.core import const
 from filecatman.core.namespace import Æ
 from filecatman.core.functions import formatBytes, getDataFilePath, warningMsgBox, æscape
+from filecatman.core.database import ÆDatabase
 
 
 class ÆButtonLineEdit(QLineEdit):
@@ -270,21 +281,25 @@ class ÆIconTheme:
         return self.iconAlternatives.keys()
 
 
-class ÆTaxonomyList:
-    data = list()
-    index = 0
+class ÆTypeList:
+    missingItem = None
+    flagFilters = dict()
 
     def __init__(self, data=None):
+        self.data = list()
+        self.index = 0
+        self.lookups = None
         if data:
-            self.data = data
+            for typeObj in data:
+                self.append(typeObj)
 
     def __next__(self):
         if self.index == len(self.data):
             raise StopIteration
         else:
-            taxonomy = self.data[self.index]
+            typeObj = self.data[self.index]
             self.index += 1
-        return taxonomy
+        return typeObj
 
     def __iter__(self):
         self.index = 0
@@ -294,153 +309,134 @@ class ÆTaxonomyList:
         if isinstance(item, int):
             return self.data[item]
         elif isinstance(item, str):
-            for taxonomy in self.data:
-                if taxonomy.nounName == item:
-                    return taxonomy
-                elif taxonomy.pluralName == item:
-                    return taxonomy
-                elif taxonomy.tableName == item:
-                    return taxonomy
-                elif taxonomy.dirName == item:
-                    return taxonomy
+            typeObj = self.lookup('names', item)
+            if typeObj is not None:
+                return typeObj
+        return self.missingItem
 
     def __len__(self):
         return len(self.data)
 
+    def invalidate(self):
+        self.lookups = None
+
+    def buildLookups(self):
+        lookups = dict(names=dict(), nounName=dict(), pluralName=dict(), tableName=dict(), dirName=dict(),
+                       extensions=dict(), lists=dict(), sets=dict())
+        for typeObj in self.data:
+            for attr in ('nounName', 'pluralName', 'tableName', 'dirName'):
+                value = getattr(typeObj, attr)
+                lookups[attr].setdefault(value, typeObj)
+                lookups['names'].setdefault(value, typeObj)
+            for ext in getattr(typeObj, 'extensions', None) or ():
+                lookups['extensions'].setdefault(ext, typeObj)
+        self.lookups = lookups
+        return lookups
+
+    def lookup(self, key, value):
+        lookups = self.lookups or self.buildLookups()
+        return lookups[key].get(value)
+
+    def convert(self, key, value, attr):
+        typeObj = self.lookup(key, value)
+        if typeObj is None:
+            return False
+        return getattr(typeObj, attr)
+
+    def names(self, attr, flag=None):
+        lookups = self.lookups or self.buildLookups()
+        names = lookups['lists'].get((attr, flag))
+        if names is None:
+            flagFilter = self.flagFilters.get(flag)
+            names = tuple(getattr(typeObj, attr) for typeObj in self.data
+                          if getattr(typeObj, attr) and (flagFilter is None or flagFilter(typeObj)))
+            lookups['lists'][(attr, flag)] = names
+        return names
+
+    def nameSet(self, attr, flag=None):
+        lookups = self.lookups or self.buildLookups()
+        nameSet = lookups['sets'].get((attr, flag))
+        if nameSet is None:
+            nameSet = lookups['sets'][(attr, flag)] = frozenset(self.names(attr, flag))
+        return nameSet
+
     def append(self, typeObj):
         self.data.append(typeObj)
+        typeObj.owner = self
+        self.invalidate()
 
     def pop(self, index):
-        self.data.pop(index)
+        self.data.pop(index).owner = None
+        self.invalidate()
 
     def clear(self):
-        try:
-            self.data.clear()
-        except AttributeError:
-            del self.data[:]
+        for typeObj in self.data:
+            typeObj.owner = None
+        self.data = list()
+        self.invalidate()
 
     def remove(self, objOrName):
-        if isinstance(objOrName, ÆTaxonomy):
+        if isinstance(objOrName, str):
+            objOrName = self.lookup('names', objOrName)
+        if objOrName is not None and objOrName in self.data:
             self.data.remove(objOrName)
+            objOrName.owner = None
+            self.invalidate()
             return True
-        elif isinstance(objOrName, str):
-            for taxonomy in self.data:
-                if taxonomy.nounName == objOrName:
-                    self.data.remove(taxonomy)
-                    return True
-                elif taxonomy.pluralName == objOrName:
-                    self.data.remove(taxonomy)
-                    return True
-                elif taxonomy.tableName == objOrName:
-                    self.data.remove(taxonomy)
-                    return True
-                elif taxonomy.dirName == objOrName:
-                    self.data.remove(taxonomy)
-                    return True
         return False
 
     def tableFromPlural(self, pluralName):
-        for taxonomy in self.data:
-            if taxonomy.pluralName == pluralName:
-                return taxonomy.tableName
-        return False
+        return self.convert('pluralName', pluralName, 'tableName')
 
     def tableFromNoun(self, nounName):
-        for taxonomy in self.data:
-            if taxonomy.nounName == nounName:
-                return taxonomy.tableName
-        return False
+        return self.convert('nounName', nounName, 'tableName')
 
     def nounFromPlural(self, pluralName):
-        for taxonomy in self.data:
-            if taxonomy.pluralName == pluralName:
-                return taxonomy.nounName
-        return False
+        return self.convert('pluralName', pluralName, 'nounName')
 
     def nounFromTable(self, tableName):
-        for taxonomy in self.data:
-            if taxonomy.tableName == tableName:
-                return taxonomy.nounName
-        return False
+        return self.convert('tableName', tableName, 'nounName')
 
     def dirFromTable(self, tableName):
-        for taxonomy in self.data:
-            if taxonomy.tableName == tableName:
-                return taxonomy.dirName
-        return False
+        return self.convert('tableName', tableName, 'dirName')
 
     def dirFromNoun(self, nounName):
-        for taxonomy in self.data:
-            if taxonomy.nounName == nounName:
-                return taxonomy.dirName
-        return False
+        return self.convert('nounName', nounName, 'dirName')
 
     def dirFromPlural(self, pluralName):
-        for taxonomy in self.data:
-            if taxonomy.pluralName == pluralName:
-                return taxonomy.dirName
-        return False
+        return self.convert('pluralName', pluralName, 'dirName')
 
     def pluralFromTable(self, tableName):
-        for taxonomy in self.data:
-            if taxonomy.tableName == tableName:
-                return taxonomy.pluralName
-        return False
+        return self.convert('tableName', tableName, 'pluralName')
+
+    def validateIcons(self, icons, backupName):
+        for typeObj in self.data:
+            if not icons.get(typeObj.iconName):
+                typeObj.setIconName(backupName)
+
+
+class ÆTaxonomyList(ÆTypeList):
+    flagFilters = {
+        Æ.OnlyDisabled: lambda taxonomy: not taxonomy.enabled,
+        Æ.OnlyEnabled: lambda taxonomy: taxonomy.enabled,
+        Æ.NoChildren: lambda taxonomy: not taxonomy.hasChildren,
+        Æ.IsTags: lambda taxonomy: taxonomy.isTags,
+        Æ.NoTags: lambda taxonomy: not taxonomy.isTags
+    }
 
     def nounNames(self):
-        nounList = list()
-        for taxonomy in self.data:
-            if taxonomy.nounName:
-                nounList.append(taxonomy.nounName)
-        return nounList
+        return list(self.names('nounName'))
 
     def tableNames(self, flag=None):
-        tableList = list()
-        for taxonomy in self.data:
-            if flag == Æ.OnlyDisabled:
-                if taxonomy.tableName and not taxonomy.enabled:
-                    tableList.append(taxonomy.tableName)
-            elif flag == Æ.OnlyEnabled:
-                if taxonomy.tableName and taxonomy.enabled:
-                    tableList.append(taxonomy.tableName)
-            elif flag == Æ.NoChildren:
-                if taxonomy.tableName and not taxonomy.hasChildren:
-                    tableList.append(taxonomy.tableName)
-            elif flag == Æ.IsTags:
-                if taxonomy.tableName and taxonomy.isTags:
-                    tableList.append(taxonomy.tableName)
-            elif flag == Æ.NoTags:
-                if taxonomy.tableName and not taxonomy.isTags:
-                    tableList.append(taxonomy.tableName)
-            else:
-                if taxonomy.tableName:
-                    tableList.append(taxonomy.tableName)
-        return tableList
+        return list(self.names('tableName', flag))
 
-    def pluralNames(self, flag=None):
-        pluralList = list()
-        for taxonomy in self.data:
-            if flag == Æ.OnlyEnabled:
-                if taxonomy.pluralName and taxonomy.enabled:
-                    pluralList.append(taxonomy.pluralName)
-            elif flag == Æ.NoChildren:
-                if taxonomy.pluralName and not taxonomy.hasChildren:
-                    pluralList.append(taxonomy.pluralName)
-            elif flag == Æ.IsTags:
-                if taxonomy.pluralName and taxonomy.isTags:
-                    pluralList.append(taxonomy.pluralName)
-            elif flag == Æ.NoTags:
-                if taxonomy.pluralName and not taxonomy.isTags:
-                    pluralList.append(taxonomy.pluralName)
-            else:
-                if taxonomy.pluralName:
-                    pluralList.append(taxonomy.pluralName)
-        return pluralList
+    def tableSet(self, flag=None):
+        return self.nameSet('tableName', flag)
 
-    def validateIcons(self, icons, backupName):
-        for taxonomy in self.data:
-            if not icons.get(taxonomy.iconName):
-                taxonomy.setIconName(backupName)
+    def pluralNames(self, flag=None):
+        if flag == Æ.OnlyDisabled:
+            flag = None
+        return list(self.names('pluralName', flag))
 
 
 class ÆTaxonomy:
@@ -452,6 +448,7 @@ class ÆTaxonomy:
     iconName = "Categories"
     hasChildren = True
     isTags = False
+    owner = None
 
     def __init__(self, data=None):
         if data:
@@ -460,6 +457,14 @@ class ÆTaxonomy:
             self.tableName = data[2]
             self.extensions = data[3]
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self.changed()
+
+    def changed(self):
+        if self.owner is not None:
+            self.owner.invalidate()
+
     def setPluralName(self, name):
         self.pluralName = name
         if not self.dirName:
@@ -533,180 +538,35 @@ class ÆTaxonomy:
         print(bcolours.HEADER+"Is Tags: "+bcolours.ENDC+str(self.isTags))
 
 
-class ÆItemTypeList:
-    data = list()
-    index = 0
-
-    def __init__(self, data=None):
-        if data:
-            self.data = data
-
-    def __next__(self):
-        if self.index == len(self.data):
-            raise StopIteration
-        else:
-            itemType = self.data[self.index]
-            self.index += 1
-        return itemType
-
-    def __iter__(self):
-        self.index = 0
-        return self
-
-    def __getitem__(self, item):
-        if isinstance(item, int):
-            return self.data[item]
-        elif isinstance(item, str):
-            for itemType in self.data:
-                if itemType.nounName == item:
-                    return itemType
-                elif itemType.pluralName == item:
-                    return itemType
-                elif itemType.tableName == item:
-                    return itemType
-                elif itemType.dirName == item:
-                    return itemType
-        return False
-
-    def __len__(self):
-        return len(self.data)
-
-    def append(self, typeObj):
-        self.data.append(typeObj)
-
-    def pop(self, index):
-        self.data.pop(index)
-
-    def clear(self):
-        try:
-            self.data.clear()
-        except AttributeError:
-            del self.data[:]
-
-    def remove(self, objOrName):
-        if isinstance(objOrName, ÆItemType):
-            self.data.remove(objOrName)
-            return True
-        elif isinstance(objOrName, str):
-            for itemType in self.data:
-                if itemType.nounName == objOrName:
-                    self.data.remove(itemType)
-                    return True
-                elif itemType.pluralName == objOrName:
-                    self.data.remove(itemType)
-                    return True
-                elif itemType.tableName == objOrName:
-                    self.data.remove(itemType)
-                    return True
-                elif itemType.dirName == objOrName:
-                    self.data.remove(itemType)
-                    return True
-        return False
-
-    def tableFromPlural(self, pluralName):
-        for itemType in self.data:
-            if itemType.pluralName == pluralName:
-                return itemType.tableName
-        return False
-
-    def tableFromNoun(self, nounName):
-        for itemType in self.data:
-            if itemType.nounName == nounName:
-                return itemType.tableName
-        return False
-
-    def nounFromPlural(self, pluralName):
-        for itemType in self.data:
-            if itemType.pluralName == pluralName:
-                return itemType.nounName
-        return False
-
-    def nounFromTable(self, tableName):
-        for itemType in self.data:
-            if itemType.tableName == tableName:
-                return itemType.nounName
-        return False
+class ÆItemTypeList(ÆTypeList):
+    missingItem = False
+    flagFilters = {
+        Æ.OnlyEnabled: lambda itemType: itemType.enabled,
+        Æ.OnlyDisabled: lambda itemType: not itemType.enabled,
+        Æ.IsWeblinks: lambda itemType: itemType.isWeblinks,
+        Æ.NoWeblinks: lambda itemType: not itemType.isWeblinks,
+        Æ.IsWebpages: lambda itemType: itemType.isWebpages,
+        Æ.NoWebpages: lambda itemType: not itemType.isWebpages
+    }
 
     def nounFromExtension(self, ext):
-        for itemType in self.data:
-            if itemType.hasExtension(ext):
-                return itemType.nounName
-        return False
-
-    def dirFromTable(self, tableName):
-        for itemType in self.data:
-            if itemType.tableName == tableName:
-                return itemType.dirName
-        return False
-
-    def dirFromNoun(self, nounName):
-        for itemType in self.data:
-            if itemType.nounName == nounName:
-                return itemType.dirName
-        return False
-
-    def dirFromPlural(self, pluralName):
-        for itemType in self.data:
-            if itemType.pluralName == pluralName:
-                return itemType.dirName
-        return False
-
-    def pluralFromTable(self, tableName):
-        for itemType in self.data:
-            if itemType.tableName == tableName:
-                return itemType.pluralName
-        return False
+        return self.convert('extensions', ext, 'nounName')
 
     def nounNames(self, flag=None):
-        nounList = list()
-        for itemType in self.data:
-            if flag == Æ.OnlyEnabled:
-                if itemType.nounName and itemType.enabled:
-                    nounList.append(itemType.nounName)
-            elif flag == Æ.OnlyDisabled:
-                if itemType.nounName and not itemType.enabled:
-                    nounList.append(itemType.nounName)
-            elif flag == Æ.IsWeblinks:
-                if itemType.nounName and itemType.isWeblinks:
-                    nounList.append(itemType.nounName)
-            elif flag == Æ.NoWeblinks:
-                if itemType.nounName and not itemType.isWeblinks:
-                    nounList.append(itemType.nounName)
-            elif flag == Æ.IsWebpages:
-                if itemType.nounName and itemType.isWebpages:
-                    nounList.append(itemType.nounName)
-            elif flag == Æ.NoWebpages:
-                if itemType.nounName and not itemType.isWebpages:
-                    nounList.append(itemType.nounName)
-            else:
-                if itemType.nounName:
-                    nounList.append(itemType.nounName)
-        return nounList
+        return list(self.names('nounName', flag))
+
+    def nounSet(self, flag=None):
+        return self.nameSet('nounName', flag)
 
     def tableNames(self, flag=None):
-        tableList = list()
-        for itemType in self.data:
-            if flag == Æ.OnlyEnabled:
-                if itemType.tableName and itemType.enabled:
-                    tableList.append(itemType.tableName)
-            elif flag == Æ.OnlyDisabled:
-                if itemType.tableName and not itemType.enabled:
-                    tableList.append(itemType.tableName)
-            elif flag == Æ.IsWeblinks:
-                if itemType.tableName and itemType.isWeblinks:
-                    tableList.append(itemType.tableName)
-            elif flag == Æ.NoWeblinks:
-                if itemType.tableName and not itemType.isWeblinks:
-                    tableList.append(itemType.tableName)
-            else:
-                if itemType.tableName:
-                    tableList.append(itemType.tableName)
-        return tableList
+        if flag in (Æ.IsWebpages, Æ.NoWebpages):
+            flag = None
+        return list(self.names('tableName', flag))
 
-    def validateIcons(self, icons, backupName):
-        for itemType in self.data:
-            if not icons.get(itemType.iconName):
-                itemType.setIconName(backupName)
+    def tableSet(self, flag=None):
+        if flag in (Æ.IsWebpages, Æ.NoWebpages):
+            flag = None
+        return self.nameSet('tableName', flag)
 
 
 class ÆItemType:
@@ -718,6 +578,7 @@ class ÆItemType:
     iconName = "Items"
     isWeblinks = False
     isWebpages = False
+    owner = None
 
     def __init__(self, data=None):
         self.extensions = list()
@@ -728,6 +589,14 @@ class ÆItemType:
             self.tableName = data[2]
             self.extensions = data[3]
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self.changed()
+
+    def changed(self):
+        if self.owner is not None:
+            self.owner.invalidate()
+
     def setPluralName(self, name):
         self.pluralName = name
         if not self.dirName:
@@ -750,10 +619,12 @@ class ÆItemType:
         for ext in exts:
             if ext not in self.extensions:
                 self.extensions.append(ext)
+        self.changed()
 
     def addExtension(self, ext):
         if ext not in self.extensions:
             self.extensions.append(ext)
+            self.changed()
 
     def hasExtension(self, ext):
         if ext in self.extensions:
@@ -763,12 +634,14 @@ class ÆItemType:
 
     def removeExtension(self, ext):
         self.extensions.remove(ext)
+        self.changed()
 
     def clearExtensions(self):
         try:
             self.extensions.clear()
         except AttributeError:
             del self.extensions[:]
+        self.changed()
 
     def extensionCount(self):
         return len(self.extensions)
@@ -823,6 +696,7 @@ class ÆDataFolderModel(QAbstractTableModel):
         self.parent = parent
         self.dataDir = parent.dataDir
         self.items = list()
+        self.checked = ÆBitSet()
 
         self.colNames = ("File Name", "Date Modified", "Has Item?", "File Size", "Extension")
 
@@ -839,47 +713,66 @@ class ÆDataFolderModel(QAbstractTableModel):
         return flags
 
     def setItemType(self, itemType):
-        if itemType in self.config['itemTypes'].nounNames(Æ.IsWeblinks):
+        if itemType in self.config['itemTypes'].nounSet(Æ.IsWeblinks):
             return False
         else:
             self.currentItemType = itemType
         folderPath = self.dataDir + self.config['itemTypes'].dirFromNoun(itemType) + "/"
         try:
             if os.path.exists(folderPath):
-                for file in os.listdir(folderPath):
-                    filePath = folderPath+file
-                    if os.path.isfile(filePath):
-                        fileSize = os.path.getsize(filePath)
-                        fileModified = os.path.getmtime(filePath)
-                        fileExtension = os.path.splitext(file)[1][1:].lower().strip()
-                        fileName = os.path.splitext(file)[0]
+                itemNames = self.selectItemNames()
+                foldCase = self.db.config['type'] == 'mysql'
+                with os.scandir(folderPath) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        file = entry.name
+                        fileName, fileExtension = os.path.splitext(file)
+                        fileExtension = fileExtension[1:].lower().strip()
 
                         fileType = self.config['itemTypes'].nounFromExtension(fileExtension)
                         if fileType:
-                            itemStatus = self.checkItemExistance(file)
+                            fileStat = entry.stat()
+                            fileSize = fileStat.st_size
+                            fileModified = fileStat.st_mtime
+                            itemStatus = 'Yes' if (file.lower() if foldCase else file) in itemNames else 'No'
                             if self.advancedMode is False:
                                 self.items.append((False, fileName, fileModified, itemStatus,
                                                    fileSize, fileExtension))
                             else:
                                 self.items.append([False, fileName, fileModified, itemStatus,
                                                    fileSize, fileExtension])
+                            self.checked.append(False)
         except BaseException as e:
             warningMsgBox(self.parent, e, "Error Opening Folder")
 
+    def selectItemNames(self):
+        itemNames = set()
+        try:
+            self.db.open()
+            typeIden = self.config['itemTypes'].tableFromNoun(self.currentItemType)
+            query = self.db.selectItems(dict(col='item_name', type_id=typeIden))
+            foldCase = self.db.config['type'] == 'mysql'
+            while query.next():
+                itemNames.add(query.value(0).lower() if foldCase else query.value(0))
+            self.db.close()
+        except BaseException as e:
+            warningMsgBox(self.parent, e, title="Error Checking Items")
+        return itemNames
+
     def checkItemExistance(self, file):
         try:
             self.db.open()
-            query = QSqlQuery(self.db.con)
-            query.setForwardOnly(True)
             typeIden = self.config['itemTypes'].tableFromNoun(self.currentItemType)
             sql = "SELECT COUNT(*) FROM items AS i "\
-                  "WHERE (item_name = '{}') "\
-                  "AND (type_id = '{}')".format(file, typeIden)
-            query.exec_(sql)
+                  "WHERE (item_name = ?) "\
+                  "AND (type_id = ?)"
+            query = self.db.execQuery(sql, (file, typeIden))
             itemStatus = 'No'
             if query.next():
                 if query.value(0):
                     itemStatus = 'Yes'
+            query.finish()
             self.db.close()
             return itemStatus
         except BaseException as e:
@@ -906,7 +799,7 @@ class ÆDataFolderModel(QAbstractTableModel):
         elif role == Qt.CheckStateRole:
             if self.advancedMode is True:
                 if index.column() == 0:
-                    if self.items[itemRowIndex][0] is True:
+                    if self.checked[itemRowIndex]:
                         return Qt.Checked
                     else:
                         return Qt.Unchecked
@@ -930,13 +823,16 @@ class ÆDataFolderModel(QAbstractTableModel):
             self.items.clear()
         except AttributeError:
             del self.items[:]
+        self.checked.clear()
 
     def sort(self, col, order):
         itemColIndex = col+1
         self.layoutAboutToBeChanged.emit()
-        self.items.sort(key=lambda tup: tup[itemColIndex])
+        rowOrder = sorted(range(len(self.items)), key=lambda row: self.items[row][itemColIndex],
+                          reverse=(order == Qt.AscendingOrder))
+        self.items = [self.items[row] for row in rowOrder]
+        self.checked.permute(rowOrder)
         if order == Qt.AscendingOrder:
-            self.items.reverse()
             self.logger.debug("Sorting `{}` by Descending Order.".format(self.colNames[col]))
         else:
             self.logger.debug("Sorting `{}` by Ascending Order.".format(self.colNames[col]))
@@ -949,10 +845,10 @@ class ÆDataFolderModel(QAbstractTableModel):
             return None
         if role == Qt.CheckStateRole:
             if Qt.CheckState(value) == Qt.Checked:
-                self.items[row][0] = True
+                self.checked[row] = True
                 self.logger.debug("Row `{}` Checked".format(self.data(self.index(index.row(), 0))))
             else:
-                self.items[row][0] = False
+                self.checked[row] = False
                 self.logger.debug("Row `{}` Unchecked".format(self.data(self.index(index.row(), 0))))
             self.dataChanged.emit(index, index)
             return True
@@ -980,13 +876,9 @@ class ÆDataFolderModel(QAbstractTableModel):
                     if self.items[row][3] == 'Yes' and msgBox.checkboxes[0].isChecked():
                         try:
                             self.db.open()
-                            query = QSqlQuery(self.db.con)
-                            query.setForwardOnly(True)
                             tableTypeName = self.config['itemTypes'].tableFromNoun(self.currentItemType)
-                            sql = "UPDATE items Set item_name='{}' WHERE (type_id='{}') AND (item_name='{}')"\
-                                .format(newName, tableTypeName, oldName)
-                            self.logger.debug('\n'+sql)
-                            query.exec_(sql)
+                            sql = "UPDATE items Set item_name = ? WHERE (type_id = ?) AND (item_name = ?)"
+                            self.db.execQuery(sql, (newName, tableTypeName, oldName)).finish()
                             self.db.close()
                         except BaseException as e:
                             warningMsgBox(self.parent, e, title="Error Renaming Item")
@@ -999,26 +891,24 @@ class ÆDataFolderModel(QAbstractTableModel):
         else:
             return False
 
+    def checkStateChanged(self):
+        if self.items:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.items)-1, 0), [Qt.CheckStateRole])
+
     def checkAll(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.items:
-            row[0] = True
-        self.layoutChanged.emit()
+        self.checked.setAll(True)
+        self.checkStateChanged()
 
     def checkNone(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.items:
-            row[0] = False
-        self.layoutChanged.emit()
+        self.checked.setAll(False)
+        self.checkStateChanged()
 
     def checkInverse(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.items:
-            if row[0] is False:
-                row[0] = True
-            else:
-                row[0] = False
-        self.layoutChanged.emit()
+        self.checked.invert()
+        self.checkStateChanged()
+
+    def checkedRows(self):
+        return list(self.checked.indices())
 
     def renameFile(self, index, value):
         row = index.row()
@@ -1031,7 +921,7 @@ class ÆDataFolderModel(QAbstractTableModel):
             self.dataDir, self.config['itemTypes'].dirFromNoun(self.currentItemType), newName)
         self.logger.debug(newFilePath)
         try:
-            if self.currentItemType in self.config['itemTypes'].nounNames(Æ.IsWebpages):
+            if self.currentItemType in self.config['itemTypes'].nounSet(Æ.IsWebpages):
                 oldFolderName = self.items[row][1]+'_files'
                 newFolderName = value+'_files'
                 oldFolderPath = getDataFilePath(
@@ -1067,7 +957,7 @@ class ÆDataFolderModel(QAbstractTableModel):
         try:
             if bulk is False:
                 self.layoutAboutToBeChanged.emit()
-            if self.currentItemType in self.config['itemTypes'].nounNames(Æ.IsWebpages):
+            if self.currentItemType in self.config['itemTypes'].nounSet(Æ.IsWebpages):
                 folderName = self.items[row][1]+'_files'
                 folderPath = getDataFilePath(
                     self.dataDir, self.config['itemTypes'].dirFromNoun(self.currentItemType), folderName)
@@ -1088,6 +978,7 @@ class ÆDataFolderModel(QAbstractTableModel):
 
             self.logger.info("[{}] {} deleted.".format(str(row), fileName))
             self.items.pop(row)
+            self.checked.pop(row)
             if bulk is False:
                 self.layoutChanged.emit()
             return True
@@ -1125,7 +1016,7 @@ class ÆDataFolderModel(QAbstractTableModel):
                 if not bulk:
                     self.db.commit()
                     self.db.close()
-            self.items[row][0] = False
+            self.checked[row] = False
             if bulk is False:
                 self.layoutChanged.emit()
             return True
@@ -1134,20 +1025,446 @@ class ÆDataFolderModel(QAbstractTableModel):
             return False
 
     def autoCreateItems(self, rows):
+        tableTypeName = self.config['itemTypes'].tableFromNoun(self.currentItemType)
         self.layoutAboutToBeChanged.emit()
-        self.db.open()
-        self.db.transaction()
-        for row in reversed(rows):
-            self.autoCreateItem(row, bulk=True)
-        self.db.commit()
-        self.db.close()
+        try:
+            newRows = [row for row in rows if self.items[row][3] == "No"]
+            self.db.open()
+            self.db.transaction()
+            itemIdens = self.db.newItems([dict(name=self.items[row][1]+'.'+self.items[row][5], type=tableTypeName)
+                                          for row in newRows])
+            self.db.commit()
+            self.db.close()
+            for row in newRows:
+                if (self.items[row][1]+'.'+self.items[row][5], tableTypeName) in itemIdens:
+                    self.items[row][3] = "Yes"
+            self.checked.setRows(rows, False)
+        except BaseException as e:
+            warningMsgBox(self.parent, e, title="Error Creating Items")
         self.layoutChanged.emit()
 
 
+class ÆQueryWorker(QObject):
+    rowsFetched = Signal(int, list)
+    queryFinished = Signal(int, int)
+    queryFailed = Signal(int, str)
+
+    def __init__(self, executor):
+        super().__init__()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.executor = executor
+        self.source, self.db = None, None
+
+    def isStale(self, requestIden):
+        return requestIden < self.executor.validIden
+
+    def run(self, requestIden, sql, values, source):
+        if self.isStale(requestIden):
+            return
+        if self.source is not source:
+            self.removeConnection()
+            self.db = source.threadConnection()
+            self.db.persistent = True
+            self.source = source
+        self.db.open()
+        try:
+            query = QSqlQuery(self.db.con)
+            query.setForwardOnly(True)
+            if values:
+                query.prepare(sql)
+                for i, value in enumerate(values):
+                    query.bindValue(i, value)
+                querySuccess = query.exec_()
+            else:
+                querySuccess = query.exec_(sql)
+            if not querySuccess:
+                self.queryFailed.emit(requestIden, query.lastError().databaseText())
+                return
+            colCount = query.record().count()
+            rows, rowCount = list(), 0
+            while query.next():
+                if self.isStale(requestIden):
+                    self.logger.debug("Query {} cancelled after {} rows.".format(requestIden, rowCount))
+                    query.finish()
+                    return
+                rows.append(tuple(query.value(i) for i in range(colCount)))
+                if len(rows) >= self.executor.batchSize:
+                    rowCount += len(rows)
+                    self.rowsFetched.emit(requestIden, rows)
+                    rows = list()
+            query.finish()
+            if rows:
+                rowCount += len(rows)
+                self.rowsFetched.emit(requestIden, rows)
+            self.queryFinished.emit(requestIden, rowCount)
+        except BaseException as e:
+            self.queryFailed.emit(requestIden, str(e))
+        finally:
+            self.db.close()
+
+    def removeConnection(self):
+        if self.db:
+            self.db.removeThreadConnection()
+        self.source, self.db = None, None
+
+
+class ÆQueryExecutor(QObject):
+    rowsFetched = Signal(int, list)
+    queryFinished = Signal(int, int)
+    queryFailed = Signal(int, str)
+    queryRequested = Signal(int, str, list, object)
+    batchSize = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.requestIden, self.validIden = 0, 0
+        self.workerThread = QThread(self)
+        self.worker = ÆQueryWorker(self)
+        self.worker.moveToThread(self.workerThread)
+        self.queryRequested.connect(self.worker.run)
+        self.worker.rowsFetched.connect(self.rowsFetched)
+        self.worker.queryFinished.connect(self.queryFinished)
+        self.worker.queryFailed.connect(self.queryFailed)
+
+    def execute(self, sql, db, values=()):
+        self.requestIden += 1
+        if not self.workerThread.isRunning():
+            self.workerThread.start()
+        self.logger.debug('\n'+sql)
+        self.queryRequested.emit(self.requestIden, sql, list(values), db)
+        return self.requestIden
+
+    def cancel(self):
+        self.validIden = self.requestIden+1
+
+    def stop(self):
+        self.cancel()
+        if self.workerThread.isRunning():
+            self.workerThread.quit()
+            self.workerThread.wait()
+        self.worker.source, self.worker.db = None, None
+
+
+class ÆThumbnailLoader(QRunnable):
+    def __init__(self, cache, path):
+        super().__init__()
+        self.cache = cache
+        self.path = path
+
+    def run(self):
+        if not self.cache.isPending(self.path):
+            return
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.cache.imageLoaded.emit(self.path, QImage())
+            return
+        key = hashlib.sha1("{}|{}|{}".format(self.path, stat.st_mtime_ns, stat.st_size).encode()).hexdigest()
+        for ext in ("jpg", "png"):
+            cachePath = os.path.join(self.cache.cacheDir, key+"."+ext)
+            if os.path.exists(cachePath):
+                image = QImage(cachePath)
+                if not image.isNull():
+                    self.cache.imageLoaded.emit(self.path, image)
+                    return
+
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        maxSize = self.cache.thumbnailSize
+        if size.isValid() and (size.width() > maxSize or size.height() > maxSize):
+            reader.setScaledSize(size.scaled(maxSize, maxSize, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            self.cache.imageLoaded.emit(self.path, image)
+            return
+        if image.width() > maxSize or image.height() > maxSize:
+            image = image.scaled(maxSize, maxSize, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        ext = "png" if image.hasAlphaChannel() else "jpg"
+        cachePath = os.path.join(self.cache.cacheDir, key+"."+ext)
+        tempPath = "{}.{}.tmp".format(cachePath, threading.get_ident())
+        if image.save(tempPath, ext.upper(), 85 if ext == "jpg" else -1):
+            try:
+                os.replace(tempPath, cachePath)
+            except OSError:
+                pass
+        self.cache.imageLoaded.emit(self.path, image)
+
+
+class ÆThumbnailCache(QObject):
+    imageLoaded = Signal(str, QImage)
+    thumbnailReady = Signal(str)
+    thumbnailSize = 256
+    maxBytes = 96*1024*1024
+    maxPending = 256
+
+    def __init__(self, cacheDir, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cacheDir = cacheDir
+        if not os.path.exists(self.cacheDir):
+            os.makedirs(self.cacheDir)
+        self.pixmaps, self.pending, self.failed = OrderedDict(), OrderedDict(), set()
+        self.cachedBytes, self.requestCount = 0, 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, QThread.idealThreadCount()-1))
+        self.imageLoaded.connect(self.onImageLoaded)
+
+    def thumbnail(self, path):
+        pixmap = self.pixmaps.get(path)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(path)
+            return pixmap
+        if path in self.failed:
+            return None
+        if path in self.pending:
+            self.pending.move_to_end(path)
+            return None
+        self.pending[path] = True
+        while len(self.pending) > self.maxPending:
+            self.pending.popitem(last=False)
+        self.requestCount += 1
+        self.pool.start(ÆThumbnailLoader(self, path), self.requestCount)
+        return None
+
+    def isPending(self, path):
+        return path in self.pending
+
+    def onImageLoaded(self, path, image):
+        self.pending.pop(path, None)
+        if image.isNull():
+            self.failed.add(path)
+            return
+        pixmap = QPixmap.fromImage(image)
+        if path in self.pixmaps:
+            oldPixmap = self.pixmaps.pop(path)
+            self.cachedBytes -= oldPixmap.width()*oldPixmap.height()*4
+        self.pixmaps[path] = pixmap
+        self.cachedBytes += pixmap.width()*pixmap.height()*4
+        while self.cachedBytes > self.maxBytes and len(self.pixmaps) > 1:
+            oldPixmap = self.pixmaps.popitem(last=False)[1]
+            self.cachedBytes -= oldPixmap.width()*oldPixmap.height()*4
+        self.thumbnailReady.emit(path)
+
+    def clear(self):
+        self.pending.clear()
+        self.pixmaps.clear()
+        self.failed.clear()
+        self.cachedBytes = 0
+
+    def stop(self):
+        self.pending.clear()
+        self.pool.clear()
+        self.pool.waitForDone()
+
+
+class ÆBitSet:
+    def __init__(self):
+        self.bits = bytearray()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def __setitem__(self, i, value):
+        if value:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def append(self, value):
+        if self.size & 7 == 0:
+            self.bits.append(0)
+        self.size += 1
+        if value:
+            self[self.size-1] = True
+
+    def mask(self):
+        return (1 << self.size)-1
+
+    def setAll(self, value):
+        self.bits = bytearray((self.mask() if value else 0).to_bytes(len(self.bits), 'little'))
+
+    def invert(self):
+        inverted = int.from_bytes(self.bits, 'little') ^ self.mask()
+        self.bits = bytearray(inverted.to_bytes(len(self.bits), 'little'))
+
+    def setRows(self, rows, value):
+        for row in rows:
+            self[row] = value
+
+    def invertRows(self, rows):
+        for row in rows:
+            self[row] = not self[row]
+
+    def pop(self, i):
+        value = int.from_bytes(self.bits, 'little')
+        value = (value & ((1 << i)-1)) | ((value >> (i+1)) << i)
+        self.size -= 1
+        self.bits = bytearray(value.to_bytes((self.size+7) >> 3, 'little'))
+
+    def indices(self):
+        for match in re.finditer(rb'[^\x00]', self.bits):
+            byteIndex = match.start()
+            byte = self.bits[byteIndex]
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield (byteIndex << 3) | bit
+
+    def permute(self, order):
+        permuted = ÆBitSet()
+        for i in order:
+            permuted.append(self[i])
+        self.bits, self.size = permuted.bits, permuted.size
+
+    def clear(self):
+        self.bits = bytearray()
+        self.size = 0
+
+
+class ÆNameIndex:
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.offsets)-1
+
+    @staticmethod
+    def normalize(text):
+        return unicodedata.normalize('NFKC', text).casefold()
+
+    def extend(self, names):
+        folded = [self.normalize(name or '') for name in names]
+        if not folded:
+            return
+        self.parts.append("\n".join(folded)+"\n")
+        offset = self.offsets[-1]
+        for name in folded:
+            offset += len(name)+1
+            self.offsets.append(offset)
+
+    def joined(self):
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def find(self, phrase, start=0):
+        text, offsets = self.joined(), self.offsets
+        position = offsets[start]
+        while True:
+            position = text.find(phrase, position)
+            if position < 0:
+                return
+            row = bisect_right(offsets, position)-1
+            yield row
+            position = offsets[row+1]
+
+    def permute(self, order):
+        text, offsets = self.joined(), self.offsets
+        names = [text[offsets[i]:offsets[i+1]] for i in order]
+        self.clear()
+        self.parts.append("".join(names))
+        offset = 0
+        for name in names:
+            offset += len(name)
+            self.offsets.append(offset)
+
+    def contains(self, row, phrase):
+        return self.joined().find(phrase, self.offsets[row], self.offsets[row+1]-1) >= 0
+
+    def clear(self):
+        self.parts = list()
+        self.offsets = array('q', [0])
+
+
+class ÆItemRows:
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.idens)
+
+    def clear(self):
+        self.idens = array('q')
+        self.typeCodes = array('H')
+        self.typeNames, self.typeCodeMap = list(), dict()
+        self.names, self.times, self.sources = list(), list(), list()
+        self.checked, self.decodedSources = ÆBitSet(), ÆBitSet()
+        self.nameIndex = ÆNameIndex()
+
+    def findIndex(self):
+        if len(self.nameIndex) < len(self.names):
+            self.nameIndex.extend(self.names[len(self.nameIndex):])
+        return self.nameIndex
+
+    def append(self, iden, name, typeId, time, source, checked=False):
+        typeCode = self.typeCodeMap.get(typeId)
+        if typeCode is None:
+            typeCode = self.typeCodeMap[typeId] = len(self.typeNames)
+            self.typeNames.append(typeId)
+        if isinstance(time, QDateTime):
+            time = time.toString("yyyy-MM-dd hh:mm:ss") if time.isValid() else None
+        if isinstance(time, str):
+            time = sys.intern(time)
+        self.idens.append(iden)
+        self.typeCodes.append(typeCode)
+        self.names.append(name)
+        self.times.append(time)
+        self.sources.append(source)
+        self.checked.append(checked)
+        self.decodedSources.append(not source or '%' not in source)
+
+    def iden(self, row):
+        return self.idens[row]
+
+    def name(self, row):
+        return self.names[row]
+
+    def typeId(self, row):
+        return self.typeNames[self.typeCodes[row]]
+
+    def time(self, row):
+        return self.times[row]
+
+    def source(self, row):
+        if not self.decodedSources[row]:
+            self.sources[row] = unquote(self.sources[row])
+            self.decodedSources[row] = True
+        return self.sources[row]
+
+    def value(self, row, itemColIndex):
+        return (None, self.iden, self.name, self.typeId, self.time, self.source)[itemColIndex](row)
+
+    def permute(self, order):
+        self.idens = array('q', (self.idens[i] for i in order))
+        self.typeCodes = array('H', (self.typeCodes[i] for i in order))
+        self.names = [self.names[i] for i in order]
+        self.times = [self.times[i] for i in order]
+        self.sources = [self.sources[i] for i in order]
+        self.checked.permute(order)
+        self.decodedSources.permute(order)
+        if len(self.nameIndex) == len(order):
+            self.nameIndex.permute(order)
+        else:
+            self.nameIndex.clear()
+
+
 class ÆMainTableModel(QAbstractTableModel):
     tableType = Æ.TableItems
     curSortColIndex = None
     viewMode = "list"
+    queryExecutor, countRequest, pageRequest = None, None, None
+    thumbnails = None
+    pageSize = 500
+    sortKeys = ("page.ID", "page.Name", "page.Type", "page.Time", "page.Source")
+    nullableSortKeys = ("page.Time", "page.Source")
+
+    rowsLoaded = Signal(int, bool)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1158,9 +1475,15 @@ class ÆMainTableModel(QAbstractTableModel):
             self.icons = parent.icons
             self.treeIcons = parent.treeIcons
             self.config = parent.config
+            self.setQueryExecutor(parent.queryExecutor)
+            self.setThumbnailCache(parent.thumbnails)
         self.colNames = ("Iden", "Name", "Type", "Time", "Source")
 
-        self.rows = list()
+        self.rows = ÆItemRows()
+        self.thumbnailRows = dict()
+        self.sql, self.baseSQL, self.db, self.keyset = None, None, None, True
+        self.totalCount, self.lastKey, self.allFetched = None, None, True
+        self.checkNewRows, self.checkExceptions = False, set()
 
     def setParent(self, parent):
         self.parent = parent
@@ -1168,8 +1491,42 @@ class ÆMainTableModel(QAbstractTableModel):
         self.icons = parent.icons
         self.treeIcons = parent.treeIcons
         self.config = parent.config
+        self.setQueryExecutor(parent.queryExecutor)
+        self.setThumbnailCache(parent.thumbnails)
         super().setParent(parent)
 
+    def setQueryExecutor(self, executor):
+        if self.queryExecutor is executor:
+            return
+        if self.queryExecutor:
+            self.queryExecutor.rowsFetched.disconnect(self.onRowsFetched)
+            self.queryExecutor.queryFinished.disconnect(self.onQueryFinished)
+            self.queryExecutor.queryFailed.disconnect(self.onQueryFailed)
+        self.queryExecutor = executor
+        self.queryExecutor.rowsFetched.connect(self.onRowsFetched)
+        self.queryExecutor.queryFinished.connect(self.onQueryFinished)
+        self.queryExecutor.queryFailed.connect(self.onQueryFailed)
+
+    def setThumbnailCache(self, thumbnails):
+        if self.thumbnails is thumbnails:
+            return
+        if self.thumbnails:
+            self.thumbnails.thumbnailReady.disconnect(self.onThumbnailReady)
+        self.thumbnails = thumbnails
+        self.thumbnails.thumbnailReady.connect(self.onThumbnailReady)
+
+    def onThumbnailReady(self, path):
+        row = self.thumbnailRows.pop(path, None)
+        if row is None or row >= len(self.rows) or self.viewMode != "icons":
+            return
+        if self.imagePath(row) == path:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def imagePath(self, row):
+        dataDir = self.config['options']['defaultDataDir']
+        return getDataFilePath(dataDir, self.config['itemTypes'].dirFromTable(self.rows.typeId(row)), self.rows.name(row))
+
     def flags(self, index):
         flags = super().flags(index)
         if index.column() == 0:
@@ -1193,15 +1550,22 @@ class ÆMainTableModel(QAbstractTableModel):
 
     def sort(self, col, order):
         itemColIndex = col+1
-        self.layoutAboutToBeChanged.emit()
         self.curSortColIndex = (col, order)
-        self.rows.sort(key=lambda tup: tup[itemColIndex])
         if order == Qt.AscendingOrder:
-            self.rows.reverse()
             self.logger.debug("Sorting `{}` by Descending Order.".format(self.colNames[col]))
         else:
             self.logger.debug("Sorting `{}` by Ascending Order.".format(self.colNames[col]))
-        self.layoutChanged.emit()
+        if self.allFetched:
+            self.layoutAboutToBeChanged.emit()
+            self.thumbnailRows.clear()
+            values = [self.rows.value(row, itemColIndex) for row in range(len(self.rows))]
+            # Invalid times are stored as None, which sorts before any value like SQL NULLs.
+            self.rows.permute(sorted(
+                range(len(self.rows)), key=lambda row: (values[row] is not None, values[row]),
+                reverse=(order == Qt.AscendingOrder)))
+            self.layoutChanged.emit()
+        else:
+            self.restartPaging()
 
     def setColNames(self, colNames):
         self.colNames = colNames
@@ -1213,62 +1577,203 @@ class ÆMainTableModel(QAbstractTableModel):
         self.tableType = tableType
 
     def setQuery(self, sql, db):
+        orderMatch = re.match(r"(?s)^(.*)\sORDER BY\s+([^()]*?)\s*$", sql)
+        if orderMatch:
+            self.baseSQL = orderMatch.group(1)
+            self.keyset = re.match(r"^(\w+\.)?item_id( ASC)?$", orderMatch.group(2), re.I) is not None
+        else:
+            self.baseSQL, self.keyset = sql, True
+        self.sql, self.db = sql, db
+        self.totalCount, self.lastKey, self.allFetched = None, None, False
+        self.checkNewRows, self.checkExceptions = False, set()
+        self.queryExecutor.cancel()
+        self.countRequest = self.queryExecutor.execute(
+            "SELECT COUNT(*) FROM (\n{}\n) AS countQuery".format(self.baseSQL), db)
+        self.pageRequest = None
+        self.fetchMore()
+
+    def pageSQL(self, limit=True):
+        if self.curSortColIndex is None and not self.keyset:
+            if limit:
+                return "{} LIMIT {} OFFSET {}".format(self.sql, self.pageSize, len(self.rows)), ()
+            return self.sql, ()
+        col, order = self.curSortColIndex or (0, Qt.DescendingOrder)
+        key = self.sortKeys[col]
+        if order == Qt.AscendingOrder:
+            op, direction = "<", "DESC"
+        else:
+            op, direction = ">", "ASC"
+        where, values = str(), list()
+        if self.lastKey is not None:
+            lastIden, lastValue = self.lastKey
+            if col == 0:
+                where = "WHERE page.ID {} ?".format(op)
+                values = [lastIden]
+            elif lastValue is None and direction == "ASC":
+                where = "WHERE (({0} IS NULL AND page.ID > ?) OR {0} IS NOT NULL)".format(key)
+                values = [lastIden]
+            elif lastValue is None:
+                where = "WHERE ({0} IS NULL AND page.ID < ?)".format(key)
+                values = [lastIden]
+            else:
+                where = "WHERE (({0}, page.ID) {1} (?, ?)".format(key, op)
+                if direction == "DESC" and key in self.nullableSortKeys:
+                    where += " OR {} IS NULL".format(key)
+                where += ")"
+                values = [lastValue, lastIden]
+        if col == 0:
+            orderBy = "page.ID {}".format(direction)
+        else:
+            orderBy = "{0} {1}, page.ID {1}".format(key, direction)
+        sql = "SELECT page.ID, page.Name, page.Type, page.Time, page.Source, {0}, {0} IS NULL \n" \
+              "FROM (\n{1}\n) AS page {2} \n" \
+              "ORDER BY {3}".format(key, self.baseSQL, where, orderBy)
+        if limit:
+            sql += " LIMIT {}".format(self.pageSize)
+        return sql, values
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.allFetched
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.pageRequest is not None or not self.canFetchMore(parent):
+            return
+        sql, values = self.pageSQL()
+        self.pageRequest = self.queryExecutor.execute(sql, self.db, values)
+
+    def fetchAll(self):
+        if self.allFetched:
+            return
+        sql, values = self.pageSQL(limit=False)
+        skipCount = len(self.rows) if self.curSortColIndex is None and not self.keyset else 0
+        self.pageRequest = None
         try:
-            db.open()
-            query = QSqlQuery(db.con)
+            self.db.open()
+            query = QSqlQuery(self.db.con)
             query.setForwardOnly(True)
-            query.exec_(sql)
-            if self.tableType in Æ.ItemTableTypes:
-                while query.next():
-                    itemIden = query.value(0)
-                    itemName = query.value(1)
-                    itemType = query.value(2)
-                    itemTime = query.value(3)
-                    itemSource = unquote(query.value(4))
-                    self.rows.append([False, itemIden, itemName, itemType, itemTime, itemSource])
-            if self.curSortColIndex:
-                self.sort(self.curSortColIndex[0], self.curSortColIndex[1])
-            db.close()
+            query.prepare(sql)
+            for i, value in enumerate(values):
+                query.bindValue(i, value)
+            query.exec_()
+            colCount = query.record().count()
+            rows = list()
+            while query.next():
+                if skipCount:
+                    skipCount -= 1
+                    continue
+                rows.append(tuple(query.value(i) for i in range(colCount)))
+            query.finish()
+            self.db.close()
+            self.appendRows(rows)
+            self.allFetched = True
         except BaseException as e:
             warningMsgBox(self.parent, e, "Error Reading Database")
 
+    def restartPaging(self):
+        for row, iden in enumerate(self.rows.idens):
+            if self.rows.checked[row] != self.checkNewRows:
+                self.checkExceptions.add(iden)
+            else:
+                self.checkExceptions.discard(iden)
+        self.beginResetModel()
+        self.rows.clear()
+        self.thumbnailRows.clear()
+        self.lastKey, self.allFetched, self.pageRequest = None, False, None
+        self.endResetModel()
+        self.fetchMore()
+
+    def appendRows(self, rows):
+        if not rows or self.tableType not in Æ.ItemTableTypes:
+            return
+        rowCount = len(self.rows)
+        self.beginInsertRows(QModelIndex(), rowCount, rowCount+len(rows)-1)
+        for row in rows:
+            self.rows.append(row[0], row[1], row[2], row[3], row[4], self.checkNewRows != (row[0] in self.checkExceptions))
+        self.endInsertRows()
+        if len(rows[-1]) > 6:
+            self.lastKey = (rows[-1][0], None if rows[-1][6] else rows[-1][5])
+
+    def totalRowCount(self):
+        if self.totalCount is not None:
+            return self.totalCount
+        return len(self.rows)
+
+    def isLoading(self):
+        return self.countRequest is not None
+
+    def onRowsFetched(self, requestIden, rows):
+        if requestIden == self.countRequest:
+            self.totalCount = rows[0][0]
+        elif requestIden == self.pageRequest:
+            self.appendRows(rows)
+        else:
+            return
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def onQueryFinished(self, requestIden, rowCount):
+        if requestIden == self.countRequest:
+            self.countRequest = None
+        elif requestIden == self.pageRequest:
+            self.pageRequest = None
+            if rowCount < self.pageSize:
+                self.allFetched = True
+        else:
+            return
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def onQueryFailed(self, requestIden, error):
+        if requestIden == self.countRequest:
+            self.countRequest = None
+            self.logger.error("Error counting rows: "+error)
+        elif requestIden == self.pageRequest:
+            self.pageRequest = None
+            self.allFetched = True
+            warningMsgBox(self.parent, error, "Error Reading Database")
+        else:
+            return
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def rowIden(self, row):
+        return self.rows.iden(row)
+
+    def rowName(self, row):
+        return self.rows.name(row)
+
+    def rowNounName(self, row):
+        rowValue = self.rows.typeId(row)
+        nounName = self.config['itemTypes'].nounFromTable(rowValue)
+        if not nounName:
+            nounName = self.createMissingItemType(rowValue).nounName
+        return nounName
+
     def data(self, index, role=Qt.DisplayRole):
         itemColIndex = index.column()+1
         itemRowIndex = index.row()
         if role == Qt.CheckStateRole:
             if index.column() == 0:
-                if self.rows[itemRowIndex][0] is True:
+                if self.rows.checked[itemRowIndex]:
                     return Qt.Checked
                 else:
                     return Qt.Unchecked
         elif role == Qt.DisplayRole:
             if self.viewMode == "icons":
                 if index.column() == 0:
-                    return self.rows[itemRowIndex][2]
+                    return self.rows.name(itemRowIndex)
                 elif index.column() == -666:
-                    return self.rows[itemRowIndex][0]
+                    return self.rows.checked[itemRowIndex]
             if index.column() == 3:
-                rowValue = self.rows[itemRowIndex][itemColIndex]
+                rowValue = self.rows.time(itemRowIndex)
                 if isinstance(rowValue, str):
                     return rowValue
-                elif isinstance(rowValue, QDateTime):
-                    if rowValue.isValid():
-                        return rowValue
-                    else:
-                        return rowValue
                 else:
                     return "0000-00-00 00:00:00"
             elif index.column() == 2:
-                rowValue = self.rows[itemRowIndex][itemColIndex]
-                nounName = self.config['itemTypes'].nounFromTable(rowValue)
-                if not nounName:
-                    nounName = self.createMissingItemType(rowValue).nounName
-                return nounName
+                return self.rowNounName(itemRowIndex)
             else:
-                return self.rows[itemRowIndex][itemColIndex]
+                return self.rows.value(itemRowIndex, itemColIndex)
         elif role == Qt.DecorationRole:
             if index.column() == 1 and self.viewMode == "list":
-                rowType = self.rows[itemRowIndex][itemColIndex+1]
+                rowType = self.rows.typeId(itemRowIndex)
 
                 itemTypeObj = self.config['itemTypes'][rowType]
                 if itemTypeObj:
@@ -1278,21 +1783,21 @@ class ÆMainTableModel(QAbstractTableModel):
                     iconName = itemTypeObj.iconName
                 return self.iconsList.getTreeIcon(iconName)
             elif index.column() == 0 and self.viewMode == "icons":
-                rowType = self.rows[itemRowIndex][itemColIndex+2]
-
-                if rowType == "image":
-                    rowName = self.rows[itemRowIndex][itemColIndex+1]
-                    dataDir = self.config['options']['defaultDataDir']
-                    imagePath = getDataFilePath(dataDir, self.config['itemTypes'].dirFromTable(rowType), rowName)
-                    return QIcon(imagePath)
+                rowType = self.rows.typeId(itemRowIndex)
+
+                if rowType == "image" and self.thumbnails:
+                    imagePath = self.imagePath(itemRowIndex)
+                    pixmap = self.thumbnails.thumbnail(imagePath)
+                    if pixmap is not None:
+                        return QIcon(pixmap)
+                    self.thumbnailRows[imagePath] = itemRowIndex
+                itemTypeObj = self.config['itemTypes'][rowType]
+                if itemTypeObj:
+                    iconName = itemTypeObj.iconName
                 else:
-                    itemTypeObj = self.config['itemTypes'][rowType]
-                    if itemTypeObj:
-                        iconName = itemTypeObj.iconName
-                    else:
-                        itemTypeObj = self.createMissingItemType(rowType)
-                        iconName = itemTypeObj.iconName
-                    return self.iconsList.getTreeIcon(iconName)
+                    itemTypeObj = self.createMissingItemType(rowType)
+                    iconName = itemTypeObj.iconName
+                return self.iconsList.getTreeIcon(iconName)
 
     def setData(self, index, value, role=Qt.DisplayRole):
         row = index.row()
@@ -1301,57 +1806,61 @@ class ÆMainTableModel(QAbstractTableModel):
             return None
         if role == Qt.CheckStateRole:
             if Qt.CheckState(value) == Qt.Checked:
-                self.rows[row][0] = True
+                self.rows.checked[row] = True
                 self.logger.debug("Row `{}` Checked".format(self.data(self.index(index.row(), 0))))
             else:
-                self.rows[row][0] = False
+                self.rows.checked[row] = False
                 self.logger.debug("Row `{}` Unchecked".format(self.data(self.index(index.row(), 0))))
             self.dataChanged.emit(index, index)
             return True
         else:
             return False
 
+    def checkStateChanged(self, firstRow=0, lastRow=None):
+        if lastRow is None:
+            lastRow = len(self.rows)-1
+        if 0 <= firstRow <= lastRow:
+            self.dataChanged.emit(self.index(firstRow, 0), self.index(lastRow, 0), [Qt.CheckStateRole])
+
     def checkSelection(self, selectedRows):
-        self.layoutAboutToBeChanged.emit()
-        for row in selectedRows:
-            self.rows[row][0] = True
-        self.layoutChanged.emit()
+        if selectedRows:
+            self.rows.checked.setRows(selectedRows, True)
+            self.checkStateChanged(min(selectedRows), max(selectedRows))
 
     def uncheckSelection(self, selectedRows):
-        self.layoutAboutToBeChanged.emit()
-        for row in selectedRows:
-            self.rows[row][0] = False
-        self.layoutChanged.emit()
+        if selectedRows:
+            self.rows.checked.setRows(selectedRows, False)
+            self.checkStateChanged(min(selectedRows), max(selectedRows))
 
     def checkInvertSelection(self, selectedRows):
-        self.layoutAboutToBeChanged.emit()
-        for row in selectedRows:
-            if self.rows[row][0] is False:
-                self.rows[row][0] = True
-            else:
-                self.rows[row][0] = False
-        self.layoutChanged.emit()
+        if selectedRows:
+            self.rows.checked.invertRows(selectedRows)
+            self.checkStateChanged(min(selectedRows), max(selectedRows))
 
     def checkAll(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.rows:
-            row[0] = True
-        self.layoutChanged.emit()
+        self.rows.checked.setAll(True)
+        self.checkNewRows, self.checkExceptions = True, set()
+        self.checkStateChanged()
 
     def checkNone(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.rows:
-            row[0] = False
-        self.layoutChanged.emit()
+        self.rows.checked.setAll(False)
+        self.checkNewRows, self.checkExceptions = False, set()
+        self.checkStateChanged()
 
     def checkInverse(self):
-        self.layoutAboutToBeChanged.emit()
-        for row in self.rows:
-            if row[0] is False:
-                row[0] = True
-            else:
-                row[0] = False
-        self.layoutChanged.emit()
+        self.rows.checked.invert()
+        self.checkNewRows = not self.checkNewRows
+        self.checkStateChanged()
+
+    def checkedRows(self):
+        return list(self.rows.checked.indices())
+
+    def checkedIdens(self):
+        idens = self.rows.idens
+        return [idens[row] for row in self.rows.checked.indices()]
+
+    def returnCheckedData(self):
+        return [(self.rows.iden(row), self.rows.name(row), self.rowNounName(row)) for row in self.rows.checked.indices()]
 
     def createMissingItemType(self, name):
         itemType = ÆItemType()
@@ -1362,19 +1871,30 @@ class ÆMainTableModel(QAbstractTableModel):
         return itemType
 
     def clear(self):
-        try:
-            self.rows.clear()
-        except AttributeError:
-            del self.rows[:]
+        self.countRequest, self.pageRequest = None, None
+        self.sql, self.baseSQL = None, None
+        self.totalCount, self.lastKey, self.allFetched = None, None, True
+        self.checkNewRows, self.checkExceptions = False, set()
+        self.beginResetModel()
+        self.rows.clear()
+        self.thumbnailRows.clear()
+        self.endResetModel()
 
 
 class ÆCategoryTreeItem(object):
+    __slots__ = ('parentItem', 'itemData', 'childItems', 'rowNumber', 'depth', 'childTotal', 'lastKey',
+                 'allFetched', 'requestIden')
+
     def __init__(self, data, parent=None):
         self.parentItem = parent
         self.itemData = data
         self.childItems = []
+        self.rowNumber = 0
+        self.depth = parent.depth+1 if parent else -1
+        self.childTotal, self.lastKey, self.allFetched, self.requestIden = 0, None, False, None
 
     def appendChild(self, item):
+        item.rowNumber = len(self.childItems)
         self.childItems.append(item)
 
     def child(self, row):
@@ -1402,14 +1922,16 @@ class ÆCategoryTreeItem(object):
             pass
 
     def sort(self, col, reverse):
-        try:
-            itemColIndex = col+1
-            if self.childCount() > 1:
+        itemColIndex = col+1
+        if self.childCount() > 1:
+            try:
                 self.childItems.sort(key=operator.methodcaller('data', itemColIndex), reverse=reverse)
-                for child in self.childItems:
-                    child.sort(col, reverse)
-        except TypeError:
-            pass
+            except TypeError:
+                pass
+            for rowNumber, child in enumerate(self.childItems):
+                child.rowNumber = rowNumber
+        for child in self.childItems:
+            child.sort(col, reverse)
 
     def parent(self):
         try:
@@ -1418,13 +1940,15 @@ class ÆCategoryTreeItem(object):
             return None
 
     def row(self):
-        try:
-            if self.parentItem:
-                return self.parentItem.childItems.index(self)
-        except ValueError:
-            return 0
+        return self.rowNumber
 
-        return 0
+    def isPartlyFetched(self):
+        if self.requestIden is not None or (self.childItems and not self.allFetched):
+            return True
+        for child in self.childItems:
+            if child.isPartlyFetched():
+                return True
+        return False
 
     def checkAll(self):
         if self.parent():
@@ -1479,6 +2003,11 @@ class ÆCategoryTreeItem(object):
 class ÆCategoryTreeModel(QAbstractItemModel):
     curSortColIndex = None
     tableType = Æ.TableCategories
+    queryExecutor, countRequest = None, None
+    pageSize = 1000
+    sortKeys = ("root.term_name", "root.term_id", "root.term_taxonomy", "root.term_count", "root.term_slug")
+
+    rowsLoaded = Signal(int, bool)
 
     def __init__(self, mainWindow=None):
         super().__init__(mainWindow)
@@ -1490,9 +2019,12 @@ class ÆCategoryTreeModel(QAbstractItemModel):
             self.icons = mainWindow.icons
             self.treeIcons = mainWindow.treeIcons
             self.config = mainWindow.config
+            self.setQueryExecutor(mainWindow.queryExecutor)
 
         self.rootItem = ÆCategoryTreeItem(("Name", "Iden", "Taxonomy", "Count", "Slug"))
-        self.categories = list()
+        self.db, self.sqlExtra, self.categoryCount = None, None, 0
+        self.childRequests, self.fetchedRows, self.itemsByIden = dict(), dict(), dict()
+        self.checkNewRows = False
 
     def setParent(self, mainWindow):
         self.mainWindow = mainWindow
@@ -1500,8 +2032,21 @@ class ÆCategoryTreeModel(QAbstractItemModel):
         self.icons = mainWindow.icons
         self.treeIcons = mainWindow.treeIcons
         self.config = mainWindow.config
+        self.setQueryExecutor(mainWindow.queryExecutor)
         super().setParent(mainWindow)
 
+    def setQueryExecutor(self, executor):
+        if self.queryExecutor is executor:
+            return
+        if self.queryExecutor:
+            self.queryExecutor.rowsFetched.disconnect(self.onRowsFetched)
+            self.queryExecutor.queryFinished.disconnect(self.onQueryFinished)
+            self.queryExecutor.queryFailed.disconnect(self.onQueryFailed)
+        self.queryExecutor = executor
+        self.queryExecutor.rowsFetched.connect(self.onRowsFetched)
+        self.queryExecutor.queryFinished.connect(self.onQueryFinished)
+        self.queryExecutor.queryFailed.connect(self.onQueryFailed)
+
     def columnCount(self, parent):
         if parent.isValid():
             return parent.internalPointer().columnCount()
@@ -1590,29 +2135,33 @@ class ÆCategoryTreeModel(QAbstractItemModel):
     def checkAll(self):
         self.layoutAboutToBeChanged.emit()
         self.rootItem.checkAll()
+        self.checkNewRows = True
         self.layoutChanged.emit()
 
     def checkNone(self):
         self.layoutAboutToBeChanged.emit()
         self.rootItem.checkNone()
+        self.checkNewRows = False
         self.layoutChanged.emit()
 
     def checkInverse(self):
         self.layoutAboutToBeChanged.emit()
         self.rootItem.checkInverse()
+        self.checkNewRows = not self.checkNewRows
         self.layoutChanged.emit()
 
     def sort(self, col, order):
+        self.curSortColIndex = (col, order)
+        if order == Qt.AscendingOrder:
+            self.logger.debug("Sorting `{}` by Descending Order.".format(self.rootItem.data(col)))
+        else:
+            self.logger.debug("Sorting `{}` by Ascending Order.".format(self.rootItem.data(col)))
+        if self.db and self.rootItem.isPartlyFetched():
+            self.restartFetching()
+            return
         self.layoutAboutToBeChanged.emit()
-        if len(self.categories) > 0:
-            self.curSortColIndex = (col, order)
-            if order == Qt.AscendingOrder:
-                reverse = True
-                self.logger.debug("Sorting `{}` by Descending Order.".format(self.rootItem.data(col)))
-            elif order == Qt.DescendingOrder:
-                reverse = False
-                self.logger.debug("Sorting `{}` by Ascending Order.".format(self.rootItem.data(col)))
-            self.rootItem.sort(col, reverse)
+        if self.rootItem.childCount() > 0:
+            self.rootItem.sort(col, order == Qt.AscendingOrder)
         self.layoutChanged.emit()
 
     def flags(self, index):
@@ -1652,7 +2201,7 @@ class ÆCategoryTreeModel(QAbstractItemModel):
         childItem = index.internalPointer()
         parentItem = childItem.parent()
 
-        if parentItem == self.rootItem:
+        if parentItem is self.rootItem:
             return QModelIndex()
         try:
             return self.createIndex(parentItem.row(), 0, parentItem)
@@ -1671,44 +2220,214 @@ class ÆCategoryTreeModel(QAbstractItemModel):
 
             return parentItem.childCount()
         else:
-            return len(self.categories)
+            return self.categoryCount
 
-    def setupModelData(self, sqlExtra, db):
-        parents = [self.rootItem]
-        indentations = [0]
-        number = 0
-
-        db.open()
-        self.categories = db.selectCategoriesAsTree(args=dict(extra=sqlExtra, complete=True))
-        db.close()
-        while number < len(self.categories):
-            position = self.categories[number]['level']
-            # Read the column data from the rest of the line.
-            columnData = [False, self.categories[number]['name'], self.categories[number]['id'],
-                          self.categories[number]['tax'], self.categories[number]['count'],
-                          self.categories[number]['slug']]
-            if position > indentations[-1]:
-                # The last child of the current parent is now the new
-                # parent unless the current parent has no children.
-                if parents[-1].childCount() > 0:
-                    parents.append(parents[-1].child(parents[-1].childCount() - 1))
-                    indentations.append(position)
-            else:
-                while position < indentations[-1] and len(parents) > 0:
-                    parents.pop()
-                    indentations.pop()
-            # Append a new item to the current parent's list of children.
-            parents[-1].appendChild(ÆCategoryTreeItem(columnData, parents[-1]))
+    def itemFromIndex(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.rootItem
+
+    def indexFromItem(self, item):
+        if item is self.rootItem:
+            return QModelIndex()
+        return self.createIndex(item.row(), 0, item)
+
+    def maxDepth(self):
+        try:
+            return int(self.config['options']['catLvls'])
+        except (KeyError, TypeError, ValueError):
+            return const.MAXCATLVLS
 
-            number += 1
-        self.logger.debug("Finished creating model data.")
+    def canHaveChildren(self, item):
+        return item is self.rootItem or (item.childTotal > 0 and item.depth < self.maxDepth())
 
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        item = self.itemFromIndex(parent)
+        return item.childCount() > 0 or self.canHaveChildren(item)
+
+    def canFetchMore(self, parent):
+        if self.db is None or parent.column() > 0:
+            return False
+        item = self.itemFromIndex(parent)
+        return self.canHaveChildren(item) and not item.allFetched and item.requestIden is None
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        item = self.itemFromIndex(parent)
+        sql, values = self.childrenSQL(item)
+        item.requestIden = self.queryExecutor.execute(sql, self.db, values)
+        self.childRequests[item.requestIden] = item
+
+    def sortOrder(self):
         if self.curSortColIndex:
-            self.sort(self.curSortColIndex[0], self.curSortColIndex[1])
+            return self.sortKeys[self.curSortColIndex[0]], self.curSortColIndex[1] == Qt.AscendingOrder
+        return self.sortKeys[0], False
+
+    def childrenSQL(self, item, until=None):
+        orderBy, descending = self.sortOrder()
+        args = dict(extra=self.sqlExtra, orderBy=orderBy, descending=descending, after=item.lastKey)
+        if until is None:
+            args['limit'] = self.pageSize
+        else:
+            args['until'] = until
+        if item is not self.rootItem:
+            args['parent'] = item.data(2)
+        return self.db.categoryChildrenSQL(args)
 
-    def clear(self):
+    def setupModelData(self, sqlExtra, db):
+        self.db, self.sqlExtra = db, sqlExtra
+        self.categoryCount, self.countRequest = 0, None
+        self.restartFetching()
+
+    def restartFetching(self):
+        self.queryExecutor.cancel()
         self.beginResetModel()
+        self.resetItems()
+        self.endResetModel()
+        if self.countRequest is not None or not self.categoryCount:
+            sql, values = self.db.categoryCountSQL(dict(extra=self.sqlExtra))
+            self.countRequest = self.queryExecutor.execute(sql, self.db, values)
+        self.fetchMore(QModelIndex())
+
+    def resetItems(self):
         self.rootItem.clear()
+        self.rootItem.lastKey, self.rootItem.allFetched, self.rootItem.requestIden = None, False, None
+        self.childRequests, self.fetchedRows, self.itemsByIden = dict(), dict(), dict()
+
+    def isLoading(self):
+        return self.countRequest is not None or self.rootItem.requestIden is not None
+
+    def totalRowCount(self):
+        if self.countRequest is not None:
+            return len(self.itemsByIden)
+        return self.categoryCount
+
+    def onRowsFetched(self, requestIden, rows):
+        if requestIden == self.countRequest:
+            self.categoryCount = rows[0][0]
+        elif requestIden in self.childRequests:
+            self.fetchedRows.setdefault(requestIden, list()).extend(rows)
+
+    def onQueryFinished(self, requestIden, rowCount):
+        if requestIden == self.countRequest:
+            self.countRequest = None
+        elif requestIden in self.childRequests:
+            item = self.childRequests.pop(requestIden)
+            item.requestIden = None
+            self.appendChildren(item, self.fetchedRows.pop(requestIden, ()))
+        else:
+            return
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def onQueryFailed(self, requestIden, error):
+        if requestIden == self.countRequest:
+            self.countRequest = None
+        elif requestIden in self.childRequests:
+            item = self.childRequests.pop(requestIden)
+            item.requestIden, item.allFetched = None, True
+            self.fetchedRows.pop(requestIden, None)
+        else:
+            return
+        warningMsgBox(self.mainWindow, error, "Error Reading Database")
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def appendChildren(self, item, rows, pageFetch=True):
+        if pageFetch and len(rows) < self.pageSize:
+            item.allFetched = True
+        if rows:
+            item.lastKey = (rows[-1][7], rows[-1][0])
+        rows = [row for row in rows if row[0] not in self.itemsByIden]
+        if not rows:
+            return
+        firstRow = item.childCount()
+        self.beginInsertRows(self.indexFromItem(item), firstRow, firstRow+len(rows)-1)
+        for termIden, termName, termParent, termSlug, termCount, termTaxonomy, childCount, sortKey in rows:
+            child = ÆCategoryTreeItem([self.checkNewRows, termName, termIden, termTaxonomy, termCount, termSlug], item)
+            child.childTotal = childCount
+            item.appendChild(child)
+            self.itemsByIden[termIden] = child
+        self.endInsertRows()
+
+    def fetchPage(self, item, until=None):
+        if item.requestIden is not None:
+            self.childRequests.pop(item.requestIden, None)
+            self.fetchedRows.pop(item.requestIden, None)
+            item.requestIden = None
+        sql, values = self.childrenSQL(item, until)
+        query = self.db.execQuery(sql, values)
+        rows = list()
+        while query.next():
+            rows.append(tuple(query.value(i) for i in range(8)))
+        query.finish()
+        self.appendChildren(item, rows, until is None)
+
+    def fetchAll(self):
+        if self.db is None:
+            return
+        self.db.open()
+        items = [self.rootItem]
+        while items:
+            item = items.pop()
+            if self.canHaveChildren(item):
+                while not item.allFetched:
+                    self.fetchPage(item)
+            items.extend(item.childItems)
+        self.db.close()
+        self.rowsLoaded.emit(self.totalRowCount(), not self.isLoading())
+
+    def searchIndexes(self, phrase):
+        if self.db is None or not phrase:
+            return list()
+        orderBy, descending = self.sortOrder()
+        sql, values = self.db.categorySearchSQL(dict(extra=self.sqlExtra, phrase=phrase, maxDepth=self.maxDepth(),
+                                                     orderBy=orderBy))
+        self.db.open()
+        query = self.db.execQuery(sql, values)
+        paths = dict()
+        while query.next():
+            paths.setdefault(query.value(0), list()).append((query.value(1), query.value(2), query.value(3)))
+        query.finish()
+        paths = [path for path in paths.values() if path[0][1] in ('', None)]
+
+        # Load each level only as far as its furthest match, one query per parent.
+        furthest = min if descending else max
+        for depth in range(max((len(path) for path in paths), default=0)):
+            targets = dict()
+            for path in paths:
+                if len(path) <= depth or path[depth][0] in self.itemsByIden:
+                    continue
+                parentItem = self.itemsByIden.get(path[depth-1][0]) if depth else self.rootItem
+                if parentItem is None or parentItem.allFetched:
+                    continue
+                key = (path[depth][2], path[depth][0])
+                targets[parentItem] = furthest(targets[parentItem], key) if parentItem in targets else key
+            for parentItem, key in targets.items():
+                self.fetchPage(parentItem, key)
+        self.db.close()
+
+        items = list()
+        for path in paths:
+            item = self.itemsByIden.get(path[-1][0])
+            if item is not None and item.depth == len(path)-1:
+                items.append(item)
+
+        def displayOrder(item):
+            rows = list()
+            while item is not self.rootItem:
+                rows.append(item.row())
+                item = item.parent()
+            return rows[::-1]
+        return [self.indexFromItem(item) for item in sorted(items, key=displayOrder)]
+
+    def clear(self):
+        self.countRequest = None
+        self.beginResetModel()
+        self.resetItems()
+        self.db, self.sqlExtra, self.categoryCount = None, None, 0
+        self.checkNewRows = False
         self.endResetModel()
 
     def createMissingTaxonomy(self, name):
@@ -1858,10 +2577,151 @@ class ÆMessageBox(QMessageBox):
             self.checkable = False
 
 
+class ÆViewFinder(QObject):
+    debounceInterval = 150
+    chunkSeconds = 0.02
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view, self.model = view, None
+        self.searchString, self.phrase = None, None
+        self.matchRows, self.scan, self.scannedRows = None, None, 0
+        self.selectFirst = False
+        self.debounceTimer = QTimer(self)
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.timeout.connect(self.start)
+        self.chunkTimer = QTimer(self)
+        self.chunkTimer.setSingleShot(True)
+        self.chunkTimer.timeout.connect(self.scanChunk)
+
+    def setModel(self, model):
+        if self.model is model:
+            return
+        if self.model is not None:
+            try:
+                self.model.rowsInserted.disconnect(self.onRowsInserted)
+                self.model.modelReset.disconnect(self.onModelReset)
+            except (RuntimeError, TypeError):
+                pass
+        self.model = model
+        self.stop()
+        self.matchRows = None
+        if model is not None:
+            model.rowsInserted.connect(self.onRowsInserted)
+            model.modelReset.connect(self.onModelReset)
+
+    def search(self, searchString):
+        self.searchString = searchString
+        if searchString:
+            self.debounceTimer.start(self.debounceInterval)
+        else:
+            self.debounceTimer.stop()
+            self.start()
+
+    def start(self):
+        view, model = self.view, self.view.model()
+        searchString = self.searchString or ''
+        view.searchString = æscape(searchString.lower())
+        view.searchResults = list()
+        view.searchResultsIndex = 0
+        if not searchString:
+            self.stop()
+            self.phrase, self.matchRows = None, None
+        elif model.tableType in Æ.ItemTableTypes:
+            self.startScan(ÆNameIndex.normalize(searchString), True)
+        elif model.tableType in Æ.CategoryTableTypes:
+            self.stop()
+            view.searchResults.extend(model.searchIndexes(view.searchString))
+            if view.searchResults:
+                view.setCurrentIndex(view.searchResults[0])
+
+    def refresh(self):
+        view, model = self.view, self.view.model()
+        view.searchResults = list()
+        view.searchResultsIndex = 0
+        if model.tableType in Æ.ItemTableTypes:
+            self.matchRows = None
+            self.startScan(self.phrase or ÆNameIndex.normalize(self.searchString or view.searchString), False)
+        elif model.tableType in Æ.CategoryTableTypes:
+            view.searchResults.extend(model.searchIndexes(view.searchString))
+
+    def startScan(self, phrase, selectFirst):
+        nameIndex = self.view.model().rows.findIndex()
+        if self.scan is None and self.matchRows is not None and self.phrase and self.phrase in phrase:
+            candidates = self.matchRows
+            self.scan = (row for row in candidates if nameIndex.contains(row, phrase))
+        else:
+            self.scan = nameIndex.find(phrase)
+            self.scannedRows = len(nameIndex)
+        self.phrase, self.matchRows, self.selectFirst = phrase, self.view.searchResults, selectFirst
+        self.scanChunk()
+
+    def scanChunk(self):
+        if self.scan is None:
+            return
+        view, model = self.view, self.view.model()
+        results = self.matchRows
+        deadline = time.perf_counter()+self.chunkSeconds
+        for count, row in enumerate(self.scan, 1):
+            results.append(row)
+            if self.selectFirst and len(results) == 1:
+                view.setCurrentIndex(model.index(row, 0))
+            if count & 1023 == 0 and time.perf_counter() > deadline:
+                self.chunkTimer.start(0)
+                return
+        nameIndex = model.rows.findIndex()
+        if len(nameIndex) > self.scannedRows:
+            self.scan = nameIndex.find(self.phrase, self.scannedRows)
+            self.scannedRows = len(nameIndex)
+            self.chunkTimer.start(0)
+        else:
+            self.scan = None
+
+    def resultIndex(self, i):
+        result = self.view.searchResults[i]
+        if isinstance(result, int):
+            return self.view.model().index(result, 0)
+        return result
+
+    def resultRanges(self):
+        results = self.view.searchResults
+        if not results or not isinstance(results[0], int):
+            return [(index, index) for index in results]
+        model, ranges = self.view.model(), list()
+        first = last = results[0]
+        for row in results[1:]:
+            if row != last+1:
+                ranges.append((model.index(first, 0), model.index(last, 0)))
+                first = row
+            last = row
+        ranges.append((model.index(first, 0), model.index(last, 0)))
+        return ranges
+
+    def onRowsInserted(self):
+        if self.phrase and self.scan is None and self.model.tableType in Æ.ItemTableTypes:
+            self.scan = iter(())
+            self.chunkTimer.start(0)
+
+    def onModelReset(self):
+        if self.phrase and self.model.tableType in Æ.ItemTableTypes:
+            self.stop()
+            self.view.searchResults = self.matchRows = list()
+            self.view.searchResultsIndex = 0
+            self.scannedRows = 0
+
+    def stop(self):
+        self.chunkTimer.stop()
+        self.scan = None
+
+    def clear(self):
+        self.debounceTimer.stop()
+        self.stop()
+        self.searchString, self.phrase, self.matchRows = None, None, None
+
+
 class ÆMainTreeView(QTreeView):
     keyPressed = None
     searchString = None
-    searchResults = list()
     searchResultsIndex = 0
 
     def __init__(self, parent=None):
@@ -1890,12 +2750,16 @@ class ÆMainTreeView(QTreeView):
         self.setObjectName("treeView")
         self.header().setStretchLastSection(True)
         self.setAllColumnsShowFocus(True)
+        self.setUniformRowHeights(True)
+        self.searchResults = list()
+        self.finder = ÆViewFinder(self)
 
         self.expanded.connect(lambda: self.resizeColumnToContents(0))
         self.collapsed.connect(lambda: self.resizeColumnToContents(0))
 
     def setModel(self, model):
         super().setModel(model)
+        self.finder.setModel(model)
         try:
             model.layoutChanged.connect(self.modelLayoutChanged, Qt.UniqueConnection)
         except (RuntimeError, AttributeError):
@@ -1925,98 +2789,44 @@ class ÆMainTreeView(QTreeView):
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
 
     def search(self, searchString):
-        searchString = searchString.lower()
-        self.searchString = æscape(searchString)
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
-        self.searchResultsIndex = 0
-        model = self.model()
-
-        if model.tableType in Æ.ItemTableTypes:
-            for rowIndex, rowItem in enumerate(model.rows):
-                rowName = rowItem[2].lower()
-                if searchString in rowName:
-                    self.searchResults.append(model.index(rowIndex, 0))
-            if self.searchResults:
-                self.setCurrentIndex(self.searchResults[0])
-        elif model.tableType in Æ.CategoryTableTypes:
-            for rowIndex, childItem in enumerate(model.rootItem.childItems):
-                childIndex = model.index(rowIndex, 0, QModelIndex())
-                rowName = childItem.data(1).lower()
-                if childItem.childCount() > 0:
-                    self.recursiveCategorySearch(childItem, childIndex)
-                elif searchString in rowName:
-                    self.searchResults.append(childIndex)
-            if self.searchResults:
-                self.setCurrentIndex(self.searchResults[0])
-
-    def recursiveCategorySearch(self, item, currentIndex):
-        itemName = item.data(1).lower()
-        if self.searchString in itemName:
-            self.searchResults.append(currentIndex)
-        if item.childCount() > 0:
-            for rowIndex, childItem in enumerate(item.childItems):
-                childIndex = self.model().index(rowIndex, 0, currentIndex)
-                self.recursiveCategorySearch(childItem, childIndex)
+        self.finder.search(searchString)
 
     def searchRefresh(self):
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
-        self.searchResultsIndex = 0
-        model = self.model()
-        if model.tableType in Æ.ItemTableTypes:
-            for rowIndex, rowItem in enumerate(model.rows):
-                rowName = rowItem[2].lower()
-                if self.searchString in rowName:
-                    self.searchResults.append(model.index(rowIndex, 0, QModelIndex()))
-        elif model.tableType in Æ.CategoryTableTypes:
-            for rowIndex, childItem in enumerate(model.rootItem.childItems):
-                childIndex = model.index(rowIndex, 0, QModelIndex())
-                rowName = childItem.data(1).lower()
-                if childItem.childCount() > 0:
-                    self.recursiveCategorySearch(childItem, childIndex)
-                elif self.searchString in rowName:
-                    self.searchResults.append(childIndex)
+        self.finder.refresh()
 
     def selectAllSearchResults(self):
         selModel = self.selectionModel()
         selModelSelection = selModel.selection()
         selModel.clear()
 
-        for index in self.searchResults:
-            modelLeftIndex = index
-            itemSelection = QItemSelection(modelLeftIndex, modelLeftIndex)
-            selModelSelection.merge(itemSelection, selModel.Select)
-        selModel.select(selModelSelection, selModel.SelectCurrent | selModel.Rows)
-        self.logger.debug("New Selected Rows: "+str([index.row() for index in selModelSelection.indexes()]))
+        itemSelection = QItemSelection()
+        for topIndex, bottomIndex in self.finder.resultRanges():
+            itemSelection.select(topIndex, bottomIndex)
+        selModelSelection.merge(itemSelection, QItemSelectionModel.Select)
+        selModel.select(selModelSelection, QItemSelectionModel.SelectCurrent | QItemSelectionModel.Rows)
+        self.logger.debug("New Selected Rows: "+str(len(self.searchResults)))
 
     def selectNextSearchResult(self):
         if self.searchResults:
             self.searchResultsIndex += 1
             if self.searchResultsIndex <= len(self.searchResults)-1:
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
             else:
                 self.searchResultsIndex = 0
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
 
     def selectPreviousSearchResult(self):
         if self.searchResults:
             self.searchResultsIndex -= 1
             if self.searchResultsIndex >= 0:
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
             else:
                 self.searchResultsIndex = len(self.searchResults)-1
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
 
     def clearSearchResults(self):
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
+        self.finder.clear()
+        self.searchResults.clear()
         self.searchString = None
 
 
@@ -2024,7 +2834,6 @@ class ÆMainListView(QListView):
     keyPressed = None
     keyModifier = None
     searchString = None
-    searchResults = list()
     searchResultsIndex = 0
 
     def __init__(self, parent=None):
@@ -2057,6 +2866,8 @@ class ÆMainListView(QListView):
         self.setLayoutMode(self.LayoutMode.Batched)
         self.setMovement(self.Movement.Snap)
         self.setVerticalScrollMode(self.ScrollMode.ScrollPerItem)
+        self.searchResults = list()
+        self.finder = ÆViewFinder(self)
 
         newStyle = '''
 
@@ -2065,6 +2876,7 @@ class ÆMainListView(QListView):
 
     def setModel(self, model):
         super().setModel(model)
+        self.finder.setModel(model)
         try:
             model.layoutChanged.connect(self.modelLayoutChanged, Qt.UniqueConnection)
         except (RuntimeError, AttributeError):
@@ -2121,98 +2933,44 @@ class ÆMainListView(QListView):
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
 
     def search(self, searchString):
-        searchString = searchString.lower()
-        self.searchString = æscape(searchString)
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
-        self.searchResultsIndex = 0
-        model = self.model()
-
-        if model.tableType in Æ.ItemTableTypes:
-            for rowIndex, rowItem in enumerate(model.rows):
-                rowName = rowItem[2].lower()
-                if searchString in rowName:
-                    self.searchResults.append(model.index(rowIndex, 0))
-            if self.searchResults:
-                self.setCurrentIndex(self.searchResults[0])
-        elif model.tableType in Æ.CategoryTableTypes:
-            for rowIndex, childItem in enumerate(model.rootItem.childItems):
-                childIndex = model.index(rowIndex, 0, QModelIndex())
-                rowName = childItem.data(1).lower()
-                if childItem.childCount() > 0:
-                    self.recursiveCategorySearch(childItem, childIndex)
-                elif searchString in rowName:
-                    self.searchResults.append(childIndex)
-            if self.searchResults:
-                self.setCurrentIndex(self.searchResults[0])
-
-    def recursiveCategorySearch(self, item, currentIndex):
-        itemName = item.data(1).lower()
-        if self.searchString in itemName:
-            self.searchResults.append(currentIndex)
-        if item.childCount() > 0:
-            for rowIndex, childItem in enumerate(item.childItems):
-                childIndex = self.model().index(rowIndex, 0, currentIndex)
-                self.recursiveCategorySearch(childItem, childIndex)
+        self.finder.search(searchString)
 
     def searchRefresh(self):
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
-        self.searchResultsIndex = 0
-        model = self.model()
-        if model.tableType in Æ.ItemTableTypes:
-            for rowIndex, rowItem in enumerate(model.rows):
-                rowName = rowItem[2].lower()
-                if self.searchString in rowName:
-                    self.searchResults.append(model.index(rowIndex, 0, QModelIndex()))
-        elif model.tableType in Æ.CategoryTableTypes:
-            for rowIndex, childItem in enumerate(model.rootItem.childItems):
-                childIndex = model.index(rowIndex, 0, QModelIndex())
-                rowName = childItem.data(1).lower()
-                if childItem.childCount() > 0:
-                    self.recursiveCategorySearch(childItem, childIndex)
-                elif self.searchString in rowName:
-                    self.searchResults.append(childIndex)
+        self.finder.refresh()
 
     def selectAllSearchResults(self):
         selModel = self.selectionModel()
         selModelSelection = selModel.selection()
         selModel.clear()
 
-        for index in self.searchResults:
-            modelLeftIndex = index
-            itemSelection = QItemSelection(modelLeftIndex, modelLeftIndex)
-            selModelSelection.merge(itemSelection, selModel.Select)
-        selModel.select(selModelSelection, selModel.SelectCurrent | selModel.Rows)
-        self.logger.debug("New Selected Rows: "+str([index.row() for index in selModelSelection.indexes()]))
+        itemSelection = QItemSelection()
+        for topIndex, bottomIndex in self.finder.resultRanges():
+            itemSelection.select(topIndex, bottomIndex)
+        selModelSelection.merge(itemSelection, QItemSelectionModel.Select)
+        selModel.select(selModelSelection, QItemSelectionModel.SelectCurrent | QItemSelectionModel.Rows)
+        self.logger.debug("New Selected Rows: "+str(len(self.searchResults)))
 
     def selectNextSearchResult(self):
         if self.searchResults:
             self.searchResultsIndex += 1
             if self.searchResultsIndex <= len(self.searchResults)-1:
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
             else:
                 self.searchResultsIndex = 0
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
 
     def selectPreviousSearchResult(self):
         if self.searchResults:
             self.searchResultsIndex -= 1
             if self.searchResultsIndex >= 0:
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
             else:
                 self.searchResultsIndex = len(self.searchResults)-1
-                self.setCurrentIndex(self.searchResults[self.searchResultsIndex])
+                self.setCurrentIndex(self.finder.resultIndex(self.searchResultsIndex))
 
     def clearSearchResults(self):
-        try:
-            self.searchResults.clear()
-        except AttributeError:
-            del self.searchResults[:]
+        self.finder.clear()
+        self.searchResults.clear()
         self.searchString = None
 
 
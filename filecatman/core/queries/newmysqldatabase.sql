@@ -8,7 +8,9 @@ CREATE TABLE IF NOT EXISTS `items`
 	`item_description` varchar(2000) default '',
 	PRIMARY KEY (`item_id`),
 	UNIQUE INDEX `item_name_type` (`item_name`,`type_id`),
-	INDEX `type_id` (`type_id`)
+	INDEX `type_id` (`type_id`),
+	INDEX `item_name` (`item_name`),
+	INDEX `item_time` (`item_time`)
 ) DEFAULT CHARSET=utf8;
 
 CREATE TABLE IF NOT EXISTS `terms`
@@ -23,7 +25,8 @@ CREATE TABLE IF NOT EXISTS `terms`
 	PRIMARY KEY  (`term_id`),
 	FOREIGN KEY (`term_parent`) REFERENCES terms(`term_id`) ON DELETE SET NULL,
 	UNIQUE INDEX `term_slug_taxonomy` (`term_slug`,`term_taxonomy`),
-	INDEX `term_taxonomy` (`term_taxonomy`)
+	INDEX `term_taxonomy` (`term_taxonomy`),
+	INDEX `term_parent` (`term_parent`)
 ) DEFAULT CHARSET=utf8;
 
 CREATE TABLE IF NOT EXISTS `term_relationships` (
@@ -35,6 +38,16 @@ CREATE TABLE IF NOT EXISTS `term_relationships` (
 	INDEX `term_id` (`term_id`)
 ) DEFAULT CHARSET=utf8;
 
+CREATE TABLE IF NOT EXISTS `term_closure` (
+	`ancestor_id` bigint(20) unsigned NOT NULL,
+	`descendant_id` bigint(20) unsigned NOT NULL,
+	`depth` int(10) unsigned NOT NULL default 0,
+	PRIMARY KEY (`ancestor_id`,`descendant_id`),
+	FOREIGN KEY (`ancestor_id`) REFERENCES terms(`term_id`) ON DELETE CASCADE,
+	FOREIGN KEY (`descendant_id`) REFERENCES terms(`term_id`) ON DELETE CASCADE,
+	INDEX `descendant_id` (`descendant_id`)
+) DEFAULT CHARSET=utf8;
+
 CREATE TABLE IF NOT EXISTS `options` (
 	`option_id` bigint(20) unsigned NOT NULL auto_increment,
 	`option_name` varchar(64) NOT NULL,
@@ -69,3 +82,46 @@ CREATE TABLE IF NOT EXISTS `taxonomies` (
 	PRIMARY KEY  (`taxonomy_id`),
 	UNIQUE INDEX `taxonomies_table_plural` (`table_name`,`plural_name`)
 ) DEFAULT CHARSET=utf8;
+
+CREATE TABLE IF NOT EXISTS `dir_snapshots` (
+	`snapshot_id` bigint(20) unsigned NOT NULL auto_increment,
+	`dir_path` varchar(255) NOT NULL,
+	`dir_mtime` bigint(20) NOT NULL default 0,
+	`entry_count` int(11) NOT NULL default 0,
+	`name_digest` char(40) NOT NULL default '',
+	`entry_names` longtext NOT NULL,
+	PRIMARY KEY  (`snapshot_id`),
+	UNIQUE INDEX `dir_path` (`dir_path`)
+) DEFAULT CHARSET=utf8;
+
+CREATE TABLE IF NOT EXISTS `link_checks` (
+	`check_id` bigint(20) unsigned NOT NULL auto_increment,
+	`link_source` varchar(255) NOT NULL,
+	`link_status` int(11) default NULL,
+	`checked_time` bigint(20) NOT NULL default 0,
+	`etag` varchar(255) NOT NULL default '',
+	`last_modified` varchar(64) NOT NULL default '',
+	`failure_streak` int(11) NOT NULL default 0,
+	PRIMARY KEY  (`check_id`),
+	UNIQUE INDEX `link_source` (`link_source`)
+) DEFAULT CHARSET=utf8;
+
+CREATE TABLE IF NOT EXISTS `missing_files` (
+	`item_id` bigint(20) unsigned NOT NULL,
+	PRIMARY KEY  (`item_id`)
+) DEFAULT CHARSET=utf8;
+
+CREATE TRIGGER IF NOT EXISTS `term_relationships_insert` AFTER INSERT ON `term_relationships`
+FOR EACH ROW UPDATE terms SET term_count = term_count + 1 WHERE term_id = NEW.term_id;
+
+CREATE TRIGGER IF NOT EXISTS `term_relationships_delete` AFTER DELETE ON `term_relationships`
+FOR EACH ROW UPDATE terms SET term_count = term_count - 1 WHERE term_id = OLD.term_id;
+
+CREATE TRIGGER IF NOT EXISTS `term_relationships_update` AFTER UPDATE ON `term_relationships`
+FOR EACH ROW UPDATE terms SET term_count = term_count + (term_id = NEW.term_id) - (term_id = OLD.term_id)
+WHERE term_id IN (OLD.term_id, NEW.term_id);
+
+-- InnoDB cascades do not fire triggers, so relations removed with their item are counted here.
+CREATE TRIGGER IF NOT EXISTS `items_delete` BEFORE DELETE ON `items`
+FOR EACH ROW UPDATE terms SET term_count = term_count - 1
+WHERE term_id IN (SELECT tr.term_id FROM term_relationships AS tr WHERE tr.item_id = OLD.item_id);
@@ -8,6 +8,8 @@ CREATE TABLE IF NOT EXISTS `items` (
 );
 CREATE UNIQUE INDEX IF NOT EXISTS `item_name_type` ON `items` (`item_name`,`type_id`);
 CREATE INDEX IF NOT EXISTS `type_id` ON `items` (`type_id`);
+CREATE INDEX IF NOT EXISTS `item_name` ON `items` (`item_name`);
+CREATE INDEX IF NOT EXISTS `item_time` ON `items` (`item_time`);
 
 CREATE TABLE IF NOT EXISTS `terms` (
 	`term_id` INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
@@ -21,6 +23,7 @@ CREATE TABLE IF NOT EXISTS `terms` (
 );
 CREATE UNIQUE INDEX IF NOT EXISTS `term_slug_taxonomy` ON `terms` (`term_slug`, `term_taxonomy`);
 CREATE INDEX IF NOT EXISTS `term_taxonomy` ON `terms` (`term_taxonomy`);
+CREATE INDEX IF NOT EXISTS `term_parent` ON `terms` (`term_parent`);
 
 CREATE TABLE IF NOT EXISTS `term_relationships` (
 	`item_id` INTEGER NOT NULL,
@@ -31,6 +34,30 @@ CREATE TABLE IF NOT EXISTS `term_relationships` (
 );
 CREATE INDEX IF NOT EXISTS `term_id` ON `term_relationships` (`term_id`);
 
+CREATE TRIGGER IF NOT EXISTS `term_relationships_insert` AFTER INSERT ON `term_relationships`
+BEGIN
+	UPDATE terms SET term_count = term_count + 1 WHERE term_id = NEW.term_id;
+END;
+CREATE TRIGGER IF NOT EXISTS `term_relationships_delete` AFTER DELETE ON `term_relationships`
+BEGIN
+	UPDATE terms SET term_count = term_count - 1 WHERE term_id = OLD.term_id;
+END;
+CREATE TRIGGER IF NOT EXISTS `term_relationships_update` AFTER UPDATE OF `term_id` ON `term_relationships`
+BEGIN
+	UPDATE terms SET term_count = term_count - 1 WHERE term_id = OLD.term_id;
+	UPDATE terms SET term_count = term_count + 1 WHERE term_id = NEW.term_id;
+END;
+
+CREATE TABLE IF NOT EXISTS `term_closure` (
+	`ancestor_id` INTEGER NOT NULL,
+	`descendant_id` INTEGER NOT NULL,
+	`depth` INTEGER NOT NULL default 0,
+	PRIMARY KEY (`ancestor_id`,`descendant_id`),
+	FOREIGN KEY (`ancestor_id`) REFERENCES terms(`term_id`) ON DELETE CASCADE,
+	FOREIGN KEY (`descendant_id`) REFERENCES terms(`term_id`) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS `descendant_id` ON `term_closure` (`descendant_id`);
+
 CREATE TABLE IF NOT EXISTS `options` (
 	`option_id` INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
 	`option_name` TEXT NOT NULL,
@@ -63,4 +90,29 @@ CREATE TABLE IF NOT EXISTS `taxonomies` (
 );
 CREATE UNIQUE INDEX IF NOT EXISTS `taxonomies_table_plural` ON `taxonomies` (`table_name`, `plural_name`);
 
+CREATE TABLE IF NOT EXISTS `dir_snapshots` (
+	`snapshot_id` INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+	`dir_path` TEXT NOT NULL,
+	`dir_mtime` INTEGER NOT NULL default 0,
+	`entry_count` INTEGER NOT NULL default 0,
+	`name_digest` TEXT NOT NULL default '',
+	`entry_names` TEXT NOT NULL default ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `dir_path` ON `dir_snapshots` (`dir_path`);
+
+CREATE TABLE IF NOT EXISTS `link_checks` (
+	`check_id` INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+	`link_source` TEXT NOT NULL,
+	`link_status` INTEGER default NULL,
+	`checked_time` INTEGER NOT NULL default 0,
+	`etag` TEXT NOT NULL default '',
+	`last_modified` TEXT NOT NULL default '',
+	`failure_streak` INTEGER NOT NULL default 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `link_source` ON `link_checks` (`link_source`);
+
+CREATE TABLE IF NOT EXISTS `missing_files` (
+	`item_id` INTEGER PRIMARY KEY NOT NULL
+);
+
 PRAGMA foreign_keys = 1;
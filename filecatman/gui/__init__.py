@@ -4,7 +4,7 @@ from filecatman.gui.createlinkswizard import CreateLinksWizard
 from filecatman.gui.exportxmlwizard import ExportWizard
 from filecatman.gui.filemanager import FileManager
 from filecatman.gui.importxmlwizard import ImportWizard
-from filecatman.gui.itemchecker import ItemChecker
+from filecatman.gui.itemchecker import ItemChecker, MissingFileScanner
 from filecatman.gui.linkchecker import LinkChecker
 from filecatman.gui.relationsrecounter import RelationsRecounter
 from filecatman.gui.selectfiledialog import SelectFileDialog
@@ -115,6 +115,7 @@ class AdvancedSearchDialog(QDialog):
 
             self.ui.buttonCategory.setEnabled(True)
             self.ui.labelCategory.setEnabled(True)
+            self.ui.checkSubcategories.setEnabled(True)
             self.db.open()
             categories = self.db.selectCategoriesAsTree({"taxonomy": taxonomy})
             self.db.close()
@@ -149,6 +150,7 @@ class AdvancedSearchDialog(QDialog):
         else:
             self.ui.buttonCategory.setEnabled(False)
             self.ui.labelCategory.setEnabled(False)
+            self.ui.checkSubcategories.setEnabled(False)
 
     def returnSelectedCategory(self):
         indexes = self.ui.categoryTree.selectedIndexes()
@@ -220,14 +222,17 @@ class AdvancedSearchDialog(QDialog):
         addRelationDialog.exec_()
         addRelationDialog.deleteLater()
 
-    def addRelationToTree(self, taxOpName, taxOp, tax, catName, cat):
+    def addRelationToTree(self, taxOpName, taxOp, tax, catName, cat, subcategories=False):
         OpItem = QStandardItem(taxOpName)
         OpItem.setData(taxOp, Qt.UserRole)
         taxItem = QStandardItem(tax.nounName)
         taxItem.setData(tax.tableName, Qt.UserRole)
         taxItem.setIcon(self.icons[tax.iconName])
+        if subcategories and cat:
+            catName += " (and subcategories)"
         catItem = QStandardItem(catName)
         catItem.setData(cat, Qt.UserRole)
+        catItem.setData(subcategories, Qt.UserRole+1)
         self.relationsModel.appendRow((OpItem, taxItem, catItem))
 
         try:
@@ -246,8 +251,27 @@ class AdvancedSearchDialog(QDialog):
     def clearRelationsFromTree(self):
         self.relationsModel.removeRows(0, self.relationsModel.rowCount())
 
+    @staticmethod
+    def relationSQL(taxonomy, categoryIden, subcategories=False):
+        if categoryIden in (None, ''):
+            return "SELECT tr.item_id \n" \
+                   "FROM term_relationships AS tr \n" \
+                   "INNER JOIN terms AS t ON (t.term_id = tr.term_id) \n" \
+                   "WHERE ( t.term_taxonomy = '{}' )".format(taxonomy)
+        elif subcategories:
+            return "SELECT tr.item_id \n" \
+                   "FROM term_closure AS tc \n" \
+                   "INNER JOIN term_relationships AS tr ON (tr.term_id = tc.descendant_id) \n" \
+                   "WHERE ( tc.ancestor_id = '{}' )".format(categoryIden)
+        else:
+            return "SELECT tr.item_id \n" \
+                   "FROM term_relationships AS tr \n" \
+                   "WHERE ( tr.term_id = '{}' )".format(categoryIden)
+
     def processQuery(self):
         SQLWhere = []
+        SQLJoin = ''
+        SQLOrder = "i.item_id ASC"
         SQLName = ''
         keywordsWhere = ''
         wordFunction = None
@@ -267,7 +291,17 @@ class AdvancedSearchDialog(QDialog):
         itemTaxonomyOp = self.ui.comboTaxonomyOp.itemData(self.ui.comboTaxonomyOp.currentIndex())
         itemDateOp = self.ui.comboDateOp.itemData(self.ui.comboDateOp.currentIndex())
 
+        searchSQL = None
         if not itemKeywords.strip() == '':
+            searchSQL = self.db.searchItemsSQL(
+                itemKeywords, (itemField,) if itemField else None, itemKeywordsType == "Phrase")
+        if searchSQL and itemKeywordsOp == "":
+            SQLJoin = "INNER JOIN (\n{}\n) AS search ON (search.item_id = i.item_id)".format(searchSQL)
+            SQLOrder = "search.score DESC"
+        elif searchSQL:
+            SQLWhere.append("{}( i.item_id IN (SELECT item_id FROM (\n{}\n) AS search) )"
+                            .format(itemKeywordsOp, searchSQL))
+        elif not itemKeywords.strip() == '':
             if itemField:
                 for index, col in enumerate([tup[1] for tup in self.tableColumns]):
                     if col == itemField:
@@ -319,12 +353,7 @@ class AdvancedSearchDialog(QDialog):
                 SQLWhere.append("( item_time {0} '0000-00-00 00:00:00' )".format(dateOp))
 
         if itemTaxonomy:
-            SQLTaxonomy = "SELECT tr.item_id \n" \
-                          "FROM term_relationships AS tr \n" \
-                          "INNER JOIN terms AS t ON (t.term_id = tr.term_id) \n" \
-                          "WHERE ( t.term_taxonomy = '{}' )".format(itemTaxonomy)
-            if itemCategory:
-                SQLTaxonomy += " AND ( tr.term_id = '{0}' )".format(itemCategory)
+            SQLTaxonomy = self.relationSQL(itemTaxonomy, itemCategory, self.ui.checkSubcategories.isChecked())
             SQLWhere.append("( i.item_id {0} (\n{1}\n) )".format(itemTaxonomyOp, SQLTaxonomy))
 
         i = 0
@@ -332,14 +361,10 @@ class AdvancedSearchDialog(QDialog):
             taxonomyOp = self.relationsModel.data(self.relationsModel.index(i, 0), role=Qt.UserRole)
             taxonomy = self.relationsModel.data(self.relationsModel.index(i, 1), role=Qt.UserRole)
             categoryIden = self.relationsModel.data(self.relationsModel.index(i, 2), role=Qt.UserRole)
+            subcategories = self.relationsModel.data(self.relationsModel.index(i, 2), role=Qt.UserRole+1)
             self.logger.debug("({} {} {})".format(taxonomyOp, taxonomy, categoryIden))
 
-            SQLTaxonomy = "SELECT tr.item_id \n" \
-                          "FROM term_relationships AS tr \n" \
-                          "INNER JOIN terms AS t ON (t.term_id = tr.term_id) \n" \
-                          "WHERE ( t.term_taxonomy = '{}' )".format(taxonomy)
-            if not categoryIden in (None, ''):
-                SQLTaxonomy += " AND ( tr.term_id = '{0}' )".format(categoryIden)
+            SQLTaxonomy = self.relationSQL(taxonomy, categoryIden, subcategories)
             SQLWhere.append("( i.item_id {0} (\n{1}\n) )".format(taxonomyOp, SQLTaxonomy))
 
             i += 1
@@ -348,16 +373,16 @@ class AdvancedSearchDialog(QDialog):
             whereJoined = "\nWHERE "+" AND \n".join(SQLWhere)
         else:
             whereJoined = ''
-        SQL = "SELECT DISTINCT i.item_id AS 'ID', item_name AS 'Name', \n" \
+        SQL = "SELECT {} i.item_id AS 'ID', item_name AS 'Name', \n" \
               "type_id AS 'Type', item_time AS 'Time', item_source AS 'Source' \n" \
-              "FROM items AS i {} \n" \
-              "ORDER BY i.item_id ASC".format(whereJoined)
+              "FROM items AS i {} {} \n" \
+              "ORDER BY {}".format("" if SQLJoin else "DISTINCT", SQLJoin, whereJoined, SQLOrder)
         self.sqlSignal.emit(SQL)
         self.close()
 
 
 class AddRelationToQueryDialog(QDialog):
-    relationAdded = Signal(str, str, ÆTaxonomy, str, str)
+    relationAdded = Signal(str, str, ÆTaxonomy, str, str, bool)
     dialogName = "Add Relation to Query"
     selectedCategoryText = None
 
@@ -420,6 +445,7 @@ class AddRelationToQueryDialog(QDialog):
 
             self.ui.buttonCategory.setEnabled(True)
             self.ui.labelCategory.setEnabled(True)
+            self.ui.checkSubcategories.setEnabled(True)
             self.db.open()
             categories = self.db.selectCategoriesAsTree({"taxonomy": taxonomy})
             self.db.close()
@@ -455,6 +481,7 @@ class AddRelationToQueryDialog(QDialog):
         else:
             self.ui.buttonCategory.setEnabled(False)
             self.ui.labelCategory.setEnabled(False)
+            self.ui.checkSubcategories.setEnabled(False)
 
     def returnSelectedCategory(self):
         indexes = self.ui.categoryTree.selectedIndexes()
@@ -476,6 +503,7 @@ class AddRelationToQueryDialog(QDialog):
 
         if itemCategoryName:
             self.relationAdded.emit(
-                itemTaxonomyOpName, itemTaxonomyOp, itemTaxonomy, itemCategoryName, itemCategory)
+                itemTaxonomyOpName, itemTaxonomyOp, itemTaxonomy, itemCategoryName, itemCategory,
+                self.ui.checkSubcategories.isChecked())
 
         self.close()
\ No newline at end of file
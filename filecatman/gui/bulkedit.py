@@ -146,14 +146,11 @@ class BulkEditDialog(QDialog):
             categoryIden = self.relationsModel.data(self.relationsModel.index(i, 2), role=Qt.UserRole)
             self.logger.debug("({} {} {})".format(relationOp, taxonomy, categoryIden))
 
+            relationPairs = [(itemIden, categoryIden) for itemIden in itemIdens]
             if relationOp == "Insert":
-                for itemIden in itemIdens:
-                    self.db.newRelation({'item': itemIden, 'term': categoryIden})
+                self.db.newRelations(relationPairs)
             elif relationOp == "Delete":
-                for itemIden in itemIdens:
-                    relationExists = self.db.checkRelation(itemIden, categoryIden)
-                    if relationExists:
-                        self.db.deleteRelation(itemIden, categoryIden)
+                self.db.deleteRelations(relationPairs)
             i += 1
 
         self.db.commit()
@@ -353,11 +353,20 @@ class CreateLinksThread(QThread):
         self.streamErrors = QTextStream(self.fileErrors)
 
     def run(self):
+        self.db = self.progressPage.db.threadConnection()
+        self.db.open()
+        self.db.applyProfile('bulk-load', temporary=True)
+        try:
+            self.createLinks()
+        finally:
+            self.db.applyProfile(self.db.profile, temporary=True)
+            self.db.close()
+
+    def createLinks(self):
         self.wizard.threadRunning = True
 
         self.timerStartedSig.emit()
         self.linksCreatedCount, self.linksOverwrittenCount, self.linksAlreadyExistingCount = 0, 0, 0
-        self.db.open()
 
         sqlItems = "SELECT i.item_id, i.item_name, i.type_id, i.item_source, " \
                    "i.item_time FROM items AS i"
@@ -376,7 +385,7 @@ class CreateLinksThread(QThread):
             itemTime = queryItems.value(4)
             typeDir = self.config['itemTypes'].dirFromTable(itemType)
 
-            if itemType in self.config['itemTypes'].tableNames(Æ.NoWeblinks):
+            if itemType in self.config['itemTypes'].tableSet(Æ.NoWeblinks):
                 filePath = os.path.join(self.dataDir,typeDir,itemName)
                 if not os.path.exists(filePath):
                     errorMessage = "File Error: File '{}' not found.".format(itemName)
@@ -397,12 +406,12 @@ class CreateLinksThread(QThread):
                 if dateTime.isValid():
                     timeYear = dateTime.toString('yyyy')
                     timeMonth = dateTime.toString('MMMM')
-                    if itemType in self.config['itemTypes'].tableNames(Æ.IsWeblinks):
+                    if itemType in self.config['itemTypes'].tableSet(Æ.IsWeblinks):
                         timeLink = os.path.join(self.workingDir, "Time", timeYear, timeMonth, typeDir, itemName+'.'+self.desktopFileExt())
                         if not self.createDesktopFile(timeLink, itemName, itemSource):
                             self.wizard.creationSuccess = False
                             return False
-                    elif itemType in self.config['itemTypes'].tableNames(Æ.NoWeblinks):
+                    elif itemType in self.config['itemTypes'].tableSet(Æ.NoWeblinks):
                         timeLink = self.workingDir+'/Time/'+timeYear+'/'+timeMonth+'/'+typeDir+'/'+itemName
                         if not self.createLink(filePath, timeLink, itemName):
                             self.wizard.creationSuccess = False
@@ -410,12 +419,12 @@ class CreateLinksThread(QThread):
             elif isinstance(itemTime, QDateTime) and itemTime.isValid():
                 timeYear = itemTime.toString('yyyy')
                 timeMonth = itemTime.toString('MMMM')
-                if itemType in self.config['itemTypes'].tableNames(Æ.IsWeblinks):
+                if itemType in self.config['itemTypes'].tableSet(Æ.IsWeblinks):
                     timeLink = os.path.join(self.workingDir, "Time", timeYear, timeMonth, typeDir, itemName+"."+self.desktopFileExt())
                     if not self.createDesktopFile(timeLink, itemName, itemSource):
                         self.wizard.creationSuccess = False
                         return False
-                elif itemType in self.config['itemTypes'].tableNames(Æ.NoWeblinks):
+                elif itemType in self.config['itemTypes'].tableSet(Æ.NoWeblinks):
                     timeLink = self.workingDir+'/Time/'+timeYear+'/'+timeMonth+'/'+typeDir+'/'+itemName
                     if not self.createLink(filePath, timeLink, itemName):
                         self.wizard.creationSuccess = False
@@ -434,7 +443,7 @@ class CreateLinksThread(QThread):
                 
                 taxonomyDir = self.config['taxonomies'].dirFromTable(termTaxonomy)
 
-                if itemType in self.config['itemTypes'].tableNames(Æ.IsWeblinks):
+                if itemType in self.config['itemTypes'].tableSet(Æ.IsWeblinks):
                     typeDir = typeDir
                     if termParent in ("", None, 0):
                         linkPath = os.path.join(self.workingDir, taxonomyDir, termName, typeDir, itemName+"."+self.desktopFileExt())
@@ -446,7 +455,7 @@ class CreateLinksThread(QThread):
                         self.wizard.creationSuccess = False
                         return False
 
-                elif itemType in self.config['itemTypes'].tableNames(Æ.NoWeblinks):
+                elif itemType in self.config['itemTypes'].tableSet(Æ.NoWeblinks):
                     if termParent in ("", None, 0):
                         linkPath = self.workingDir+'/'+taxonomyDir+'/'+termName+'/'+typeDir+'/'+itemName
                     else:
@@ -458,14 +467,13 @@ class CreateLinksThread(QThread):
                         self.wizard.creationSuccess = False
                         return False
 
-        self.db.close()
         self.wizard.creationSuccess = True
         self.garbageCollection()
 
         self.wizard.threadRunning = False
 
     def returnTermParents(self, termParent, termTaxonomy):
-        termParentNames = self.recursiveParentSearch(termParent, termTaxonomy)
+        termParentNames = self.parentSearch(termParent)
         if len(termParentNames) > 1:
             termParentsJoined = '/'.join(termParentNames[1:])+'/'
         else:
@@ -473,24 +481,15 @@ class CreateLinksThread(QThread):
         termParentRoot = termParentNames[0]
         return termParentRoot, termParentsJoined
 
-    def recursiveParentSearch(self, termParent, termTaxonomy):
-        sqlParent = "SELECT t.term_name, t.term_parent FROM terms AS t " \
-                    "WHERE (t.term_id = '{}') AND (t.term_taxonomy = '{}')"\
-                    .format(termParent, termTaxonomy)
-        queryParent = QSqlQuery(self.db.con)
-        queryParent.setForwardOnly(True)
-        queryParent.exec_(sqlParent)
-
-        if queryParent.first():
-            parentName = queryParent.value(0)
-            parentParent = queryParent.value(1)
+    def parentSearch(self, termParent):
+        queryParent = self.db.selectCategoryAncestors(termParent)
+        termParentNames = list()
+        while queryParent.next():
+            termParentNames.append(queryParent.value(1))
+        queryParent.finish()
 
-            if parentParent in ("", None, 0, termParent):
-                return [parentName]
-            else:
-                termParentNames = self.recursiveParentSearch(parentParent, termTaxonomy)
-                termParentNames.append(parentName)
-                return termParentNames
+        if termParentNames:
+            return termParentNames
         else:
             errorMesssage = "Parent Searching Error: Term not found."
             self.logger.error(errorMesssage)
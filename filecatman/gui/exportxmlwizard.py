@@ -308,6 +308,7 @@ class ExportXMLThread(QThread):
             self.wizard.lastError = file.errorString()
             return False
 
+        self.db = self.progressPage.db.threadConnection()
         self.db.open()
 
         stream = QXmlStreamWriter(file)
@@ -236,11 +236,8 @@ class FileManager(QDialog):
             actionName = comboBox.currentText()
             self.logger.debug("Bulk Action '{}' selected. Iden: '{}'".format(actionName, actionCode))
         if actionCode >  0:
-            rowIdens = []
             model = self.currentModel
-            for row, item in enumerate(model.items):
-                if item[0] is True:
-                    rowIdens.append(row)
+            rowIdens = model.checkedRows()
             if actionCode == 1:
                 model.deleteFiles(rowIdens)
                 self.logger.info(str(len(rowIdens))+" files deleted from data directory.")
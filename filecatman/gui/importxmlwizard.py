@@ -3,7 +3,6 @@ import logging
 import xml.etree.ElementTree as ElementTree
 from PySide6.QtCore import Signal, QDir, QElapsedTimer, QThread
 from PySide6.QtWidgets import QWizard, QWizardPage, QFileDialog, QPushButton, QLabel, QVBoxLayout
-from PySide6.QtSql import QSqlQuery
 from filecatman.core.objects import ÆItemType, ÆTaxonomy
 from filecatman.core.functions import loadUI, warningMsgBox
 
@@ -273,20 +272,26 @@ class ProgressPage(QWizardPage):
         self.wizard.next()
 
     def updateItemProgress(self, count, rowName):
+        self.itemImportCount = count
         self.ui.labelItemsValue.setText(str(count)+" / "+str(self.wizard.itemCount))
-        self.ui.progressBar.setValue(self.ui.progressBar.value()+1)
+        self.updateProgressBar()
         self.ui.labelCurrentlyValue.setText(rowName)
         self.timerCheck()
 
     def updateCategoryProgress(self, count, rowName):
+        self.categoryImportCount = count
         self.ui.labelCategoriesValue.setText(str(count)+" / "+str(self.wizard.categoryCount))
-        self.ui.progressBar.setValue(self.ui.progressBar.value()+1)
+        self.updateProgressBar()
         self.ui.labelCurrentlyValue.setText(rowName)
         self.timerCheck()
 
     def updateRelationProgress(self, count):
+        self.relationImportCount = count
         self.ui.labelRelationsValue.setText(str(count)+" / "+str(self.wizard.relationCount))
-        self.ui.progressBar.setValue(self.ui.progressBar.value()+1)
+        self.updateProgressBar()
+
+    def updateProgressBar(self):
+        self.ui.progressBar.setValue(self.categoryImportCount+self.itemImportCount+self.relationImportCount)
 
     def goToFinish(self):
         self.wizard.itemsImported = self.queryXMLThread.itemImportCount
@@ -415,7 +420,9 @@ class QueryXMLThread(QThread):
         self.insertionStatus, self.categoryImportCount, \
             self.itemImportCount, self.relationImportCount = 0, 0, 0, 0
         existingTaxonomies = self.wizard.config['taxonomies'].tableNames()
+        self.db = self.progressPage.db.threadConnection()
         self.db.open()
+        self.db.applyProfile('bulk-load', temporary=True)
         self.db.transaction()
 
         self.catInsertIdens = dict()
@@ -449,34 +456,33 @@ class QueryXMLThread(QThread):
                         self.categoryImportCount += 1
                         self.categoryInsertedSig.emit(self.categoryImportCount, newCat['name'])
 
-        for newItem in self.wizard.newItems:
+        newItems = self.wizard.newItems
+        batchSize = self.db.batchSize
+        for start in range(0, len(newItems), batchSize):
             if self.progressPage.importCancelled:
                 break
-            newItemIden = None
-            dbResponse = self.db.newItem(data=dict(
+            itemsBatch = newItems[start:start+batchSize]
+            newItemIdens = self.db.newItems([dict(
                 name=newItem['name'], type=newItem['type'], source=newItem['source'],
                 datetime=newItem['time'], description=newItem['description'])
-            )
-            if dbResponse:
-                self.itemImportCount += 1
-                self.itemInsertedSig.emit(self.itemImportCount, newItem['name'])
-                if self.db.lastInsertId:
-                    newItemIden = self.db.lastInsertId
-                else:
-                    newItemIdenQuery = QSqlQuery("SELECT item_id from items WHERE "
-                                                 "(item_name = '{}') AND (type_id = '{}')"
-                                                 .format(newItem['name'], newItem['type']), self.db.con)
-                    if newItemIdenQuery.first():
-                        newItemIden = newItemIdenQuery.value(0)
-
-            if newItem['relations']:
+                for newItem in itemsBatch], existing=False)
+            self.itemImportCount += len(newItemIdens)
+            self.itemInsertedSig.emit(self.itemImportCount, itemsBatch[-1]['name'])
+
+            relationPairs = list()
+            for newItem in itemsBatch:
+                newItemIden = newItemIdens.get((newItem['name'], newItem['type']))
+                if newItemIden is None:
+                    continue
                 for relation in newItem['relations']:
                     termTaxonomyId = self.catInsertIdens[relation['taxonomy']][relation['slug']]
-                    if self.db.newRelation(dict(item=newItemIden, term=termTaxonomyId)):
-                        self.relationImportCount += 1
-                        self.relationInsertedSig.emit(self.relationImportCount)
+                    relationPairs.append((newItemIden, termTaxonomyId))
+            if relationPairs:
+                self.relationImportCount += self.db.newRelations(relationPairs)
+                self.relationInsertedSig.emit(self.relationImportCount)
 
         self.db.commit()
+        self.db.applyProfile(self.db.profile, temporary=True)
         self.db.close()
 
         self.wizard.importSuccess = True
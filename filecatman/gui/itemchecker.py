@@ -1,5 +1,10 @@
+import os
+import time
+import hashlib
 import logging
-from PySide6.QtCore import Qt, QObject, Signal, QThread, QFile
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PySide6.QtCore import Qt, QObject, Signal, QThread
 from PySide6.QtWidgets import QProgressDialog, QMessageBox
 from PySide6.QtSql import QSqlQuery
 from filecatman.core.namespace import Æ
@@ -29,7 +34,7 @@ class ItemChecker(QObject):
         self.logger.info("Item Checker Initialized.")
         self.processingThread = ProcessingThread(self)
         self.processingThread.itemCount.connect(self.initializeProgressDialog)
-        self.processingThread.itemChecked.connect(self.updateProgress)
+        self.processingThread.itemsChecked.connect(self.updateProgress)
         self.processingThread.finished.connect(self.itemCheckingFinished)
 
         self.processingThread.start()
@@ -50,8 +55,8 @@ class ItemChecker(QObject):
         self.progressDialog.canceled.connect(self.itemCheckingCancelled)
         self.progressDialog.show()
 
-    def updateProgress(self):
-        self.progressDialog.setValue(self.progressDialog.value()+1)
+    def updateProgress(self, count):
+        self.progressDialog.setValue(self.progressDialog.value()+count)
 
     def itemCheckingCancelled(self):
         self.processingThread.quit()
@@ -83,14 +88,13 @@ class ItemChecker(QObject):
 class ProcessingThread(QThread):
 
     itemCount = Signal(int)
-    itemChecked = Signal()
+    itemsChecked = Signal(int)
 
     def __init__(self, parent):
         super().__init__(parent)
         self.logger = parent.logger
         self.db = parent.db
         self.config = parent.config
-        self.dataDir = self.config['options']['defaultDataDir']
         self.parent = parent
         self.main = parent.main
         self.errorCount = 0
@@ -98,37 +102,151 @@ class ProcessingThread(QThread):
 
     def run(self):
         self.logger.info("Started item checking.")
+        self.db = self.parent.db.threadConnection()
+        scanner = MissingFileScanner(self.db, self.config, self.logger)
+        missingFiles = scanner.scan(self.itemCount.emit, self.itemsChecked.emit,
+                                    lambda: self.parent.processCancelled)
+        if missingFiles is not None:
+            self.missingFiles = missingFiles
+            self.errorCount = len(missingFiles)
+            self.logger.info("Directories rescanned: {} of {}".format(scanner.rescanned, scanner.dirCount))
+
+
+class MissingFileScanner:
+    maxWorkers = 8
+    batchSize = 500
+    racyInterval = 2
+
+    def __init__(self, db, config, logger, storedOnly=False):
+        self.db = db
+        self.config = config
+        self.logger = logger
+        self.dataDir = self.config['options']['defaultDataDir']
+        self.storedOnly = storedOnly
+        self.rescanned, self.dirCount = 0, 0
+
+    def scan(self, itemCount=None, itemsChecked=None, cancelled=None):
+        if self.storedOnly:
+            return self.scanStored()
         self.db.open()
         query = QSqlQuery(self.db.con)
         query.setForwardOnly(True)
         weblinkTypes = self.config['itemTypes'].tableNames(Æ.IsWeblinks)
-        sqlCount = "SELECT COUNT(item_id) FROM items WHERE type_id NOT IN ('{}')"\
-            .format("', '".join(weblinkTypes))
-        self.logger.debug('\n'+sqlCount)
-        query.exec_(sqlCount)
-        if query.first():
-            self.itemCount.emit(query.value(0))
-            self.logger.debug("Total Files: "+str(query.value(0)))
-        sqlItems = "SELECT item_id, item_name, type_id FROM items WHERE type_id NOT IN ('{}')"\
-            .format("', '".join(weblinkTypes))
+        sqlItems = "SELECT item_id, item_name, type_id FROM items WHERE type_id NOT IN ('{}') "\
+            "ORDER BY item_id".format("', '".join(weblinkTypes))
         self.logger.debug('\n'+sqlItems)
         query.exec_(sqlItems)
-        while query.next() and not self.parent.processCancelled:
+        items, typeItems, typeDirs = list(), dict(), dict()
+        while query.next():
             itemIden = query.value(0)
             itemName = query.value(1)
             itemTypeValue = query.value(2)
-            itemType = self.config['itemTypes'].dirFromTable(itemTypeValue)
-            if not itemType:
-                itemType = ÆItemType()
-                itemType.setPluralName(itemTypeValue.title()+"s")
-                itemType.setNounName(itemTypeValue.title())
-                itemType.setTableName(itemTypeValue)
-                self.config['itemTypes'].append(itemType)
+            if itemTypeValue not in typeDirs:
                 itemType = self.config['itemTypes'].dirFromTable(itemTypeValue)
-
-            filePath = getDataFilePath(self.dataDir, itemType, itemName)
-            if not QFile.exists(filePath):
-                self.errorCount += 1
-                self.missingFiles.append(str(itemIden))
-            self.itemChecked.emit()
-        self.db.close()
\ No newline at end of file
+                if not itemType:
+                    itemType = ÆItemType()
+                    itemType.setPluralName(itemTypeValue.title()+"s")
+                    itemType.setNounName(itemTypeValue.title())
+                    itemType.setTableName(itemTypeValue)
+                    self.config['itemTypes'].append(itemType)
+                    itemType = self.config['itemTypes'].dirFromTable(itemTypeValue)
+                typeDirs[itemTypeValue] = getDataFilePath(self.dataDir, itemType)
+                typeItems[itemTypeValue] = list()
+            items.append(itemIden)
+            typeItems[itemTypeValue].append((itemIden, itemName))
+        query.finish()
+        snapshots = self.db.selectDirSnapshots()
+        self.db.close()
+        if itemCount:
+            itemCount(len(items))
+        self.logger.debug("Total Files: "+str(len(items)))
+
+        missingIdens, changedSnapshots = set(), dict()
+        self.dirCount = len(typeDirs)
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as pool:
+            listings = {pool.submit(self.listDirectory, dirPath, snapshots.get(dirPath)): itemTypeValue
+                        for itemTypeValue, dirPath in typeDirs.items()}
+            for listing in as_completed(listings):
+                if cancelled and cancelled():
+                    pool.shutdown(cancel_futures=True)
+                    return None
+                itemTypeValue = listings[listing]
+                dirPath = typeDirs[itemTypeValue]
+                fileNames, snapshot = listing.result()
+                if snapshot:
+                    changedSnapshots[dirPath] = snapshot
+                foldedNames = None
+                checkItems = typeItems[itemTypeValue]
+                for batchStart in range(0, len(checkItems), self.batchSize):
+                    batch = checkItems[batchStart:batchStart+self.batchSize]
+                    for itemIden, itemName in batch:
+                        if fileNames is not None and itemName in fileNames:
+                            continue
+                        if fileNames and foldedNames is None:
+                            foldedNames = set(self.foldName(fileName) for fileName in fileNames)
+                        if not self.fileExists(dirPath, itemName, fileNames, foldedNames):
+                            missingIdens.add(itemIden)
+                    if itemsChecked:
+                        itemsChecked(len(batch))
+
+        self.rescanned = len(changedSnapshots)
+        missingFiles = [str(itemIden) for itemIden in items if itemIden in missingIdens]
+        self.db.open()
+        self.db.transaction()
+        if changedSnapshots:
+            self.db.replaceDirSnapshots(changedSnapshots)
+        self.db.replaceMissingFiles(missingFiles)
+        self.db.commit()
+        self.db.close()
+        return missingFiles
+
+    def scanStored(self):
+        self.db.open()
+        if self.db.selectCount("dir_snapshots"):
+            missingFiles = self.db.selectMissingFiles()
+        else:
+            missingFiles = None
+        self.db.close()
+        return missingFiles
+
+    @staticmethod
+    def foldName(name):
+        return unicodedata.normalize('NFC', name).casefold()
+
+    def listDirectory(self, dirPath, snapshot):
+        try:
+            dirStat = os.stat(dirPath)
+            dirMtime = dirStat.st_mtime_ns
+        except FileNotFoundError:
+            dirMtime = -1
+        except OSError as e:
+            self.logger.warning("Unable to read {}: {}".format(dirPath, e))
+            return None, None
+        if snapshot and snapshot[0] == dirMtime and snapshot[1] == len(snapshot[3]):
+            return snapshot[3], None
+
+        fileNames = set()
+        if dirMtime != -1:
+            try:
+                with os.scandir(dirPath) as entries:
+                    for entry in entries:
+                        if not entry.is_symlink() or os.path.exists(entry.path):
+                            fileNames.add(entry.name)
+            except FileNotFoundError:
+                dirMtime = -1
+            except OSError as e:
+                self.logger.warning("Unable to list {}: {}".format(dirPath, e))
+                return None, None
+        if dirMtime > 0 and time.time_ns()-dirMtime < self.racyInterval*1000000000:
+            dirMtime = 0
+        nameDigest = hashlib.sha1('\n'.join(sorted(fileNames)).encode('utf-8', 'surrogateescape')).hexdigest()
+        return fileNames, (dirMtime, len(fileNames), nameDigest, fileNames)
+
+    def fileExists(self, dirPath, itemName, fileNames, foldedNames):
+        if fileNames is None:
+            return os.path.exists(os.path.join(dirPath, itemName))
+        if itemName in fileNames:
+            return True
+        if '/' in itemName or os.sep in itemName or (foldedNames and self.foldName(itemName) in foldedNames):
+            return os.path.exists(os.path.join(dirPath, itemName))
+        return False
@@ -1,11 +1,17 @@
 import logging
 import time
-from urllib.parse import unquote
+import threading
+from itertools import zip_longest
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote, urlsplit
 from PySide6.QtCore import Qt, QObject, Signal, QThread
 from PySide6.QtWidgets import QProgressDialog, QMessageBox, QDialog
 from PySide6.QtSql import QSqlQuery
 from PySide6.QtGui import QStandardItem, QStandardItemModel
 import requests
+from requests.adapters import HTTPAdapter
+from filecatman.core import const
 from filecatman.core.functions import loadUI
 
 class LinkChecker(QObject):
@@ -171,52 +177,209 @@ class ProcessingThread(QThread):
     def run(self):
         self.parent.threadRunning = True
         self.logger.info("Started link checking.")
+        self.db = self.parent.db.threadConnection()
         self.db.open()
         query = QSqlQuery(self.db.con)
         query.setForwardOnly(True)
-        sqlCount = "SELECT COUNT(item_id) FROM items WHERE (item_source LIKE '%http%') " \
-                   "AND (type_id IN ('{}'))".format("', '".join(self.typesList))
-        self.logger.debug('\n'+sqlCount)
-        query.exec_(sqlCount)
-        if query.first():
-            self.itemCount.emit(query.value(0))
-            self.logger.debug("Total Links: "+str(query.value(0)))
         sqlItems = "SELECT item_id, item_name, item_source FROM items WHERE (item_source LIKE '%http%') " \
                    "AND (type_id IN ('{}'))".format("', '".join(self.typesList))
         self.logger.debug('\n'+sqlItems)
         query.exec_(sqlItems)
-        while query.next() and not self.parent.processCancelled:
-            itemIden = query.value(0)
-            itemName = query.value(1)
-            itemSource = unquote(query.value(2))
-
-            if "youtube" in itemSource:
-                youtubeIden = None
-                try:
-                    if "v=" in itemSource:
-                        youtubeIden = itemSource.split("v=")[1][:11]
-                    elif "/v/" in itemSource:
-                        youtubeIden = itemSource.split("/v/")[1][:11]
-                    elif "/embed/" in itemSource:
-                        youtubeIden = itemSource.split("/embed/")[1][:11]
-                    if youtubeIden:
-                        itemSource = "http://gdata.youtube.com/feeds/api/videos/"+youtubeIden
-                except IndexError:
-                    pass
-            try:
-                r = requests.get(itemSource, timeout=20)
-                self.logger.debug(itemName+": "+str(r.status_code))
-
-                if r.status_code == 403:
-                    time.sleep(5)
-                    r = requests.get(itemSource, timeout=20)
-                    self.logger.warning("(Recheck on 403) "+itemName+": "+str(r.status_code))
-                if r.status_code != 200:
-                    self.errorCount += 1
-                    self.brokenLinks.append(str(itemIden))
-            except BaseException as e:
-                self.logger.error("Error checking '"+itemName+"': "+str(e))
-
-            self.itemChecked.emit()
+        items = list()
+        while query.next():
+            items.append((query.value(0), query.value(1), query.value(2)))
+        self.linkChecks = self.db.selectLinkChecks()
+        self.db.close()
+
+        options = self.config['options']
+        linkCheckTTL = int(options.get('linkCheckTTL', const.LINKCHECKTTL))
+        checkedTime = int(time.time())
+        links = OrderedDict()
+        for itemIden, itemName, itemSource in items:
+            linkCheck = self.linkChecks.get(itemSource)
+            if itemSource in links or (linkCheck and linkCheck[0] is not None
+                                       and checkedTime-linkCheck[1] < linkCheckTTL):
+                continue
+            etag, lastModified = linkCheck[2:4] if linkCheck else ('', '')
+            links[itemSource] = (itemSource, itemName, linkURL(unquote(itemSource)), etag, lastModified)
+        self.itemCount.emit(len(links))
+        self.logger.debug("Total Links: {} ({} cached)".format(len(links), len(items)-len(links)))
+
+        self.prober = LinkProber(self.logger, int(options.get('linkCheckWorkers', const.LINKCHECKWORKERS)),
+                                 int(options.get('linkCheckHostLimit', const.LINKCHECKHOSTLIMIT)))
+        self.newLinkChecks = dict()
+        self.prober.run(list(links.values()), lambda: self.parent.processCancelled, self.linkChecked)
+        self.prober.close()
+        self.storeLinkChecks()
+
+        for itemIden, itemName, itemSource in items:
+            linkCheck = self.linkChecks.get(itemSource)
+            if linkCheck and self.prober.isBroken(linkCheck[0]):
+                self.errorCount += 1
+                self.brokenLinks.append(str(itemIden))
+        self.parent.threadRunning = False
+
+    def linkChecked(self, itemSource, result):
+        self.itemChecked.emit()
+        if result is None:
+            return
+        status, etag, lastModified = result
+        linkCheck = self.linkChecks.get(itemSource)
+        if status == self.prober.notModified and linkCheck:
+            status, etag, lastModified = linkCheck[0], etag or linkCheck[2], lastModified or linkCheck[3]
+        if status is None or self.prober.isBroken(status):
+            etag, lastModified = '', ''
+            failureStreak = linkCheck[4]+1 if linkCheck else 1
+        else:
+            failureStreak = 0
+        linkCheck = (status, int(time.time()), etag or '', lastModified or '', failureStreak)
+        self.linkChecks[itemSource] = self.newLinkChecks[itemSource] = linkCheck
+        if len(self.newLinkChecks) >= self.db.batchSize:
+            self.storeLinkChecks()
+
+    def storeLinkChecks(self):
+        if not self.newLinkChecks:
+            return
+        self.db.open()
+        self.db.transaction()
+        self.db.replaceLinkChecks(self.newLinkChecks)
+        self.db.commit()
         self.db.close()
-        self.parent.threadRunning = False
\ No newline at end of file
+        self.newLinkChecks = dict()
+
+
+def linkURL(itemSource):
+    if "youtube" in itemSource:
+        youtubeIden = None
+        try:
+            if "v=" in itemSource:
+                youtubeIden = itemSource.split("v=")[1][:11]
+            elif "/v/" in itemSource:
+                youtubeIden = itemSource.split("/v/")[1][:11]
+            elif "/embed/" in itemSource:
+                youtubeIden = itemSource.split("/embed/")[1][:11]
+            if youtubeIden:
+                itemSource = "http://gdata.youtube.com/feeds/api/videos/"+youtubeIden
+        except IndexError:
+            pass
+    return itemSource
+
+
+def linkHost(url):
+    try:
+        return urlsplit(url).hostname
+    except ValueError:
+        return None
+
+
+class LinkProber:
+    timeout = (10, 20)
+    okStatuses = (200, 206)
+    notModified = 304
+    retryStatuses = (403, 429, 503)
+    maxRetries = 1
+    retryDelay = 5
+    maxRetryDelay = 300
+
+    def __init__(self, logger, workers=const.LINKCHECKWORKERS, hostLimit=const.LINKCHECKHOSTLIMIT, session=None):
+        self.logger = logger
+        self.workers = max(1, workers)
+        self.hostLimit = max(1, hostLimit)
+        self.session = session or self.createSession(self.workers)
+        self.hostSlots, self.hostRetryTimes = dict(), dict()
+        self.hostLock = threading.Lock()
+
+    @staticmethod
+    def createSession(workers):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def close(self):
+        self.session.close()
+
+    def isBroken(self, status):
+        return status is not None and status not in self.okStatuses and status != self.notModified
+
+    def run(self, links, cancelled=None, checked=None):
+        results = dict()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = dict()
+            for linkIden, itemName, url, etag, lastModified in self.interleaveHosts(links):
+                futures[pool.submit(self.check, itemName, url, cancelled, etag, lastModified)] = linkIden
+            for future in as_completed(futures):
+                if cancelled and cancelled():
+                    pool.shutdown(cancel_futures=True)
+                    break
+                results[futures[future]] = future.result()
+                if checked:
+                    checked(futures[future], results[futures[future]])
+        return results
+
+    @staticmethod
+    def interleaveHosts(links):
+        hostLinks = OrderedDict()
+        for link in links:
+            hostLinks.setdefault(linkHost(link[2]), list()).append(link)
+        return [link for batch in zip_longest(*hostLinks.values()) for link in batch if link is not None]
+
+    def hostSlot(self, host):
+        with self.hostLock:
+            if host not in self.hostSlots:
+                self.hostSlots[host] = threading.BoundedSemaphore(self.hostLimit)
+            return self.hostSlots[host]
+
+    def check(self, itemName, url, cancelled=None, etag='', lastModified=''):
+        try:
+            host = urlsplit(url).hostname
+            with self.hostSlot(host):
+                for attempt in range(self.maxRetries+1):
+                    if not self.waitForHost(host, cancelled):
+                        return None
+                    response = self.probe(url, etag, lastModified)
+                    status = response.status_code
+                    if status not in self.retryStatuses or attempt == self.maxRetries:
+                        self.logger.debug(itemName+": "+str(status))
+                        return status, response.headers.get('ETag', ''), response.headers.get('Last-Modified', '')
+                    self.logger.warning("(Recheck on {}) {}".format(status, itemName))
+                    self.delayHost(host, self.retryAfter(response) or self.retryDelay*2**attempt)
+        except (requests.RequestException, OSError, ValueError) as e:
+            self.logger.error("Error checking '"+itemName+"': "+str(e))
+            return None, '', ''
+
+    def probe(self, url, etag='', lastModified=''):
+        headers = dict()
+        if etag:
+            headers['If-None-Match'] = etag
+        if lastModified:
+            headers['If-Modified-Since'] = lastModified
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True, headers=headers)
+        response.close()
+        if response.status_code in self.okStatuses or response.status_code == self.notModified:
+            return response
+        headers['Range'] = 'bytes=0-0'
+        response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True,
+                                    headers=headers)
+        response.close()
+        return response
+
+    def retryAfter(self, response):
+        try:
+            return min(int(response.headers.get('Retry-After')), self.maxRetryDelay)
+        except (TypeError, ValueError):
+            return None
+
+    def delayHost(self, host, delay):
+        with self.hostLock:
+            self.hostRetryTimes[host] = max(self.hostRetryTimes.get(host, 0), time.monotonic()+delay)
+
+    def waitForHost(self, host, cancelled=None):
+        while True:
+            if cancelled and cancelled():
+                return False
+            delay = self.hostRetryTimes.get(host, 0)-time.monotonic()
+            if delay <= 0:
+                return True
+            time.sleep(min(delay, 0.5))
@@ -15,11 +15,11 @@ from filecatman.core import const
 from filecatman.core.namespace import Æ
 from filecatman.core.objects import ÆItemType, ÆItemTypeList, ÆTaxonomy, ÆTaxonomyList, \
     ÆMessageBox, ÆMainTableModel, ÆCategoryTreeModel, ÆRelationsTableModel, ÆButtonLineEdit, ÆMainTreeView, \
-    ÆMainListView
+    ÆMainListView, ÆQueryExecutor, ÆThumbnailCache
 from filecatman.core.functions import getDataFilePath, warningMsgBox, deleteFile, æscape, loadUI, uploadFile, downloadFile, convToBool
 from filecatman.core.database import ÆDatabase
 from filecatman.gui import NewItemDialog, EditItemDialog, NewCategoryDialog, EditCategoryDialog, PreferencesDialog, \
-    InfoDialog, AboutDialog, ImportWizard, ExportWizard, CreateLinksWizard, ItemChecker, \
+    InfoDialog, AboutDialog, ImportWizard, ExportWizard, CreateLinksWizard, ItemChecker, MissingFileScanner, \
     FileManager, AdvancedSearchDialog, RelationsRecounter, BulkEditDialog, LinkChecker, OpenWithDialog
 import requests
 
@@ -77,6 +77,11 @@ class MainWindow(QMainWindow):
         self.addToolBar(self.ui.toolBarSearch)
         self.setWindowIcon(self.icons['Filecatman'])
         self.setWindowSizeAndCentre()
+        self.queryExecutor = ÆQueryExecutor(self)
+        if self.app.portableMode:
+            self.thumbnails = ÆThumbnailCache("thumbnails/", self)
+        else:
+            self.thumbnails = ÆThumbnailCache(os.path.join(os.path.dirname(QSettings().fileName()), "thumbnails"), self)
         self.constructRestOfUI()
         self.connectSignals()
 
@@ -296,6 +301,8 @@ class MainWindow(QMainWindow):
 
     def connectSignals(self):
         self.app.aboutToQuit.connect(self.exitApp)
+        self.tableModel.rowsLoaded.connect(self.updateTableStatus)
+        self.treeModel.rowsLoaded.connect(self.updateTableStatus)
         self.ui.actionExit.triggered.connect(self.close)
         self.ui.actionAbout.triggered.connect(self.openAboutDialog)
         self.ui.toggleMainToolbar.triggered.connect(self.toggleMainToolbar)
@@ -315,6 +322,7 @@ class MainWindow(QMainWindow):
         self.ui.treeMenu.customContextMenuRequested.connect(self.menuListContextMenu)
         self.ui.actionAboutQt.triggered.connect(self.app.aboutQt)
         self.ui.actionViewItem.triggered.connect(self.launchItem)
+        self.ui.actionViewSubcategories.triggered.connect(self.launchSubcategories)
         self.ui.buttonViewRelation.clicked.connect(self.launchRelation)
         self.ui.actionViewRelation.triggered.connect(self.launchRelation)
         self.ui.actionNewItem.triggered.connect(self.openNewItemDialog)
@@ -401,6 +409,7 @@ class MainWindow(QMainWindow):
         self.initializeDatabase()
         self.readDatabaseOptions()
         self.readItemTypesAndTaxonomies()
+        self.readBrokenLinks()
 
     def readDatabaseOptions(self):
         self.db.open()
@@ -465,6 +474,12 @@ class MainWindow(QMainWindow):
             self.logger.debug('Item types and taxonomies written to database.')
         self.db.close()
 
+    def readBrokenLinks(self):
+        self.db.open()
+        self.brokenLinks = self.db.selectBrokenLinks()
+        self.db.close()
+        self.logger.debug("Broken Links: "+str(len(self.brokenLinks)))
+
     def readItemTypesAndTaxonomies(self):
         self.db.open()
 
@@ -669,9 +684,15 @@ class MainWindow(QMainWindow):
                 sqlWhere = "WHERE type_id = '{}'".format(self.tableArgs['query']['type_id'])
             else:
                 sqlWhere = "WHERE type_id NOT IN ('{}') ".format("', '".join(itemTypes))
-            if self.tableArgs['query'].get('cat'):
+            if self.tableArgs['query'].get('cat') and self.tableArgs['query'].get('subcategories'):
+                sqlCat = "INNER JOIN (SELECT DISTINCT tr.item_id FROM term_closure AS tc " \
+                         "INNER JOIN term_relationships AS tr ON (tr.term_id = tc.descendant_id) " \
+                         "WHERE (tc.ancestor_id = '{}')) AS sub on (sub.item_id = i.item_id) "\
+                    .format(self.tableArgs['query']['cat'])
+            elif self.tableArgs['query'].get('cat'):
                 sqlCat = "INNER JOIN term_relationships as tr on (tr.item_id = i.item_id) " \
                          "AND (tr.term_id = '{}')".format(self.tableArgs['query']['cat'])
+            if self.tableArgs['query'].get('cat'):
                 if not self.tableArgs['query'].get('catName'):
                     SQL = 'SELECT t.term_name FROM terms AS t ' \
                           'WHERE t.term_id = "{}"'.format(self.tableArgs['query']['cat'])
@@ -720,17 +741,14 @@ class MainWindow(QMainWindow):
             titleText = "Items"
             if sqlCat is not '':
                 titleText += " on ‘{}’".format(self.tableArgs['query']['catName'])
+                if self.tableArgs['query'].get('subcategories'):
+                    titleText += " and its subcategories"
             if self.tableArgs['query'].get('type_id'):
                 titleText += " of type ‘{}’".format(
                     self.config['itemTypes'].nounFromTable(self.tableArgs['query']['type_id']))
             self.ui.tableTitle.setText("<b>"+titleText+"</b>")
         self.ui.tableTitle.textFormat()
-        rowCount = self.currentView.model().rowCount()
-        if rowCount is 1:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Item</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Items</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
 
         try:
             selectionModel = self.currentView.selectionModel()
@@ -798,12 +816,7 @@ class MainWindow(QMainWindow):
                 .format(self.config['taxonomies'].nounFromTable(self.tableArgs['query']['term_tax'])))
 
         self.ui.tableTitle.textFormat()
-        count = self.treeModel.rowCount()
-        if count == 1:
-            self.ui.tableStatus.setText("<b>"+str(count)+" Category</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(count)+" Categories</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
         self.db.close()
 
         try:
@@ -935,7 +948,7 @@ class MainWindow(QMainWindow):
                 self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setVisible(False)
                 self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().setVisible(False)
 
-        if not self.returnSelectedItem(2) in self.config['itemTypes'].nounNames(Æ.IsWeblinks):
+        if not self.returnSelectedItem(2) in self.config['itemTypes'].nounSet(Æ.IsWeblinks):
             folderPath = str(self.config['options']['defaultDataDir']) \
                 + self.config['itemTypes'].dirFromNoun(self.returnSelectedItem(2)) + "/"
             self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setVisible(True)
@@ -999,6 +1012,16 @@ class MainWindow(QMainWindow):
                 self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setVisible(False)
                 self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().setVisible(False)
 
+        subtreeCount = self.db.selectCountSubtreeItems(selectedItem)
+        if subtreeCount is not None:
+            self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setVisible(True)
+            self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().setVisible(True)
+            self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setText("<b>Subtree Count: </b>")
+            self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().setText(str(subtreeCount))
+            self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().textFormat()
+            self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().textFormat()
+            gridRow += 1
+
         while gridRow+1 <= self.ui.detailsGrid.rowCount():
             self.ui.detailsGrid.itemAtPosition(gridRow, 0).widget().setVisible(False)
             self.ui.detailsGrid.itemAtPosition(gridRow, 1).widget().setVisible(False)
@@ -1010,18 +1033,25 @@ class MainWindow(QMainWindow):
         searchWords = self.searchPhrase.split()
         i = 0
 
-        SQL = "SELECT item_id AS 'ID', item_name AS 'Name', " \
-              "type_id AS 'Type', item_time AS 'Time', item_source AS 'Source' FROM items "
-        SQLWhere = "WHERE (items.item_id is not NULL)"
-        for word in searchWords:
-            word = æscape(word)
-            i += 1
-            if i is 1:
-                SQLWhere += " AND (item_name LIKE '%{}%' ".format(word)
-            else:
-                SQLWhere += "AND item_name LIKE '%{}%' ".format(word)
-        SQLWhere += ") "
-        SQL += SQLWhere+" ORDER BY item_id ASC"
+        searchSQL = self.db.searchItemsSQL(self.searchPhrase, ('item_name',))
+        if searchSQL:
+            SQL = "SELECT items.item_id AS 'ID', item_name AS 'Name', " \
+                  "type_id AS 'Type', item_time AS 'Time', item_source AS 'Source' FROM items " \
+                  "INNER JOIN ({}) AS search ON (search.item_id = items.item_id) " \
+                  "ORDER BY search.score DESC".format(searchSQL)
+        else:
+            SQL = "SELECT item_id AS 'ID', item_name AS 'Name', " \
+                  "type_id AS 'Type', item_time AS 'Time', item_source AS 'Source' FROM items "
+            SQLWhere = "WHERE (items.item_id is not NULL)"
+            for word in searchWords:
+                word = æscape(word)
+                i += 1
+                if i is 1:
+                    SQLWhere += " AND (item_name LIKE '%{}%' ".format(word)
+                else:
+                    SQLWhere += "AND item_name LIKE '%{}%' ".format(word)
+            SQLWhere += ") "
+            SQL += SQLWhere+" ORDER BY item_id ASC"
 
         self.tableModel.viewMode = self.getTableViewMode()
         self.setTableViewModeItems(refresh=False)
@@ -1051,12 +1081,7 @@ class MainWindow(QMainWindow):
 
         self.ui.tableTitle.setText("<b>Search Results for ‘{}’</b>".format(self.searchPhrase))
         self.ui.tableTitle.textFormat()
-        rowCount = self.currentView.model().rowCount()
-        if rowCount is 1:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Item</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Items</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
 
         try:
             selectionModel = self.currentView.selectionModel()
@@ -1098,12 +1123,7 @@ class MainWindow(QMainWindow):
 
         self.ui.tableTitle.setText("<b>Advanced Search Results</b>")
         self.ui.tableTitle.textFormat()
-        rowCount = self.currentView.model().rowCount()
-        if rowCount is 1:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Item</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Items</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
 
         try:
             selectionModel = self.currentView.selectionModel()
@@ -1114,7 +1134,11 @@ class MainWindow(QMainWindow):
         self.logger.info("Advanced Search Results Displayed")
         self.onTreeModelUpdated()
 
-    def displayMissingFiles(self):
+    def displayMissingFiles(self, refresh=True):
+        if refresh:
+            missingFiles = MissingFileScanner(self.db, self.config, self.logger, storedOnly=True).scan()
+            if missingFiles is not None:
+                self.missingFiles = missingFiles
         if len(self.missingFiles) < 1:
             self.displayNothing()
             return
@@ -1154,12 +1178,7 @@ class MainWindow(QMainWindow):
         self.ui.tableTitle.setText("<b>Items with Missing Files</b>")
         self.ui.tableTitle.textFormat()
 
-        rowCount = self.currentView.model().rowCount()
-        if rowCount is 1:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Item</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Items</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
         self.db.close()
 
         try:
@@ -1169,7 +1188,9 @@ class MainWindow(QMainWindow):
                 pass
         self.onTreeModelUpdated()
 
-    def displayBrokenLinks(self):
+    def displayBrokenLinks(self, refresh=True):
+        if refresh:
+            self.readBrokenLinks()
         if len(self.brokenLinks) < 1:
             self.displayNothing()
             return
@@ -1208,12 +1229,7 @@ class MainWindow(QMainWindow):
         self.ui.tableTitle.setText("<b>Items with Broken Links</b>")
         self.ui.tableTitle.textFormat()
 
-        rowCount = self.currentView.model().rowCount()
-        if rowCount is 1:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Item</b>")
-        else:
-            self.ui.tableStatus.setText("<b>"+str(rowCount)+" Items</b>")
-        self.ui.tableStatus.textFormat()
+        self.updateTableStatus()
         self.db.close()
 
         try:
@@ -1223,6 +1239,19 @@ class MainWindow(QMainWindow):
                 pass
         self.onTreeModelUpdated()
 
+    def updateTableStatus(self, rowCount=None, finished=True):
+        if self.tableArgs['tableType'] in Æ.CategoryTableTypes:
+            model, nouns = self.treeModel, ("Category", "Categories")
+        else:
+            model, nouns = self.tableModel, ("Item", "Items")
+        if rowCount is None:
+            rowCount = model.totalRowCount()
+        statusText = "<b>{} {}</b>".format(rowCount, nouns[0] if rowCount == 1 else nouns[1])
+        if model.isLoading():
+            statusText += " (Loading…)"
+        self.ui.tableStatus.setText(statusText)
+        self.ui.tableStatus.textFormat()
+
     def returnSelectedItem(self, col=0):
         indexes = self.currentView.selectedIndexes()
         if indexes:
@@ -1230,7 +1259,7 @@ class MainWindow(QMainWindow):
             row = index.row()
             parent = index.parent()
             if (self.ui.actionViewAsIcons.isChecked() and self.ui.actionViewAsIcons.isEnabled()) and col is 0:
-                data = self.mainTreeModel().rows[row][col+1]
+                data = self.mainTreeModel().rowIden(row)
             else:
                 data = self.mainTreeModel().data(self.mainTreeModel().index(row, col, parent), role=Qt.DisplayRole)
             if isinstance(data, QDateTime):
@@ -1308,6 +1337,7 @@ class MainWindow(QMainWindow):
             for tab in range(self.ui.tabWidget.count()):
                 self.ui.tabWidget.setTabEnabled(tab, False)
             self.ui.actionViewItem.setEnabled(False)
+            self.ui.actionViewSubcategories.setEnabled(False)
             self.ui.menuOpenWith.setEnabled(False)
             self.ui.actionEdit.setEnabled(False)
             self.ui.actionDelete.setEnabled(False)
@@ -1324,6 +1354,7 @@ class MainWindow(QMainWindow):
                     for tab in range(self.ui.tabWidget.count()):
                         self.ui.tabWidget.setTabEnabled(tab, True)
                     self.ui.actionViewItem.setEnabled(True)
+                    self.ui.actionViewSubcategories.setEnabled(False)
                     self.ui.menuOpenWith.setEnabled(True)
                     self.ui.actionEdit.setEnabled(True)
                     self.ui.actionDelete.setEnabled(True)
@@ -1343,6 +1374,7 @@ class MainWindow(QMainWindow):
                     for tab in range(self.ui.tabWidget.count()):
                         self.ui.tabWidget.setTabEnabled(tab, True)
                     self.ui.actionViewItem.setEnabled(True)
+                    self.ui.actionViewSubcategories.setEnabled(True)
                     self.ui.menuOpenWith.setEnabled(False)
                     self.ui.actionEdit.setEnabled(True)
                     self.ui.actionDelete.setEnabled(True)
@@ -1360,6 +1392,7 @@ class MainWindow(QMainWindow):
                     for tab in range(self.ui.tabWidget.count()):
                         self.ui.tabWidget.setTabEnabled(tab, True)
                     self.ui.actionViewItem.setEnabled(False)
+                    self.ui.actionViewSubcategories.setEnabled(False)
                     self.ui.menuOpenWith.setEnabled(False)
                     self.ui.actionEdit.setEnabled(True)
                     self.ui.actionDelete.setEnabled(True)
@@ -1466,13 +1499,26 @@ class MainWindow(QMainWindow):
             self.onTreeViewSelectionChanged()
             self.onRelationsTreeSelectionChanged()
 
+    def launchSubcategories(self):
+        if self.tableArgs['tableType'] in Æ.CategoryTableTypes and self.mainTreeSelectedRows():
+            termIden = self.returnSelectedItem(1)
+            termName = self.returnSelectedItem(0)
+            self.logger.debug("Term ID: "+termIden+" Tax Name: "+termName)
+            self.displayItems({"cat": termIden, 'catName': termName, 'subcategories': True})
+
+            self.currentView.scrollToTop()
+            self.ui.treeMenu.clearSelection()
+            self.currentView.clearSelection()
+            self.onTreeViewSelectionChanged()
+            self.onRelationsTreeSelectionChanged()
+
     def launchDataFolder(self):
         try:
             folderPath = self.config['options']['defaultDataDir']
             if self.tableArgs['tableType'] in Æ.ItemTableTypes:
                 if self.currentView.selectedIndexes():
                     itemType = self.returnSelectedItem(2)
-                    if itemType in self.config['itemTypes'].nounNames(Æ.NoWeblinks):
+                    if itemType in self.config['itemTypes'].nounSet(Æ.NoWeblinks):
                         folderPath = os.path.join(folderPath, self.config['itemTypes'].dirFromNoun(itemType))
             elif self.tableArgs['tableType'] in Æ.CategoryTableTypes:
                 folderPath = self.config['options']['defaultDataDir']
@@ -1498,7 +1544,7 @@ class MainWindow(QMainWindow):
             row = self.currentView.selectedIndexes()[0].row()
             itemName = self.mainTreeModel().data(self.mainTreeModel().index(row, 1))
             itemType = self.mainTreeModel().data(self.mainTreeModel().index(row, 2))
-            if itemType in self.config['itemTypes'].nounNames(Æ.NoWeblinks):
+            if itemType in self.config['itemTypes'].nounSet(Æ.NoWeblinks):
                 fileExtension = os.path.splitext(itemName)[1][1:].lower().strip()
                 command = '"'+self.config["openWith"][fileExtension][action.text()]+'"'+' "{}" '.format(
                         getDataFilePath(dataDir, self.config['itemTypes'].dirFromNoun(itemType), itemName))
@@ -1532,11 +1578,11 @@ class MainWindow(QMainWindow):
         try:
             self.logger.debug("Item Type: "+itemType)
             dataDir = self.config['options']['defaultDataDir']
-            if itemType in self.config['itemTypes'].nounNames(Æ.IsWeblinks):
+            if itemType in self.config['itemTypes'].nounSet(Æ.IsWeblinks):
                 self.logger.debug("Item Source: "+itemSource)
                 webbrowser.open(itemSource)
 
-            elif itemType in self.config['itemTypes'].nounNames(Æ.NoWeblinks):
+            elif itemType in self.config['itemTypes'].nounSet(Æ.NoWeblinks):
                 self.logger.debug(itemType+" Name: "+itemName)
                 if platform.system() == "Windows":
                     os.startfile(getDataFilePath(dataDir, self.config['itemTypes'].dirFromNoun(itemType), itemName))
@@ -1559,7 +1605,7 @@ class MainWindow(QMainWindow):
                 itemPaths = list()
                 for row in rows:
                     itemType = self.mainTreeModel().data(self.mainTreeModel().index(row, 2))
-                    if itemType in self.config['itemTypes'].nounNames(Æ.NoWeblinks):
+                    if itemType in self.config['itemTypes'].nounSet(Æ.NoWeblinks):
                         itemName = self.mainTreeModel().data(self.mainTreeModel().index(row, 1))
                         itemPath = os.path.join(str(self.config['options']['defaultDataDir']),
                                                  self.config['itemTypes'].dirFromNoun(itemType),itemName)
@@ -1577,7 +1623,7 @@ class MainWindow(QMainWindow):
             rows = self.mainTreeSelectedRows()
             if rows:
                 if self.tableViewMode == "icons":
-                    itemIdens = [str(self.mainTreeModel().rows[row][1]) for row in rows]
+                    itemIdens = [str(self.mainTreeModel().rowIden(row)) for row in rows]
                 else:
                     itemIdens = [str(self.mainTreeModel().data(self.mainTreeModel().index(row, 0))) for row in rows]
                 copypastaText = str()
@@ -1723,7 +1769,7 @@ class MainWindow(QMainWindow):
                     self.db.transaction()
                     for row in rows:
                         if self.tableViewMode == "icons":
-                            itemID = self.mainTreeModel().rows[row][1]
+                            itemID = self.mainTreeModel().rowIden(row)
                         else:
                             itemID = self.mainTreeModel().data(self.mainTreeModel().index(row, 0))
                         self.db.deleteItem(str(itemID))
@@ -1734,7 +1780,7 @@ class MainWindow(QMainWindow):
                             typeDir = self.config['itemTypes'].dirFromNoun(itemType)
                             filePath = getDataFilePath(dataDir, typeDir, itemName)
                             if os.path.exists(filePath):
-                                if itemType in self.config['itemTypes'].nounNames(Æ.IsWebpages):
+                                if itemType in self.config['itemTypes'].nounSet(Æ.IsWebpages):
                                     folderName = os.path.splitext(itemName)[0]+"_files"
                                     folderPath = getDataFilePath(dataDir, typeDir, folderName)
                                     deleteFile(self, filePath, folderPath)
@@ -2011,18 +2057,15 @@ class MainWindow(QMainWindow):
             actionName = comboBox.currentText()
             self.logger.debug("Bulk Action '{}' selected. Iden: '{}'".format(actionName, actionCode))
         if actionCode > 0:
-            i = 0
             rowIdens = []
             model = self.mainTreeModel()
             if self.mainTreeModel().tableType in Æ.ItemTableTypes:
-                while model.hasIndex(i, 0):
-                    if model.data(model.index(i, 0), Qt.CheckStateRole) == Qt.Checked:
-                        name = model.data(model.index(i, 1))
-                        iden = model.rows[i][1]
-                        rowType = model.data(model.index(i, 2))
-                        rowIdens.append((iden, name, rowType))
-                    i += 1
+                if model.checkNewRows:
+                    model.fetchAll()
+                rowIdens = model.returnCheckedData()
             elif self.mainTreeModel().tableType in Æ.CategoryTableTypes:
+                if self.treeModel.checkNewRows:
+                    self.treeModel.fetchAll()
                 rowIdens = self.treeModel.rootItem.returnCheckedData()
             if len(rowIdens) >= 1:
                 self.db.open()
@@ -2106,7 +2149,7 @@ class MainWindow(QMainWindow):
                             typeDir = self.config['itemTypes'].dirFromNoun(itemType)
                             filePath = getDataFilePath(dataDir, typeDir, itemName)
                             if os.path.exists(filePath):
-                                if itemType in self.config['itemTypes'].nounNames(Æ.IsWebpages):
+                                if itemType in self.config['itemTypes'].nounSet(Æ.IsWebpages):
                                     folderName = os.path.splitext(itemName)[0]+"_files"
                                     folderPath = getDataFilePath(dataDir, typeDir, folderName)
                                     deleteFile(self, filePath, folderPath)
@@ -2209,7 +2252,7 @@ class MainWindow(QMainWindow):
         if len(missingItems) >= 1:
             self.missingFiles = missingItems
             if data == "Missing Files":
-                self.displayMissingFiles()
+                self.displayMissingFiles(refresh=False)
             else:
                 try:
                     missingFilesItem = self.ui.treeMenu.model().findItems("Missing Files", Qt.MatchExactly, 0)[0]
@@ -2242,7 +2285,7 @@ class MainWindow(QMainWindow):
         if len(brokenLinks) >= 1:
             self.brokenLinks = brokenLinks
             if data == "Broken Links":
-                self.displayBrokenLinks()
+                self.displayBrokenLinks(refresh=False)
             else:
                 try:
                     brokenLinksItem = self.ui.treeMenu.model().findItems("Broken Links", Qt.MatchExactly, 0)[0]
@@ -2303,7 +2346,7 @@ class MainWindow(QMainWindow):
         self.ui.actionDefaultApplication = QAction(self.icons['Play'], "Default Application", self)
         self.ui.menuOpenWith.addAction(self.ui.actionDefaultApplication)
 
-        if itemType not in self.config['itemTypes'].nounNames(Æ.IsWeblinks):
+        if itemType not in self.config['itemTypes'].nounSet(Æ.IsWeblinks):
             fileExtension = os.path.splitext(name)[1][1:].lower().strip()
             if fileExtension in self.config["openWith"]:
                 commandsList = self.config["openWith"][fileExtension]
@@ -2432,7 +2475,7 @@ class MainWindow(QMainWindow):
 
                     for row in rows:
                         if self.tableViewMode == "icons":
-                            itemIden = self.mainTreeModel().rows[row][1]
+                            itemIden = self.mainTreeModel().rowIden(row)
                         else:
                             itemIden = self.mainTreeModel().data(self.mainTreeModel().index(row, 0))
                         itemName = self.mainTreeModel().data(self.mainTreeModel().index(row, 1))
@@ -2471,12 +2514,12 @@ class MainWindow(QMainWindow):
                 row = self.currentView.selectedIndexes()[0].row()
                 itemName = self.mainTreeModel().data(self.mainTreeModel().index(row, 1))
                 itemType = self.mainTreeModel().data(self.mainTreeModel().index(row, 2))
-                if itemType in self.config['itemTypes'].nounNames(Æ.IsWeblinks):
+                if itemType in self.config['itemTypes'].nounSet(Æ.IsWeblinks):
                     openWithDialog = OpenWithDialog(self, "weblink")
                     openWithDialog.exec_()
                     openWithDialog.deleteLater()
                     self.createOpenWithMenu(self.returnSelectedItem(1))
-                elif itemType in self.config['itemTypes'].nounNames(Æ.NoWeblinks):
+                elif itemType in self.config['itemTypes'].nounSet(Æ.NoWeblinks):
                     fileExtension = os.path.splitext(itemName)[1][1:].lower().strip()
                     openWithDialog = OpenWithDialog(self, fileExtension)
                     openWithDialog.exec_()
@@ -2530,8 +2573,8 @@ class MainWindow(QMainWindow):
             self.config['db'].clear()
             self.config.settings.remove('db')
             self.close()
-            if self.db.con.isOpen():
-                self.db.close()
+            self.queryExecutor.stop()
+            self.db.closeConnection()
             self.config.writeConfig()
             self.app.openWizard()
         elif ret == msgBox.StandardButton.Cancel:
@@ -2553,8 +2596,8 @@ class MainWindow(QMainWindow):
             self.config['db'].clear()
             self.config.settings.remove('db')
             self.close()
-            if self.db.con.isOpen():
-                self.db.close()
+            self.queryExecutor.stop()
+            self.db.closeConnection()
             self.config.writeConfig()
             self.app.openWizard(pageIden='OpenSQLite')
         elif ret == msgBox.StandardButton.Cancel:
@@ -2576,8 +2619,8 @@ class MainWindow(QMainWindow):
             self.config['db'].clear()
             self.config.settings.remove('db')
             self.close()
-            if self.db.con.isOpen():
-                self.db.close()
+            self.queryExecutor.stop()
+            self.db.closeConnection()
             self.config.writeConfig()
             self.app.openWizard(pageIden='OpenMySQL')
         elif ret == msgBox.StandardButton.Cancel:
@@ -2599,8 +2642,8 @@ class MainWindow(QMainWindow):
             self.config['db'].clear()
             self.config.settings.remove('db')
             self.close()
-            if self.db.con.isOpen():
-                self.db.close()
+            self.queryExecutor.stop()
+            self.db.closeConnection()
             self.config.writeConfig()
             self.app.openWizard(pageIden='NewSQLite')
         elif ret == msgBox.StandardButton.Cancel:
@@ -2622,8 +2665,8 @@ class MainWindow(QMainWindow):
             self.config['db'].clear()
             self.config.settings.remove('db')
             self.close()
-            if self.db.con.isOpen():
-                self.db.close()
+            self.queryExecutor.stop()
+            self.db.closeConnection()
             self.config.writeConfig()
             self.app.openWizard(pageIden='NewMySQL')
         elif ret == msgBox.StandardButton.Cancel:
@@ -2736,6 +2779,8 @@ class MainWindow(QMainWindow):
                 warningMsgBox(self, "File type is not recognised. Upload aborted.", "Unknown File Type")
 
     def exitApp(self):
+        self.queryExecutor.stop()
+        self.thumbnails.stop()
         if self.isInitialized:
             self.writeDatabaseOptions()
             self.config.writeConfig()
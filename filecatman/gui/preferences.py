@@ -237,6 +237,12 @@ class DatabaseTabs(QWidget):
             self.ui.checkRelativeDir.setChecked(False)
             self.ui.checkRelativeDir.setEnabled(False)
         self.ui.spinCatLvls.setValue(self.config['options']['catLvls'])
+        for profile in self.db.sqliteProfiles:
+            self.ui.comboSQLiteProfile.addItem(profile.replace("-", " ").title(), profile)
+        self.ui.comboSQLiteProfile.setCurrentIndex(self.ui.comboSQLiteProfile.findData(self.db.profile))
+        self.ui.comboSQLiteProfile.setEnabled(self.db.config['type'] == "sqlite")
+        self.ui.labelSQLiteProfile.setEnabled(self.db.config['type'] == "sqlite")
+        self.ui.checkSearchIndex.setChecked(self.db.searchIndex)
 
         self.displayItemTypes()
         self.displayTaxonomies()
@@ -648,6 +654,22 @@ class DatabaseTabs(QWidget):
 
         self.config['options']['catLvls'] = self.ui.spinCatLvls.value()
 
+        profile = self.ui.comboSQLiteProfile.itemData(self.ui.comboSQLiteProfile.currentIndex())
+        if self.db.config['type'] == "sqlite" and profile != self.db.profile:
+            self.db.open()
+            self.db.setProfile(profile)
+            self.db.close()
+            self.config['options']['sqliteProfile'] = profile
+
+        if self.ui.checkSearchIndex.isChecked() != self.db.searchIndex:
+            self.db.open()
+            if self.ui.checkSearchIndex.isChecked():
+                if not self.db.createSearchIndex():
+                    warningMsgBox(self, "Unable to create the search index: "+str(self.db.lastError()))
+            else:
+                self.db.dropSearchIndex()
+            self.db.close()
+
         for typeIden in self.itemTypeDeletionQueue:
             self.db.open()
             self.db.transaction()
@@ -1,11 +1,11 @@
 import logging
 from PySide6.QtCore import Qt, QObject, Signal, QThread
 from PySide6.QtWidgets import QProgressDialog, QMessageBox
-from PySide6.QtSql import QSqlQuery
 
 
 class RelationsRecounter(QObject):
     completed = Signal()
+    reportLimit = 1000
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -25,7 +25,6 @@ class RelationsRecounter(QObject):
         self.logger.info("Relations Recounter Initialized.")
         self.processingThread = ProcessingThread(self)
         self.processingThread.categoryCount.connect(self.initializeProgressDialog)
-        self.processingThread.categoryChecked.connect(self.updateProgress)
         self.processingThread.finished.connect(self.recountFinished)
 
         self.processingThread.start()
@@ -46,9 +45,6 @@ class RelationsRecounter(QObject):
         self.progressDialog.canceled.connect(self.recountCancelled)
         self.progressDialog.show()
 
-    def updateProgress(self):
-        self.progressDialog.setValue(self.progressDialog.value()+1)
-
     def recountCancelled(self):
         self.processingThread.quit()
         self.processCancelled = True
@@ -62,25 +58,30 @@ class RelationsRecounter(QObject):
             self.completed.emit()
         else:
             self.errorCount = self.processingThread.errorCount
-            self.processingThread.deleteLater()
             self.logger.info("Recount Finished. Errors: "+str(self.errorCount))
             if self.errorCount >= 1:
-                QMessageBox.warning(
-                    self.main, 'Some Counts Were Wrong',
-                    '{} categories had a wrong relations count.'.format(str(self.errorCount)), QMessageBox.Ok
+                messageBox = QMessageBox(
+                    QMessageBox.Warning, 'Some Counts Were Wrong',
+                    '{} categories had a wrong relations count.'.format(str(self.errorCount)), QMessageBox.Ok,
+                    self.main
                 )
+                messageBox.setDetailedText('\n'.join(
+                    "({}) {}: {} → {}".format(categoryIden, categoryName, oldCount, newCount)
+                    for categoryIden, categoryName, oldCount, newCount
+                    in self.processingThread.discrepancies[:self.reportLimit]))
+                messageBox.exec_()
             else:
                 QMessageBox.information(
                     self.main, 'No Counts Invalid',
                     'All relation counts are correct.', QMessageBox.Ok
                 )
+            self.processingThread.deleteLater()
             self.completed.emit()
 
 
 class ProcessingThread(QThread):
 
     categoryCount = Signal(int)
-    categoryChecked = Signal()
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -90,39 +91,21 @@ class ProcessingThread(QThread):
         self.parent = parent
         self.main = parent.main
         self.errorCount = 0
+        self.discrepancies = list()
 
     def run(self):
         self.logger.info("Started relations recounting.")
+        self.categoryCount.emit(0)
+        self.db = self.parent.db.threadConnection()
         self.db.open()
         self.db.transaction()
-        query = QSqlQuery(self.db.con)
-        query.setForwardOnly(True)
-        sqlCount = "SELECT COUNT(term_id) FROM terms"
-        self.logger.debug('\n'+sqlCount)
-        query.exec_(sqlCount)
-        if query.first():
-            self.categoryCount.emit(query.value(0))
-            self.logger.debug("Total Categories: "+str(query.value(0)))
-
-        queryCategories = self.db.selectCategories(
-            args=dict(col="t.term_id, t.term_name, t.term_count"))
-        while queryCategories.next() and not self.parent.processCancelled:
-            categoryIden = queryCategories.value(0)
-            categoryName = queryCategories.value(1)
-            categoryCount = queryCategories.value(2)
-
-            newCount = self.db.selectCountRelations(col="term_id", iden=categoryIden)
-
-            if not newCount == categoryCount:
-                self.logger.error(
-                    "Category '({}) {}' had a count of '{}' items, when it should be '{}'."
-                    .format(categoryIden, categoryName, categoryCount, newCount))
-                self.errorCount += 1
-                sqlUpdate = "UPDATE terms SET term_count={} WHERE term_id = {}"\
-                    .format(newCount, categoryIden)
-                self.logger.debug('\n'+sqlUpdate)
-                QSqlQuery(sqlUpdate, self.db.con)
-
-            self.categoryChecked.emit()
+        self.discrepancies = self.db.selectTermCountDiscrepancies()
+        for categoryIden, categoryName, categoryCount, newCount in self.discrepancies:
+            self.logger.error(
+                "Category '({}) {}' had a count of '{}' items, when it should be '{}'."
+                .format(categoryIden, categoryName, categoryCount, newCount))
+        self.errorCount = len(self.discrepancies)
+        if self.discrepancies and not self.parent.processCancelled:
+            self.db.updateTermCounts([categoryIden for categoryIden, *counts in self.discrepancies])
         self.db.commit()
-        self.db.close()
\ No newline at end of file
+        self.db.close()
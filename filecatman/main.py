@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Filecatman. If not, see http://www.gnu.org/licenses/.
 
+import os
 import sys
 import argparse
 from filecatman.core import const
@@ -29,6 +30,9 @@ class main():
                         action="store", dest="loglevel")
     parser.add_argument("-q", "--quiet", help="Sets the log level to 'none', this is the same as `-L none`",
                         dest="quiet", action="store_true", default=False)
+    parser.add_argument("--migration-report", help="List the pending schema migrations of the database "
+                        "given with `-db` without applying them, then exit",
+                        dest="migrationReport", action="store_true", default=False)
     args = parser.parse_args()
     if args.quiet:
         const.LOGGERLEVEL = "none"
@@ -36,6 +40,18 @@ class main():
         const.LOGGERLEVEL = args.loglevel.lower()
     if args.version:
         sys.exit("Filecatman: "+const.VERSION)
+    if args.migrationReport:
+        if not args.database:
+            sys.exit("Filecatman: --migration-report requires a database given with `-db`")
+        if not os.path.isfile(args.database):
+            sys.exit("Filecatman: database `{}` does not exist".format(args.database))
+        from PySide6.QtCore import QCoreApplication
+        from filecatman.core.database import ÆDatabase
+        app = QCoreApplication(sys.argv)
+        log.initializeLogger(const.LOGGERLEVEL)
+        db = ÆDatabase(dict(type="sqlite", db=os.path.abspath(args.database), dryRun=True))
+        print("\n".join(db.migrationReport) or "Schema is up to date.")
+        sys.exit()
 
     app = Filecatman(sys.argv)
     app.setOrganizationName(const.ORGNAME)